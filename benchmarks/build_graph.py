@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+"""
+Benchmark of building pipeline dependency graph with `YagocdUtil.build_graph`.
+
+Generates layered set of pipelines, where each pipeline depends on a few
+pipelines of the previous layer, and measures time of linking them by
+key (dictionary lookup) and by compare function (quadratic comparison).
+Comparison is skipped for big sizes, as it takes too long.
+
+Usage::
+
+    python benchmarks/build_graph.py [--sizes 1000 10000 50000] [--compare-limit 3000]
+"""
+import argparse
+import copy
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yagocd import Yagocd  # noqa: E402
+from yagocd.resources.pipeline import PipelineEntity  # noqa: E402
+from yagocd.session import Session  # noqa: E402
+from yagocd.util import YagocdUtil  # noqa: E402
+
+LAYER_SIZE = 100
+DEPENDENCIES = 3
+
+
+def make_pipelines(session, size):
+    random.seed(size)
+    pipelines = list()
+    for number in range(size):
+        layer = number // LAYER_SIZE
+        materials = [{'description': 'git@example.com:repo{}.git'.format(number), 'type': 'Git'}]
+        if layer:
+            for _ in range(DEPENDENCIES):
+                parent = (layer - 1) * LAYER_SIZE + random.randrange(LAYER_SIZE)
+                materials.append({'description': 'pipeline{}'.format(parent), 'type': 'Pipeline'})
+
+        pipelines.append(PipelineEntity(
+            session=session,
+            data={'name': 'pipeline{}'.format(number), 'materials': materials}
+        ))
+    return pipelines
+
+
+def by_key(nodes):
+    return YagocdUtil.build_graph(
+        nodes=nodes,
+        dependencies=lambda parent: parent.data.materials,
+        key=lambda node: node.data.name,
+        dependency_key=lambda material: material.description
+    )
+
+
+def by_compare(nodes):
+    return YagocdUtil.build_graph(
+        nodes=nodes,
+        dependencies=lambda parent: parent.data.materials,
+        compare=lambda candidate, child: candidate.description == child.data.name
+    )
+
+
+def measure(session, size, build):
+    nodes = make_pipelines(session, size)
+    start = timeit.default_timer()
+    build(nodes)
+    return timeit.default_timer() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 3000, 10000, 50000])
+    parser.add_argument('--compare-limit', type=int, default=3000,
+                        help='maximum number of nodes to benchmark quadratic comparison for')
+    args = parser.parse_args()
+
+    session = Session(auth=None, options=copy.deepcopy(Yagocd.DEFAULT_OPTIONS))
+
+    sys.stdout.write('{:>8} {:>12} {:>12}\n'.format('nodes', 'key, s', 'compare, s'))
+    for size in args.sizes:
+        key_time = measure(session, size, by_key)
+        if size <= args.compare_limit:
+            compare_time = '{:12.4f}'.format(measure(session, size, by_compare))
+        else:
+            compare_time = '{:>12}'.format('-')
+        sys.stdout.write('{:8d} {:12.4f} {}\n'.format(size, key_time, compare_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+"""
+Benchmark of memory used by job and stage instances with slots and lazily
+created managers compared to the previous layout, where each entity had
+`__dict__` and stage instance created it's manager in the constructor.
+
+Job instances are grouped by stages the same way as in pipeline history.
+Requires python 3 for `tracemalloc`.
+
+Usage::
+
+    python benchmarks/entity_memory.py [--jobs 1000000] [--jobs-per-stage 4]
+"""
+import argparse
+import copy
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yagocd.client import Yagocd  # noqa: E402
+from yagocd.resources.job import JobInstance  # noqa: E402
+from yagocd.resources.stage import StageInstance, StageManager  # noqa: E402
+from yagocd.session import Session  # noqa: E402
+from yagocd.util import LazyDict  # noqa: E402
+
+
+class LegacyStageInstance(object):
+    def __init__(self, session, data, pipeline):
+        self._session = session
+        self._data = LazyDict(data or {})
+        self._etag = None
+        self.base_api = self._session.base_api()
+        self._pipeline = pipeline
+        self._manager = StageManager(session=self._session)
+
+
+class LegacyJobInstance(object):
+    def __init__(self, session, data, stage):
+        self._session = session
+        self._data = LazyDict(data or {})
+        self._etag = None
+        self.base_api = self._session.base_api()
+        self._stage = stage
+
+
+def build(stage_cls, job_cls, session, jobs, jobs_per_stage):
+    result = list()
+    stage = None
+    for number in range(jobs):
+        if number % jobs_per_stage == 0:
+            stage = stage_cls(session, {'name': 'build', 'counter': '1'}, None)
+        result.append(job_cls(session, {'name': 'job', 'id': number, 'state': 'Completed'}, stage))
+    return result
+
+
+def measure(stage_cls, job_cls, session, jobs, jobs_per_stage):
+    gc.collect()
+    tracemalloc.start()
+    start = time.time()
+    result = build(stage_cls, job_cls, session, jobs, jobs_per_stage)
+    elapsed = time.time() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=1000000)
+    parser.add_argument('--jobs-per-stage', type=int, default=4)
+    args = parser.parse_args()
+
+    session = Session(auth=None, options=copy.deepcopy(Yagocd.DEFAULT_OPTIONS))
+
+    sys.stdout.write('{:>8} {:>10} {:>12} {:>14}\n'.format('layout', 'time, s', 'memory, MiB', 'per job, bytes'))
+    for name, stage_cls, job_cls in [
+        ('legacy', LegacyStageInstance, LegacyJobInstance),
+        ('slots', StageInstance, JobInstance),
+    ]:
+        elapsed, size = measure(stage_cls, job_cls, session, args.jobs, args.jobs_per_stage)
+        sys.stdout.write('{:>8} {:10.2f} {:12.1f} {:14.0f}\n'.format(
+            name, elapsed, size / 1024.0 / 1024, float(size) / args.jobs
+        ))
+
+
+if __name__ == '__main__':
+    main()
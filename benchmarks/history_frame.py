@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+"""
+Benchmark of aggregating job history with `HistoryFrame` and NumPy
+compared to the loop over entities.
+
+Generates job history and calculates failure rate and mean duration of
+passed jobs: once reading `data` of each `JobInstance`, and once building
+`HistoryFrame` and doing vectorized calculations over it's columns.
+Requires NumPy.
+
+Usage::
+
+    python benchmarks/history_frame.py [--runs 100000]
+"""
+import argparse
+import copy
+import os
+import sys
+import timeit
+
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yagocd.client import Yagocd  # noqa: E402
+from yagocd.frame import HistoryFrame  # noqa: E402
+from yagocd.resources.job import JobInstance  # noqa: E402
+from yagocd.session import Session  # noqa: E402
+
+
+def make_job(counter):
+    scheduled = 1463606632223 + counter * 60000
+    return {
+        'name': 'build',
+        'pipeline_name': 'Consumer_Website',
+        'pipeline_counter': counter,
+        'stage_name': 'Commit',
+        'stage_counter': '1',
+        'result': 'Failed' if counter % 7 == 0 else 'Passed',
+        'state': 'Completed',
+        'scheduled_date': scheduled,
+        'job_state_transitions': [
+            {'state': state, 'state_change_time': scheduled + offset, 'id': counter * 10 + number}
+            for number, (state, offset) in enumerate([
+                ('Scheduled', 0), ('Assigned', 500), ('Preparing', 1000), ('Building', 3000),
+                ('Completing', 3000 + counter % 100 * 1000), ('Completed', 3500 + counter % 100 * 1000),
+            ])
+        ],
+    }
+
+
+def loop(jobs):
+    failed = 0
+    durations = list()
+    for instance in jobs:
+        if instance.data.result == 'Failed':
+            failed += 1
+        elif instance.data.result == 'Passed':
+            times = dict((t.state, t.state_change_time) for t in instance.data.job_state_transitions)
+            durations.append(times['Completed'] - times['Scheduled'])
+    return float(failed) / len(jobs), float(sum(durations)) / len(durations)
+
+
+def vectorized(jobs):
+    columns = HistoryFrame(HistoryFrame.JOB, jobs).to_numpy()
+    passed = columns['result'] == HistoryFrame.PASSED
+    return (columns['result'] == HistoryFrame.FAILED).mean(), columns['duration'][passed].mean()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    session = Session(auth=None, options=copy.deepcopy(Yagocd.DEFAULT_OPTIONS))
+    history = [make_job(counter) for counter in range(args.runs, 0, -1)]
+
+    def run(func):
+        # entities are created anew each time, as they cache wrapped data
+        jobs = [JobInstance(session, data, None) for data in copy.deepcopy(history)]
+        return timeit.timeit(lambda: func(jobs), number=1)
+
+    sys.stdout.write('{:>12} {:>10}\n'.format('mode', 'time, s'))
+    results = dict()
+    for name, func in [('loop', loop), ('vectorized', vectorized)]:
+        results[name] = min(run(func) for _ in range(args.repeat))
+        sys.stdout.write('{:>12} {:10.3f}\n'.format(name, results[name]))
+
+    frame = HistoryFrame(HistoryFrame.JOB, history)
+    columns = frame.to_numpy()
+    aggregate = min(timeit.repeat(
+        lambda: (columns['result'] == HistoryFrame.FAILED).mean(), number=1, repeat=args.repeat
+    ))
+    sys.stdout.write('{:>12} {:10.4f}\n'.format('numpy only', aggregate))
+    sys.stdout.write('speedup: {:.1f}x, frame size: {:.1f} MiB\n'.format(
+        results['loop'] / results['vectorized'],
+        sum(column.nbytes for column in columns.values()) / 1024.0 / 1024
+    ))
+    assert numpy.allclose(loop([JobInstance(session, data, None) for data in history]), vectorized(history))
+
+
+if __name__ == '__main__':
+    main()
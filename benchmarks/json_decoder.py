@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+"""
+Benchmark of decoding JSON responses with the standard `json` module
+compared to accelerated libraries supported by `yagocd.decoder`.
+
+Bodies of JSON responses are taken from recorded cassettes, grouped by
+the endpoint and decoded by each of installed libraries.
+
+Usage::
+
+    python benchmarks/json_decoder.py [--number 20] [--top 15]
+"""
+import argparse
+import collections
+import gzip
+import importlib
+import io
+import json
+import os
+import re
+import sys
+import timeit
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yagocd.decoder import DECODERS  # noqa: E402
+
+CASSETTES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests', 'fixtures', 'cassettes')
+
+
+def endpoint(uri):
+    path = re.sub(r'^https?://[^/]+/go/', '', uri.split('?')[0])
+    # group requests for different pipelines, counters and so on together
+    return '/'.join(part for part in path.split('/')[:3] if not part.isdigit())
+
+
+def load_bodies():
+    bodies = collections.defaultdict(list)
+    for root, _, files in os.walk(CASSETTES):
+        for name in files:
+            with open(os.path.join(root, name)) as f:
+                cassette = yaml.safe_load(f)
+            for interaction in cassette.get('interactions', []):
+                response = interaction['response']
+                content_type = ''.join(response['headers'].get('Content-Type', []))
+                if 'json' not in content_type:
+                    continue
+                body = response['body']['string']
+                if not isinstance(body, bytes):
+                    body = body.encode('utf-8')
+                if 'gzip' in response['headers'].get('Content-Encoding', []):
+                    body = gzip.GzipFile(fileobj=io.BytesIO(body)).read()
+                try:
+                    json.loads(body.decode('utf-8'))
+                except ValueError:
+                    continue
+                bodies[endpoint(interaction['request']['uri'])].append(body)
+    return bodies
+
+
+def find_decoders():
+    decoders = [('json', json.loads)]
+    for name in DECODERS:
+        try:
+            decoders.append((name, importlib.import_module(name).loads))
+        except ImportError:
+            sys.stderr.write('{} is not installed, skipping\n'.format(name))
+    return decoders
+
+
+def measure(loads, bodies, number):
+    return min(timeit.repeat(lambda: [loads(body) for body in bodies], number=number, repeat=3)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=20)
+    parser.add_argument('--top', type=int, default=15, help='number of endpoints with the largest responses to show')
+    args = parser.parse_args()
+
+    bodies = load_bodies()
+    decoders = find_decoders()
+    # the standard library accepts only text on older versions of python
+    texts = dict((name, [body.decode('utf-8') for body in items]) for name, items in bodies.items())
+
+    endpoints = sorted(bodies, key=lambda name: -sum(len(body) for body in bodies[name]))[:args.top]
+    endpoints.append('total')
+    bodies['total'] = [body for name in bodies for body in bodies[name]]
+    texts['total'] = [body for name in texts for body in texts[name]]
+
+    sys.stdout.write('{:<40} {:>10}'.format('endpoint', 'KiB'))
+    for name, _ in decoders:
+        sys.stdout.write(' {:>12}'.format(name + ', ms'))
+    sys.stdout.write('\n')
+
+    for name in endpoints:
+        sys.stdout.write('{:<40} {:10.1f}'.format(name[:40], sum(len(body) for body in bodies[name]) / 1024.0))
+        baseline = None
+        for decoder, loads in decoders:
+            elapsed = measure(loads, texts[name] if decoder == 'json' else bodies[name], args.number)
+            baseline = baseline or elapsed
+            speedup = '' if decoder == 'json' else '{:.1f}x'.format(baseline / elapsed)
+            sys.stdout.write(' {:6.2f} {:>5}'.format(elapsed * 1000, speedup))
+        sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
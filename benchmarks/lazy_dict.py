@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+"""
+Benchmark of wrapping resource data with `LazyDict` compared to `EasyDict`.
+
+Generates pages of pipeline history with nested stages, jobs and material
+revisions, wraps each instance the same way `PipelineManager.history` does
+and measures time of wrapping alone, reading only counter of each instance
+and reading all jobs of all stages.
+
+Usage::
+
+    python benchmarks/lazy_dict.py [--pages 100] [--page-size 10]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from easydict import EasyDict  # noqa: E402
+
+from yagocd.util import LazyDict  # noqa: E402
+
+STAGES = 6
+JOBS = 4
+MATERIALS = 3
+MODIFICATIONS = 10
+
+
+def make_instance(counter):
+    return {
+        'name': 'Consumer_Website',
+        'counter': counter,
+        'label': str(counter),
+        'natural_order': float(counter),
+        'can_run': True,
+        'stages': [
+            {
+                'name': 'stage{}'.format(stage),
+                'counter': '1',
+                'result': 'Passed',
+                'scheduled': True,
+                'approval_type': 'success',
+                'jobs': [
+                    {'name': 'job{}'.format(job), 'state': 'Completed', 'result': 'Passed', 'id': job}
+                    for job in range(JOBS)
+                ],
+            }
+            for stage in range(STAGES)
+        ],
+        'build_cause': {
+            'trigger_message': 'modified by user',
+            'approver': '',
+            'material_revisions': [
+                {
+                    'changed': True,
+                    'material': {'type': 'Git', 'description': 'git@example.com:repo{}.git'.format(material)},
+                    'modifications': [
+                        {
+                            'revision': '{:040x}'.format(modification),
+                            'user_name': 'user <user@example.com>',
+                            'comment': 'Commit message',
+                            'modified_time': 1463606893439,
+                        }
+                        for modification in range(MODIFICATIONS)
+                    ],
+                }
+                for material in range(MATERIALS)
+            ],
+        },
+    }
+
+
+def wrap(cls, pages):
+    return [[cls(instance) for instance in page] for page in pages]
+
+
+def read_counter(cls, pages):
+    return [instance.counter for page in wrap(cls, pages) for instance in page]
+
+
+def read_jobs(cls, pages):
+    return [
+        job.state
+        for page in wrap(cls, pages)
+        for instance in page
+        for stage in instance.stages
+        for job in stage.jobs
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--page-size', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    pages = [
+        [make_instance(page * args.page_size + number) for number in range(args.page_size)]
+        for page in range(args.pages)
+    ]
+
+    sys.stdout.write('{:>12} {:>12} {:>12} {:>8}\n'.format('scenario', 'EasyDict, s', 'LazyDict, s', 'speedup'))
+    for name, scenario in [('wrap', wrap), ('counter', read_counter), ('all jobs', read_jobs)]:
+        easy, lazy = [
+            min(timeit.repeat(lambda: scenario(cls, pages), number=1, repeat=args.repeat))
+            for cls in (EasyDict, LazyDict)
+        ]
+        sys.stdout.write('{:>12} {:12.4f} {:12.4f} {:7.1f}x\n'.format(name, easy, lazy, easy / lazy))
+
+
+if __name__ == '__main__':
+    main()
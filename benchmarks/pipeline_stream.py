@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+"""
+Benchmark of peak memory and time of decoding the list of pipeline groups
+as a whole compared to incremental decoding with `yagocd.decoder.iter_array`.
+
+Generates `config/pipeline_groups` document and decodes it from chunks,
+the same way `PipelineManager.list` and `PipelineManager.stream` do.
+Requires python 3 for `tracemalloc`.
+
+Usage::
+
+    python benchmarks/pipeline_stream.py [--groups 200] [--pipelines 50]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yagocd.decoder import iter_array  # noqa: E402
+
+CHUNK_SIZE = 64 * 1024
+
+
+def make_document(groups, pipelines):
+    return json.dumps([
+        {
+            'name': 'group{}'.format(group),
+            'pipelines': [
+                {
+                    'name': 'pipeline{}-{}'.format(group, pipeline),
+                    'label': '${COUNT}',
+                    'materials': [
+                        {
+                            'description': 'URL: https://example.com/repo{}.git, Branch: master'.format(pipeline),
+                            'fingerprint': '{:064x}'.format(group * pipelines + pipeline),
+                            'type': 'Git',
+                        },
+                    ],
+                    'stages': [{'name': 'stage{}'.format(stage)} for stage in range(5)],
+                }
+                for pipeline in range(pipelines)
+            ],
+        }
+        for group in range(groups)
+    ]).encode('utf-8')
+
+
+def chunks(document):
+    for start in range(0, len(document), CHUNK_SIZE):
+        yield document[start:start + CHUNK_SIZE]
+
+
+def whole(document):
+    # response content is joined from chunks and decoded at once
+    groups = json.loads(b''.join(chunks(document)).decode('utf-8'))
+    return sum(len(group['pipelines']) for group in groups)
+
+
+def incremental(document):
+    return sum(len(group['pipelines']) for group in iter_array(chunks(document)))
+
+
+def measure(func, document):
+    tracemalloc.start()
+    start = time.time()
+    count = func(document)
+    elapsed = time.time() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--groups', type=int, default=200)
+    parser.add_argument('--pipelines', type=int, default=50)
+    args = parser.parse_args()
+
+    document = make_document(args.groups, args.pipelines)
+    sys.stdout.write('document: {:.1f} MiB\n'.format(len(document) / 1024.0 / 1024))
+    sys.stdout.write('{:>12} {:>10} {:>10} {:>14}\n'.format('mode', 'pipelines', 'time, s', 'peak, MiB'))
+    for name, func in [('whole', whole), ('incremental', incremental)]:
+        count, elapsed, peak = measure(func, document)
+        sys.stdout.write('{:>12} {:10d} {:10.3f} {:14.1f}\n'.format(name, count, elapsed, peak / 1024.0 / 1024))
+
+
+if __name__ == '__main__':
+    main()
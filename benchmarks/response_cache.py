@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+"""
+Benchmark of repeated reads of finished stages with and without `response_cache`.
+
+Starts local HTTP server in a separate process, which replies to each
+request for stage instance with a finished stage, and reads the same
+stages over and over, the way reporting tools walking history do.
+
+Usage::
+
+    python benchmarks/response_cache.py [--stages 100] [--rounds 20] [--jobs 20]
+"""
+import argparse
+import copy
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from six.moves import BaseHTTPServer, socketserver
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yagocd.cache import ResponseCache  # noqa: E402
+from yagocd.client import Yagocd  # noqa: E402
+
+
+class Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # noqa: N802
+        with self.server.counter.get_lock():
+            self.server.counter.value += 1
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.server.body)))
+        self.end_headers()
+        self.wfile.write(self.server.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(server):
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--stages', type=int, default=100)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--jobs', type=int, default=20, help='number of jobs in each stage')
+    args = parser.parse_args()
+
+    server = Server(('127.0.0.1', 0), Handler)
+    server.counter = multiprocessing.Value('i', 0)
+    server.body = json.dumps(dict(
+        name='build', counter=1, pipeline_name='Pipeline', pipeline_counter=1, result='Passed',
+        jobs=[dict(name='job-{}'.format(i), state='Completed', result='Passed') for i in range(args.jobs)]
+    )).encode('utf-8')
+    process = multiprocessing.Process(target=serve, args=(server,))
+    process.daemon = True
+    process.start()
+    server.server_close()
+
+    try:
+        for cache in (None, ResponseCache()):
+            server.counter.value = 0
+            options = copy.deepcopy(Yagocd.DEFAULT_OPTIONS)
+            options['response_cache'] = cache
+            client = Yagocd(server='http://127.0.0.1:{}'.format(server.server_address[1]), options=options)
+            # version is known in advance, so the server doesn't have to serve about page
+            client._session._Session__server_version = '17.5.0'
+
+            start = time.time()
+            for _ in range(args.rounds):
+                for counter in range(1, args.stages + 1):
+                    client.stages.get('Pipeline', counter, 'build', 1)
+            elapsed = time.time() - start
+
+            sys.stdout.write('response_cache={}: {} reads, {} requests to server, {:.2f} s{}\n'.format(
+                cache is not None, args.stages * args.rounds, server.counter.value, elapsed,
+                ', stats: {}'.format(cache.stats()) if cache is not None else ''
+            ))
+    finally:
+        process.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+"""
+Benchmark of the number of small requests per second made by the session.
+
+Starts local HTTP server in a separate process, which replies to each
+request with a tiny JSON document, and makes requests through the
+manager, the same way client code does. Client CPU time per request is
+reported as well, as it's the part affected by the request construction.
+
+Usage::
+
+    python benchmarks/session_requests.py [--requests 5000] [--profile]
+"""
+import argparse
+import copy
+import cProfile
+import multiprocessing
+import os
+import pstats
+import sys
+import time
+
+from six.moves import BaseHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yagocd.client import Yagocd  # noqa: E402
+
+BODY = b'{"_embedded": {"agents": []}}'
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # headers and body are written separately, without it each response is delayed by the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # noqa: N802
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(server):
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--profile', action='store_true', help='print top functions by cumulative time')
+    args = parser.parse_args()
+
+    server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), Handler)
+    process = multiprocessing.Process(target=serve, args=(server,))
+    process.daemon = True
+    process.start()
+    server.server_close()
+
+    try:
+        options = copy.deepcopy(Yagocd.DEFAULT_OPTIONS)
+        # version is known in advance, so the server doesn't have to serve about page
+        client = Yagocd(server='http://127.0.0.1:{}'.format(server.server_address[1]), options=options)
+        client._session._Session__server_version = '17.5.0'
+        manager = client.agents
+
+        manager.list()  # warm up the connection
+        profiler = cProfile.Profile() if args.profile else None
+
+        start, cpu_start = time.time(), sum(os.times()[:2])
+        if profiler:
+            profiler.enable()
+        for _ in range(args.requests):
+            manager.list()
+        if profiler:
+            profiler.disable()
+        elapsed, cpu = time.time() - start, sum(os.times()[:2]) - cpu_start
+
+        sys.stdout.write('requests per second: {:.0f}\n'.format(args.requests / elapsed))
+        sys.stdout.write('client CPU per request: {:.1f} us\n'.format(cpu / args.requests * 1e6))
+        if profiler:
+            pstats.Stats(profiler, stream=sys.stdout).sort_stats('cumulative').print_stats(25)
+    finally:
+        process.terminate()
+
+
+if __name__ == '__main__':
+    main()
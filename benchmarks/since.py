@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+"""
+Benchmark of overhead of the `since` decorator.
+
+Measures calls of a trivial method without decoration, with decorator,
+which parses and compares versions on each call (as it was done before),
+and with the current one, which remembers the result of comparison.
+
+Usage::
+
+    python benchmarks/since.py [--number 1000000]
+"""
+import argparse
+import functools
+import os
+import sys
+import timeit
+from distutils.version import LooseVersion
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yagocd.util import since  # noqa: E402
+
+
+def legacy_since(since_version):
+    since_version = LooseVersion(since_version)
+
+    def decorator(entity):
+        @functools.wraps(entity)
+        def decorated(*args, **kwargs):
+            if LooseVersion(args[0]._session.server_version) < since_version:
+                raise RuntimeError()
+            return entity(*args, **kwargs)
+
+        return decorated
+
+    return decorator
+
+
+class Session(object):
+    server_version = '17.5.0'
+
+
+class Manager(object):
+    def __init__(self):
+        self._session = Session()
+
+    def plain(self, value):
+        return value
+
+    legacy = legacy_since('16.6.0')(plain)
+    memoized = since('16.6.0')(plain)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    manager = Manager()
+    sys.stdout.write('{:>10} {:>12} {:>14}\n'.format('method', 'ns per call', 'overhead, ns'))
+    baseline = None
+    for name in ('plain', 'legacy', 'memoized'):
+        method = getattr(manager, name)
+        elapsed = min(timeit.repeat(lambda: method(1), number=args.number, repeat=args.repeat))
+        per_call = elapsed / args.number * 1e9
+        baseline = baseline or per_call
+        sys.stdout.write('{:>10} {:12.0f} {:14.0f}\n'.format(name, per_call, per_call - baseline))
+
+
+if __name__ == '__main__':
+    main()
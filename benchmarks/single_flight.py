@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+"""
+Benchmark of concurrent identical requests with and without `single_flight`.
+
+Starts local HTTP server in a separate process, which replies to each
+request after a delay (emulating busy GoCD server), and refreshes the
+list of agents from many threads at once, the way dashboards do.
+Number of requests, which reached the server, and total time are reported.
+
+Usage::
+
+    python benchmarks/single_flight.py [--threads 50] [--refreshes 20] [--delay 0.05]
+"""
+import argparse
+import copy
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+from six.moves import BaseHTTPServer, socketserver
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yagocd.client import Yagocd  # noqa: E402
+
+BODY = b'{"_embedded": {"agents": []}}'
+
+
+class Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # noqa: N802
+        with self.server.counter.get_lock():
+            self.server.counter.value += 1
+        time.sleep(self.server.delay)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(server):
+    server.serve_forever()
+
+
+def run(url, threads, refreshes, single_flight):
+    options = copy.deepcopy(Yagocd.DEFAULT_OPTIONS)
+    options.update(pool_maxsize=threads, single_flight=single_flight)
+    client = Yagocd(server=url, options=options)
+    # version is known in advance, so the server doesn't have to serve about page
+    client._session._Session__server_version = '17.5.0'
+
+    barrier = threading.Semaphore(0)
+
+    def dashboard():
+        for _ in range(refreshes):
+            barrier.acquire()
+            client.agents.list()
+
+    workers = [threading.Thread(target=dashboard) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+
+    start = time.time()
+    for _ in range(refreshes):
+        # all threads refresh at the same moment
+        for _ in range(threads):
+            barrier.release()
+        time.sleep(0.01)
+    for worker in workers:
+        worker.join()
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=50)
+    parser.add_argument('--refreshes', type=int, default=20)
+    parser.add_argument('--delay', type=float, default=0.05, help='server response time in seconds')
+    args = parser.parse_args()
+
+    server = Server(('127.0.0.1', 0), Handler)
+    server.counter = multiprocessing.Value('i', 0)
+    server.delay = args.delay
+    process = multiprocessing.Process(target=serve, args=(server,))
+    process.daemon = True
+    process.start()
+    server.server_close()
+    url = 'http://127.0.0.1:{}'.format(server.server_address[1])
+
+    try:
+        for single_flight in (False, True):
+            server.counter.value = 0
+            elapsed = run(url, args.threads, args.refreshes, single_flight)
+            sys.stdout.write('single_flight={}: {} calls, {} requests to server, {:.2f} s\n'.format(
+                single_flight, args.threads * args.refreshes, server.counter.value, elapsed
+            ))
+    finally:
+        process.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -25,16 +25,20 @@
 # THE SOFTWARE.
 #
 ###############################################################################
+import collections
 import copy
 import os
 import shutil
 import subprocess
 import sys
+import threading
 import time
 
 import mock
 import pytest
 import requests
+# noinspection PyUnresolvedReferences
+from six.moves import BaseHTTPServer, socketserver
 from vcr import VCR
 
 from yagocd import Yagocd
@@ -68,6 +72,7 @@ def mock_session():
     session = mock.patch('yagocd.session.Session').start()
     session.server_url = 'http://example.com'
     session.server_version = '999.999.999'
+    session._options = copy.deepcopy(Yagocd.DEFAULT_OPTIONS)
     return session
 
 
@@ -81,6 +86,81 @@ def session_fixture():
     )
 
 
+StubRequest = collections.namedtuple('StubRequest', 'method path headers body')
+
+
+class StubServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """
+    Tiny HTTP server for testing transport level functionality of the session.
+
+    Responses are configured with `routes` dictionary: key is a tuple of
+    method and path, value is a callable, which receives request handler
+    and returns tuple of (status, headers, body).
+    """
+    daemon_threads = True
+
+    def __init__(self):
+        BaseHTTPServer.HTTPServer.__init__(self, ('127.0.0.1', 0), StubRequestHandler)
+        self.routes = dict()
+        self.requests = list()
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{}'.format(self.server_address[1])
+
+
+class StubRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.body = self.rfile.read(length) if length else b''
+        self.server.requests.append(StubRequest(self.command, self.path, self.headers, self.body))
+
+        route = self.server.routes.get((self.command, self.path.split('?')[0]))
+        if route is None:
+            status, headers, body = 404, {}, b''
+        else:
+            status, headers, body = route(self)
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if 'Content-Length' not in headers:
+            self.send_header('Content-Length', str(len(body)))
+        elif int(headers['Content-Length']) != len(body):
+            # simulate dropped connection
+            self.close_connection = True
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    do_GET = do_HEAD = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.yield_fixture()
+def stub_server():
+    server = StubServer()
+    thread = threading.Thread(target=server.serve_forever, kwargs=dict(poll_interval=0.05))
+    thread.daemon = True
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture()
+def stub_session(stub_server):
+    options = copy.deepcopy(Yagocd.DEFAULT_OPTIONS)
+    options['server'] = stub_server.url
+    return Session(auth=None, options=options)
+
+
 root_cassette_library_dir = os.path.join(tests_dir(), 'fixtures/cassettes')
 
 
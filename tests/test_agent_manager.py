@@ -33,7 +33,7 @@ import pytest
 from six import string_types
 
 from tests import AbstractTestManager, RequestContentTypeHeadersMixin, ReturnValueMixin
-from yagocd.resources import agent, job
+from yagocd.resources import agent, BaseManager, job
 
 
 @pytest.fixture()
@@ -272,3 +272,30 @@ class TestMagicMethods(object):
         for _ in manager:
             pass
         list_mock.assert_called_once_with()
+
+
+class TestAcceptHeader(object):
+    @pytest.mark.parametrize('server_version, expected', [
+        ('15.2.0', 'application/vnd.go.cd.v1+json'),
+        ('16.1.0', 'application/vnd.go.cd.v1+json'),
+        ('16.8.0', 'application/vnd.go.cd.v3+json'),
+        ('17.5.0', 'application/vnd.go.cd.v4+json'),
+    ])
+    def test_accept_header(self, mock_session, server_version, expected):
+        mock_session.server_version = server_version
+        assert agent.AgentManager(session=mock_session)._accept_header() == expected
+
+    def test_choice_is_memoized(self, mock_session):
+        mock_session.server_version = '16.7.1'
+        manager = agent.AgentManager(session=mock_session)
+
+        with mock.patch.dict(BaseManager._accept_headers, clear=True), \
+                mock.patch('yagocd.util.YagocdUtil.choose_option', return_value='foo') as choose_mock:
+            assert manager._accept_header() == 'foo'
+            assert agent.AgentManager(session=mock_session)._accept_header() == 'foo'
+
+        choose_mock.assert_called_once_with(
+            version_to_options=agent.AgentManager.VERSION_TO_ACCEPT_HEADER,
+            default=agent.AgentManager.ACCEPT_HEADER,
+            server_version='16.7.1'
+        )
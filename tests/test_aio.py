@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+import json
+
+import pytest
+
+from yagocd.resources import agent, pipeline
+from yagocd.util import Since
+
+asyncio = pytest.importorskip('asyncio')
+aio = pytest.importorskip('yagocd.aio')
+
+
+def _run(awaitable):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(awaitable)
+    finally:
+        loop.close()
+
+
+def _gather(*awaitables):
+    loop = asyncio.new_event_loop()
+    try:
+        futures = [asyncio.ensure_future(awaitable, loop=loop) for awaitable in awaitables]
+        return loop.run_until_complete(asyncio.gather(*futures))
+    finally:
+        loop.close()
+
+
+def _collect(iterator):
+    loop = asyncio.new_event_loop()
+    items = list()
+    try:
+        while True:
+            items.append(loop.run_until_complete(iterator.__anext__()))
+    except StopAsyncIteration:  # noqa: F821
+        return items
+    finally:
+        loop.close()
+
+
+class TestAsyncYagocd(object):
+    @pytest.yield_fixture(autouse=True)
+    def disable_since(self):
+        _original = Since.ENABLED
+        Since.ENABLED = False
+        yield
+        Since.ENABLED = _original
+
+    @pytest.yield_fixture()
+    def client(self, stub_server):
+        client = aio.AsyncYagocd(server=stub_server.url)
+        yield client
+        client.close()
+
+    def test_managers_are_wrapped(self, client):
+        assert isinstance(client.agents, aio.AsyncManager)
+        assert isinstance(client.agents.manager, agent.AgentManager)
+        assert client.agents is client.agents
+
+    def test_server_url(self, client, stub_server):
+        assert client.server_url == stub_server.url
+
+    def test_gather(self, client, stub_server):
+        about = b'<table><tr><td>Go Server Version:</td><td>17.5.0(5095-abc)</td></tr></table>'
+        stub_server.routes[('GET', '/go/about')] = lambda handler: (200, {}, about)
+        body = json.dumps({'_embedded': {'agents': [{'uuid': 'foo'}, {'uuid': 'bar'}]}}).encode('utf-8')
+        stub_server.routes[('GET', '/go/api/agents')] = lambda handler: (200, {}, body)
+
+        results = _gather(*[client.agents.list() for _ in range(20)])
+
+        assert len(results) == 20
+        assert all([a.data.uuid for a in result] == ['foo', 'bar'] for result in results)
+        assert len([r for r in stub_server.requests if r.path == '/go/api/agents']) == 20
+
+    def test_generator_is_consumed(self, client, stub_server):
+        pages = {
+            '/go/api/pipelines/foo/history/0': {'pipelines': [{'name': 'foo', 'counter': 2}]},
+            '/go/api/pipelines/foo/history/1': {'pipelines': [{'name': 'foo', 'counter': 1}]},
+            '/go/api/pipelines/foo/history/2': {'pipelines': []},
+        }
+        for path, data in pages.items():
+            stub_server.routes[('GET', path)] = lambda handler, data=data: (200, {}, json.dumps(data).encode('utf-8'))
+
+        result = _run(client.pipelines.full_history('foo'))
+
+        assert isinstance(result, list)
+        assert [i.data.counter for i in result] == [2, 1]
+        assert all(isinstance(i, pipeline.PipelineInstance) for i in result)
+
+    def test_generator_is_iterated(self, client, stub_server):
+        pages = [
+            {'pipelines': [{'name': 'foo', 'counter': 2}]},
+            {'pipelines': [{'name': 'foo', 'counter': 1}]},
+            {'pipelines': []},
+        ]
+        for offset, data in enumerate(pages):
+            stub_server.routes[('GET', '/go/api/pipelines/foo/history/{}'.format(offset))] = (
+                lambda handler, data=data: (200, {}, json.dumps(data).encode('utf-8'))
+            )
+
+        iterator = client.pipelines.full_history('foo').__aiter__()
+        assert not stub_server.requests
+
+        assert [i.data.counter for i in _collect(iterator)] == [2, 1]
+
+    def test_workers(self, stub_server):
+        client = aio.AsyncYagocd(server=stub_server.url, options={'pool_maxsize': 2})
+        try:
+            assert client.session._executor._max_workers == aio.AsyncSession.DEFAULT_WORKERS
+        finally:
+            client.close()
+
+        client = aio.AsyncYagocd(server=stub_server.url, workers=3)
+        try:
+            assert client.session._executor._max_workers == 3
+        finally:
+            client.close()
+
+    def test_run(self, client):
+        assert _run(client.run(sum, [1, 2, 3])) == 6
+
+    def test_session_request(self, client, stub_server):
+        stub_server.routes[('GET', '/foo')] = lambda handler: (200, {}, b'bar')
+        assert _run(client.session.get('foo')).content == b'bar'
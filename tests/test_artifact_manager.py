@@ -26,8 +26,10 @@
 #
 ###############################################################################
 
+import hashlib
 import json
 import os
+import time
 import zipfile
 
 import mock
@@ -606,6 +608,90 @@ class TestAppend(AbstractTestManager, BaseTestArtifactManager, ReturnValueMixin)
         return 'File {0} was appended successfully'.format(self.PATH_TO_FILE)
 
 
+class TestArtifactTree(BaseTestArtifactManager):
+    HELLO = '/yet-another-directory/sub-dir-1/sub-dir-3/hello-1.txt'
+
+    @pytest.fixture()
+    def tree(self, artifact_all):
+        return artifact.ArtifactTree(artifact_all)
+
+    def test_lookup(self, tree):
+        hello = tree[self.HELLO]
+
+        assert len(tree) == 24
+        assert hello.path == self.HELLO
+        assert hello.data.name == 'hello-1.txt'
+        assert tree['/yet-another-directory/sub-dir-1'] is tree['/yet-another-directory/sub-dir-1/']
+        assert self.HELLO in tree
+        assert '/yet-another-directory/sub-dir-1/hello-1.txt' not in tree
+        assert tree.get('/unknown') is None
+        with pytest.raises(KeyError):
+            _ = tree['/unknown']  # noqa
+
+    def test_children_are_not_rewrapped(self, tree):
+        folder = tree['/yet-another-directory/sub-dir-1/sub-dir-3/']
+
+        assert folder.children is folder.children
+        assert [c.path for c in folder.children] == [
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-1.txt',
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-3.txt',
+            '/yet-another-directory/sub-dir-1/sub-dir-3/hello-5.txt',
+        ]
+        assert folder.children[0].data is folder.data.files[0]
+        assert tree[self.HELLO] is folder.children[0]
+        assert tree[self.HELLO].children is None
+
+    def test_changes_of_children_are_shared(self, tree):
+        folder = tree['/yet-another-directory/sub-dir-1/sub-dir-3/']
+
+        folder.children[0].data.name = 'renamed.txt'
+        assert folder.data.files[0]['name'] == 'renamed.txt'
+
+    def test_nested_artifact_is_same_as_parsed(self, tree, session_fixture):
+        nested = tree[self.HELLO]
+        parsed = artifact.Artifact(session_fixture, dict(nested.data))
+
+        assert (
+            nested.pipeline_name, nested.pipeline_counter, nested.stage_name,
+            nested.stage_counter, nested.job_name, nested.path
+        ) == (
+            parsed.pipeline_name, parsed.pipeline_counter, parsed.stage_name,
+            parsed.stage_counter, parsed.job_name, parsed.path
+        )
+
+    def test_walk_nested(self, tree):
+        assert [(top, [f.path for f in files]) for top, _, files in tree.walk('/yet-another-directory/sub-dir-1')] == [
+            ('/yet-another-directory/sub-dir-1', []),
+            ('/yet-another-directory/sub-dir-1/sub-dir-3', [
+                '/yet-another-directory/sub-dir-1/sub-dir-3/hello-1.txt',
+                '/yet-another-directory/sub-dir-1/sub-dir-3/hello-3.txt',
+                '/yet-another-directory/sub-dir-1/sub-dir-3/hello-5.txt',
+            ]),
+        ]
+
+    @mock.patch('yagocd.resources.artifact.ArtifactManager.walk')
+    def test_artifact_walk_uses_tree(self, walk_mock, tree):
+        result = list(tree['/yet-another-directory/sub-dir-1/'].walk())
+
+        assert not walk_mock.called
+        assert [top for top, _, _ in result] == [
+            '/yet-another-directory/sub-dir-1/',
+            '/yet-another-directory/sub-dir-1/sub-dir-3',
+        ]
+
+    @mock.patch('yagocd.resources.artifact.ArtifactManager.list')
+    def test_manager_tree(self, list_mock, mock_manager, artifact_all):
+        list_mock.return_value = artifact_all
+
+        tree = mock_manager.tree()
+
+        list_mock.assert_called_once_with(
+            job_name=None, pipeline_counter=None, pipeline_name=None, stage_counter=None, stage_name=None
+        )
+        assert tree.artifacts == artifact_all
+        assert tree['/dummy.txt'] is artifact_all[2]
+
+
 class TestMagicMethods(BaseTestArtifactManager):
     @mock.patch('yagocd.resources.artifact.ArtifactManager.directory_wait')
     def test_indexed_based_access(self, directory_wait_mock, manager):
@@ -620,3 +706,495 @@ class TestMagicMethods(BaseTestArtifactManager):
         list_mock.assert_called_once_with(
             job_name=None, pipeline_counter=None, pipeline_name=None, stage_counter=None, stage_name=None
         )
+
+
+class BaseStubArtifactManager(BaseTestArtifactManager):
+    @pytest.fixture(autouse=True)
+    def server_version(self, stub_session):
+        with mock.patch.object(type(stub_session), 'server_version', new_callable=mock.PropertyMock) as version:
+            version.return_value = '17.5.0'
+            yield version
+
+    @pytest.fixture()
+    def stub_manager(self, stub_session):
+        return artifact.ArtifactManager(
+            session=stub_session,
+            pipeline_name=self.PIPELINE_NAME,
+            pipeline_counter=self.PIPELINE_COUNTER,
+            stage_name=self.STAGE_NAME,
+            stage_counter=self.STAGE_COUNTER,
+            job_name=self.JOB_NAME
+        )
+
+
+class TestDownload(BaseStubArtifactManager):
+    PATH = '/go/files/Shared_Services/7/Commit/1/build/foo/bar.bin'
+    CONTENT = os.urandom(200 * 1024)
+
+    @pytest.fixture()
+    def stub_artifact(self, stub_server, stub_session):
+        return artifact.Artifact(
+            session=stub_session,
+            data=dict(name='bar.bin', type='file', url=stub_server.url + self.PATH)
+        )
+
+    @pytest.fixture()
+    def route(self, stub_server):
+        stub_server.routes[('GET', self.PATH)] = lambda handler: (200, {}, self.CONTENT)
+
+    @pytest.mark.usefixtures('route')
+    def test_download_to_path(self, stub_manager, tmpdir):
+        destination = str(tmpdir.join('bar.bin'))
+
+        assert stub_manager.download('foo/bar.bin', destination) == len(self.CONTENT)
+        assert tmpdir.join('bar.bin').read_binary() == self.CONTENT
+        assert not tmpdir.join('bar.bin.part').check()
+
+    @pytest.mark.usefixtures('route')
+    def test_download_to_file_object(self, stub_manager):
+        destination = BytesIO()
+
+        stub_manager.download('foo/bar.bin', destination)
+        assert destination.getvalue() == self.CONTENT
+
+    @pytest.mark.usefixtures('route')
+    def test_progress(self, stub_manager):
+        progress = mock.MagicMock()
+
+        stub_manager.download('foo/bar.bin', BytesIO(), chunk_size=64 * 1024, progress=progress)
+        assert progress.call_args_list == [
+            mock.call(64 * 1024, len(self.CONTENT)),
+            mock.call(128 * 1024, len(self.CONTENT)),
+            mock.call(192 * 1024, len(self.CONTENT)),
+            mock.call(200 * 1024, len(self.CONTENT)),
+        ]
+
+    @pytest.mark.usefixtures('route')
+    def test_stream(self, stub_manager):
+        chunks = list(stub_manager.stream('foo/bar.bin', chunk_size=1024))
+
+        assert len(chunks) == 200
+        assert b''.join(chunks) == self.CONTENT
+
+    @pytest.mark.usefixtures('route')
+    def test_connection_is_released(self, stub_manager, stub_session):
+        stub_manager.download('foo/bar.bin', BytesIO())
+        chunks = stub_manager.stream('foo/bar.bin')
+        next(chunks)
+        chunks.close()
+        stub_manager.download('foo/bar.bin', BytesIO())
+
+        assert stub_session.pool_stats()['reused'] >= 1
+
+    def test_directory_not_ready(self, stub_server, stub_manager, tmpdir):
+        stub_server.routes[('GET', self.PATH + '.zip')] = lambda handler: (202, {}, b'')
+
+        assert stub_manager.download('foo/bar.bin.zip', str(tmpdir.join('bar.zip'))) is None
+        assert stub_manager.stream('foo/bar.bin.zip') is None
+        assert tmpdir.listdir() == []
+
+    @pytest.mark.usefixtures('route')
+    def test_artifact_download(self, stub_artifact, tmpdir):
+        destination = str(tmpdir.join('bar.bin'))
+
+        stub_artifact.download(destination)
+        assert tmpdir.join('bar.bin').read_binary() == self.CONTENT
+        assert b''.join(stub_artifact.stream()) == self.CONTENT
+
+    def test_artifact_folder(self, stub_server, stub_session):
+        folder = artifact.Artifact(
+            session=stub_session,
+            data=dict(name='foo', type='folder', url=stub_server.url + '/go/files/Shared_Services/7/Commit/1/build/foo')
+        )
+
+        with pytest.raises(artifact.YagocdException):
+            folder.download(BytesIO())
+        with pytest.raises(artifact.YagocdException):
+            folder.stream()
+
+
+class TestDownloadTree(BaseStubArtifactManager):
+    BASE = '/go/files/Shared_Services/7/Commit/1/build'
+    FILES = {
+        '/cruise-output/console.log': b'console',
+        '/dist/foo.txt': b'foo' * 1000,
+        '/dist/nested/bar.txt': b'bar',
+    }
+
+    @pytest.fixture()
+    def tree(self, stub_server):
+        def node(name, path, files=None):
+            data = dict(name=name, url=stub_server.url + self.BASE + path, type='file')
+            if files is not None:
+                data.update(type='folder', files=files)
+            return data
+
+        listing = [
+            node('cruise-output', '/cruise-output', [
+                node('console.log', '/cruise-output/console.log'),
+                node('md5.checksum', '/cruise-output/md5.checksum'),
+            ]),
+            node('dist', '/dist', [
+                node('empty', '/dist/empty', []),
+                node('foo.txt', '/dist/foo.txt'),
+                node('nested', '/dist/nested', [node('bar.txt', '/dist/nested/bar.txt')]),
+            ]),
+        ]
+        stub_server.routes[('GET', self.BASE + '.json')] = lambda h: (200, {}, json.dumps(listing).encode('utf-8'))
+        checksums = b'#Sun Jan 01 00:00:00 UTC 2017\ndist/foo.txt=' + hashlib.md5(
+            self.FILES['/dist/foo.txt']
+        ).hexdigest().encode('ascii')
+        stub_server.routes[('GET', self.BASE + '/cruise-output/md5.checksum')] = lambda h: (200, {}, checksums)
+
+        for path, content in self.FILES.items():
+            for method in ['GET', 'HEAD']:
+                stub_server.routes[(method, self.BASE + path)] = (lambda body: lambda h: (200, {}, body))(content)
+
+    def _downloaded(self, stub_server):
+        return sorted(
+            r.path[len(self.BASE):] for r in stub_server.requests
+            if r.method == 'GET' and r.path[len(self.BASE):] in self.FILES
+        )
+
+    @pytest.mark.usefixtures('tree')
+    def test_download_all(self, stub_manager, stub_server, tmpdir):
+        result = stub_manager.download_tree('/', str(tmpdir), workers=3)
+
+        assert tmpdir.join('dist', 'foo.txt').read_binary() == self.FILES['/dist/foo.txt']
+        assert tmpdir.join('dist', 'nested', 'bar.txt').read_binary() == b'bar'
+        assert tmpdir.join('dist', 'empty').check(dir=True)
+        assert tmpdir.join('cruise-output', 'md5.checksum').check(file=True)
+        assert result['downloaded'] == 4
+        assert result['skipped'] == 0
+        assert result['bytes'] > sum(len(content) for content in self.FILES.values())
+        assert result['throughput'] > 0
+
+    @pytest.mark.usefixtures('tree')
+    def test_download_folder(self, stub_manager, tmpdir):
+        result = stub_manager.download_tree('/dist/', str(tmpdir))
+
+        assert sorted(p.relto(tmpdir) for p in tmpdir.visit()) == [
+            'empty', 'foo.txt', 'nested', os.path.join('nested', 'bar.txt')
+        ]
+        assert result['downloaded'] == 2
+
+    @pytest.mark.usefixtures('tree')
+    def test_up_to_date_files_are_skipped(self, stub_manager, stub_server, tmpdir):
+        tmpdir.mkdir('dist').join('foo.txt').write_binary(self.FILES['/dist/foo.txt'])
+        tmpdir.mkdir('cruise-output').join('console.log').write_binary(b'CONSOLE')
+        tmpdir.join('dist').mkdir('nested').join('bar.txt').write_binary(b'baz')
+
+        result = stub_manager.download_tree('/', str(tmpdir))
+
+        # foo.txt matches checksum, for others sizes are compared
+        assert self._downloaded(stub_server) == []
+        assert result['skipped'] == 3
+        assert not any(r.method == 'HEAD' and r.path.endswith('foo.txt') for r in stub_server.requests)
+
+    @pytest.mark.usefixtures('tree')
+    def test_changed_files_are_downloaded(self, stub_manager, stub_server, tmpdir):
+        tmpdir.mkdir('dist').join('foo.txt').write_binary(b'x' * len(self.FILES['/dist/foo.txt']))
+        tmpdir.mkdir('cruise-output').join('console.log').write_binary(b'old')
+
+        stub_manager.download_tree('/', str(tmpdir))
+
+        assert self._downloaded(stub_server) == sorted(self.FILES)
+        assert tmpdir.join('dist', 'foo.txt').read_binary() == self.FILES['/dist/foo.txt']
+
+    def test_path_outside_destination(self, stub_manager, tmpdir):
+        with pytest.raises(artifact.YagocdException):
+            stub_manager._local_path(str(tmpdir), '', '/../evil.txt')
+
+
+def _ranged_route(content, drop_after=None, ranges=True):
+    dropped = list()
+
+    def route(handler):
+        headers = dict()
+        body = content
+        status = 200
+
+        header = handler.headers.get('Range')
+        if ranges:
+            headers['Accept-Ranges'] = 'bytes'
+        if ranges and header is not None:
+            first, last = header.split('=')[1].split('-')
+            first, last = int(first), int(last) if last else len(content) - 1
+            if first >= len(content):
+                return 416, {'Content-Range': 'bytes */{}'.format(len(content))}, b''
+            status, body = 206, content[first:last + 1]
+            headers['Content-Range'] = 'bytes {}-{}/{}'.format(first, last, len(content))
+
+        if drop_after is not None and handler.command == 'GET' and not dropped:
+            dropped.append(True)
+            headers['Content-Length'] = str(len(body))
+            body = body[:drop_after]
+
+        return status, headers, body
+
+    return route
+
+
+class TestResumableDownload(BaseStubArtifactManager):
+    PATH = '/go/files/Shared_Services/7/Commit/1/build/foo/big.bin'
+    CONTENT = os.urandom(256 * 1024)
+
+    def _route(self, stub_server, **kwargs):
+        stub_server.routes[('GET', self.PATH)] = _ranged_route(self.CONTENT, **kwargs)
+        stub_server.routes[('HEAD', self.PATH)] = _ranged_route(self.CONTENT, ranges=kwargs.get('ranges', True))
+
+    def _ranges(self, stub_server):
+        return [r.headers.get('Range') for r in stub_server.requests if r.method == 'GET']
+
+    def test_resume(self, stub_manager, stub_server, tmpdir):
+        self._route(stub_server)
+        tmpdir.join('big.bin.part').write_binary(self.CONTENT[:1000])
+        progress = mock.MagicMock()
+
+        written = stub_manager.download('foo/big.bin', str(tmpdir.join('big.bin')), resume=True, progress=progress)
+
+        assert written == len(self.CONTENT) - 1000
+        assert tmpdir.join('big.bin').read_binary() == self.CONTENT
+        assert self._ranges(stub_server) == ['bytes=1000-']
+        assert progress.call_args == mock.call(len(self.CONTENT), len(self.CONTENT))
+
+    def test_partial_file_is_ignored_without_resume(self, stub_manager, stub_server, tmpdir):
+        self._route(stub_server)
+        tmpdir.join('big.bin.part').write_binary(b'garbage')
+
+        stub_manager.download('foo/big.bin', str(tmpdir.join('big.bin')))
+
+        assert tmpdir.join('big.bin').read_binary() == self.CONTENT
+        assert self._ranges(stub_server) == [None]
+
+    def test_partial_file_is_complete(self, stub_manager, stub_server, tmpdir):
+        self._route(stub_server)
+        tmpdir.join('big.bin.part').write_binary(self.CONTENT)
+
+        assert stub_manager.download('foo/big.bin', str(tmpdir.join('big.bin')), resume=True) == 0
+        assert tmpdir.join('big.bin').read_binary() == self.CONTENT
+
+    def test_range_is_not_supported(self, stub_manager, stub_server, tmpdir):
+        self._route(stub_server, ranges=False)
+        tmpdir.join('big.bin.part').write_binary(self.CONTENT[:1000])
+
+        stub_manager.download('foo/big.bin', str(tmpdir.join('big.bin')), resume=True)
+
+        assert tmpdir.join('big.bin').read_binary() == self.CONTENT
+        assert self._ranges(stub_server) == ['bytes=1000-', None]
+
+    def test_dropped_connection_is_resumed(self, stub_manager, stub_server, tmpdir):
+        self._route(stub_server, drop_after=5000)
+
+        written = stub_manager.download('foo/big.bin', str(tmpdir.join('big.bin')), chunk_size=1000)
+
+        assert written == len(self.CONTENT)
+        assert tmpdir.join('big.bin').read_binary() == self.CONTENT
+        assert self._ranges(stub_server) == [None, 'bytes=5000-']
+
+    @mock.patch('yagocd.resources.artifact.ArtifactManager.RESUME_ATTEMPTS', 0)
+    def test_dropped_connection_attempts_exhausted(self, stub_manager, stub_server, tmpdir):
+        self._route(stub_server, drop_after=5000)
+
+        with pytest.raises(Exception):
+            stub_manager.download('foo/big.bin', str(tmpdir.join('big.bin')), chunk_size=1000)
+
+        assert not tmpdir.join('big.bin').check()
+        assert tmpdir.join('big.bin.part').size() == 5000
+
+    def test_segments(self, stub_manager, stub_server, tmpdir):
+        self._route(stub_server)
+        progress = mock.MagicMock()
+
+        written = stub_manager.download(
+            'foo/big.bin', str(tmpdir.join('big.bin')), chunk_size=1024, segments=4, progress=progress
+        )
+
+        assert written == len(self.CONTENT)
+        assert tmpdir.join('big.bin').read_binary() == self.CONTENT
+        assert sorted(self._ranges(stub_server)) == [
+            'bytes=0-65535', 'bytes=131072-196607', 'bytes=196608-262143', 'bytes=65536-131071'
+        ]
+        assert progress.call_args == mock.call(len(self.CONTENT), len(self.CONTENT))
+        assert [p.basename for p in tmpdir.listdir()] == ['big.bin']
+
+    def test_segments_resume(self, stub_manager, stub_server, tmpdir):
+        self._route(stub_server)
+        tmpdir.join('big.bin.part.1').write_binary(self.CONTENT[65536:65536 + 100])
+
+        stub_manager.download('foo/big.bin', str(tmpdir.join('big.bin')), chunk_size=1024, segments=4, resume=True)
+
+        assert tmpdir.join('big.bin').read_binary() == self.CONTENT
+        assert 'bytes=65636-131071' in self._ranges(stub_server)
+
+    def test_segments_not_supported(self, stub_manager, stub_server, tmpdir):
+        self._route(stub_server, ranges=False)
+
+        stub_manager.download('foo/big.bin', str(tmpdir.join('big.bin')), chunk_size=1024, segments=4)
+
+        assert tmpdir.join('big.bin').read_binary() == self.CONTENT
+        assert self._ranges(stub_server) == [None]
+
+
+class TestDirectoriesWait(BaseStubArtifactManager):
+    BASE = '/go/files/Shared_Services/7/Commit/1/build'
+
+    def _route(self, stub_server, path, statuses, delay=0):
+        statuses = list(statuses)
+
+        def route(handler):
+            time.sleep(delay)
+            status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+            return status, {}, path.encode('utf-8') if status == 200 else b''
+
+        stub_server.routes[('GET', self.BASE + '/' + path)] = route
+
+    def _count(self, stub_server, path):
+        return len([r for r in stub_server.requests if r.path == self.BASE + '/' + path])
+
+    def test_yielded_in_order_of_readiness(self, stub_manager, stub_server):
+        self._route(stub_server, 'slow.zip', [202, 202, 200])
+        self._route(stub_server, 'fast.zip', [200])
+        self._route(stub_server, 'medium.zip', [202, 200])
+
+        result = list(stub_manager.directories_wait(['slow.zip', 'fast.zip', 'medium.zip'], backoff=0.01))
+
+        assert result == [('fast.zip', b'fast.zip'), ('medium.zip', b'medium.zip'), ('slow.zip', b'slow.zip')]
+        assert self._count(stub_server, 'slow.zip') == 3
+        assert self._count(stub_server, 'fast.zip') == 1
+        assert self._count(stub_server, 'medium.zip') == 2
+
+    def test_timeout(self, stub_manager, stub_server):
+        self._route(stub_server, 'never.zip', [202])
+        self._route(stub_server, 'ready.zip', [200])
+
+        result = list(stub_manager.directories_wait(['never.zip', 'ready.zip'], timeout=0.2, backoff=0.05))
+
+        assert result == [('ready.zip', b'ready.zip'), ('never.zip', None)]
+        assert 2 <= self._count(stub_server, 'never.zip') <= 4
+
+    def test_directories_are_compressed_concurrently(self, stub_manager, stub_server):
+        paths = ['{}.zip'.format(i) for i in range(4)]
+        for path in paths:
+            self._route(stub_server, path, [202, 200], delay=0.2)
+
+        start_time = time.time()
+        result = dict(stub_manager.directories_wait(paths, backoff=0.01, workers=4))
+
+        assert result == {path: path.encode('utf-8') for path in paths}
+        assert time.time() - start_time < 1.2
+
+    def test_error(self, stub_manager, stub_server):
+        self._route(stub_server, 'ready.zip', [200])
+
+        with pytest.raises(artifact.RequestError):
+            list(stub_manager.directories_wait(['missing.zip']))
+
+    def test_empty(self, stub_manager):
+        assert list(stub_manager.directories_wait([])) == []
+
+
+class TestUpload(BaseStubArtifactManager):
+    BASE = '/go/files/Shared_Services/7/Commit/1/build'
+
+    @pytest.fixture()
+    def reports(self, tmpdir):
+        reports = tmpdir.mkdir('reports')
+        reports.join('index.html').write_binary(b'<html/>')
+        reports.mkdir('unit').join('result.xml').write_binary(b'<xml/>' * 10000)
+        reports.mkdir('empty')
+        return reports
+
+    @pytest.fixture()
+    def route(self, stub_server):
+        def route(handler):
+            if handler.path.endswith('forbidden.txt'):
+                return 403, {}, b'Forbidden'
+            return 201, {}, 'File {} was created successfully'.format(handler.path).encode('utf-8')
+
+        stub_server.routes[('POST', self.BASE + '/out/index.html')] = route
+        stub_server.routes[('POST', self.BASE + '/out/unit/result.xml')] = route
+        stub_server.routes[('POST', self.BASE + '/out/forbidden.txt')] = route
+
+    def _body(self, stub_server, path):
+        for request in stub_server.requests:
+            if request.path == self.BASE + path:
+                return request
+
+    @pytest.mark.usefixtures('route')
+    def test_upload_directory(self, stub_manager, stub_server, reports):
+        results = stub_manager.upload(reports.strpath, path='out', workers=2)
+
+        assert [(r['filename'], r['path'], r['error']) for r in results] == [
+            (reports.join('index.html').strpath, 'out/index.html', None),
+            (reports.join('unit', 'result.xml').strpath, 'out/unit/result.xml', None),
+        ]
+        assert results[0]['result'] == 'File {}/out/index.html was created successfully'.format(self.BASE)
+
+        request = self._body(stub_server, '/out/unit/result.xml')
+        assert request.headers['Confirm'] == 'true'
+        assert request.headers['Content-Type'].startswith('multipart/form-data; boundary=')
+        assert int(request.headers['Content-Length']) == len(request.body)
+        assert b'name="file"; filename="result.xml"' in request.body
+        assert b'\r\n\r\n' + b'<xml/>' * 10000 + b'\r\n--' in request.body
+
+    @pytest.mark.usefixtures('route')
+    def test_upload_files(self, stub_manager, stub_server, reports):
+        forbidden = reports.join('forbidden.txt')
+        forbidden.write_binary(b'secret')
+
+        results = stub_manager.upload(
+            [reports.join('index.html').strpath, forbidden.strpath, reports.join('missing.txt').strpath], path='/out/'
+        )
+
+        assert [r['path'] for r in results] == ['out/index.html', 'out/forbidden.txt', 'out/missing.txt']
+        assert results[0]['error'] is None
+        assert isinstance(results[1]['error'], artifact.RequestError)
+        assert isinstance(results[2]['error'], EnvironmentError)
+        assert len(stub_server.requests) == 2
+
+    def test_special_characters_in_names(self, stub_manager, stub_server, tmpdir):
+        def route(handler):
+            return 201, {}, b'created'
+
+        for name in ('x%7B1%7D.txt', '%7Bfoo%7D.txt', 'a%20b.txt'):
+            stub_server.routes[('POST', self.BASE + '/' + name)] = route
+        for name in ('x{1}.txt', '{foo}.txt', 'a b.txt'):
+            tmpdir.join(name).write_binary(b'content')
+
+        results = stub_manager.upload(tmpdir.strpath)
+
+        assert [(r['path'], r['result'], r['error']) for r in results] == [
+            ('a b.txt', 'created', None),
+            ('x{1}.txt', 'created', None),
+            ('{foo}.txt', 'created', None),
+        ]
+
+    def test_unexpected_error_is_recorded(self, stub_manager, stub_server, reports):
+        with mock.patch.object(stub_manager, '_upload', side_effect=[ValueError('boom'), 'ok']):
+            results = stub_manager.upload(reports.strpath, workers=1)
+
+        assert isinstance(results[0]['error'], ValueError)
+        assert results[1]['result'] == 'ok'
+
+    def test_nothing_to_upload(self, stub_manager, tmpdir):
+        assert stub_manager.upload(tmpdir.strpath) == []
+        assert stub_manager.upload([]) == []
+
+    def test_multipart_file(self, tmpdir):
+        filename = tmpdir.join('foo.txt')
+        filename.write_binary(b'0123456789')
+
+        with open(filename.strpath, 'rb') as f:
+            body = artifact._MultipartFile(field='file', filename=filename.strpath, f=f)
+            content = b''
+            while True:
+                chunk = body.read(7)
+                if not chunk:
+                    break
+                assert len(chunk) <= 7
+                content += chunk
+
+        assert len(body) == len(content)
+        assert content.startswith('--{}\r\n'.format(body.boundary).encode('utf-8'))
+        assert content.endswith('\r\n\r\n0123456789\r\n--{}--\r\n'.format(body.boundary).encode('utf-8'))
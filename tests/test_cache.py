@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+import mock
+import pytest
+
+from yagocd.cache import CachePolicy, ETagCache, pipeline_finished, ResponseCache, stage_finished, VersionCache
+
+
+def _response(status=200, etag=None):
+    response = mock.MagicMock(status_code=status)
+    response.headers = {'ETag': etag} if etag else {}
+    return response
+
+
+class TestETagCache(object):
+    @pytest.fixture()
+    def cache(self):
+        return ETagCache(maxsize=2)
+
+    def test_key(self):
+        assert ETagCache.key('url', {'b': 1, 'a': 2}, {'Accept': 'foo'}) == ('url', (('a', 2), ('b', 1)), 'foo')
+        assert ETagCache.key('url') == ('url', (), None)
+
+    def test_set_without_etag(self, cache):
+        cache.set('foo', _response())
+        assert cache.get('foo') is None
+
+    def test_set_get(self, cache):
+        response = _response(etag='"abc"')
+        cache.set('foo', response)
+        assert cache.get('foo') is response
+
+    def test_eviction(self, cache):
+        cache.set('a', _response(etag='a'))
+        cache.set('b', _response(etag='b'))
+        cache.get('a')
+        cache.set('c', _response(etag='c'))
+
+        assert len(cache) == 2
+        assert cache.get('b') is None
+        assert cache.get('a') is not None
+
+    def test_update_not_modified(self, cache):
+        cached = _response(etag='a')
+        fresh = _response(status=304)
+
+        assert cache.update('foo', cached, fresh) is cached
+        assert cache.stats() == dict(size=0, hits=1, misses=0)
+
+    def test_update_modified(self, cache):
+        fresh = _response(etag='b')
+
+        assert cache.update('foo', _response(etag='a'), fresh) is fresh
+        assert cache.get('foo') is fresh
+        assert cache.stats() == dict(size=1, hits=0, misses=1)
+
+    def test_clear(self, cache):
+        cache.update('foo', None, _response(etag='a'))
+        cache.clear()
+        assert cache.stats() == dict(size=0, hits=0, misses=0)
+
+
+def _json_response(data, status=200):
+    response = _response(status=status)
+    response.json.return_value = data
+    return response
+
+
+def _stage(result='Passed', state='Completed', **kwargs):
+    stage = dict(result=result, jobs=[dict(state='Completed'), dict(state=state)])
+    stage.update(kwargs)
+    return stage
+
+
+class TestResponseCache(object):
+    SERVER = 'http://localhost:8153/go/'
+
+    @pytest.fixture()
+    def cache(self):
+        return ResponseCache(maxsize=2)
+
+    def _key(self, path):
+        return ResponseCache.key(self.SERVER + path)
+
+    @pytest.mark.parametrize('path, cached', [
+        ('api/admin/config/412f48f7e2ff254e47564a6852ed7a2e.xml', True),
+        ('api/admin/config/current.xml', False),
+        ('api/stages/Pipeline/defaultStage/instance/2/1', True),
+        ('api/stages/Pipeline/defaultStage/history/0', False),
+        ('api/pipelines/Pipeline/instance/2', True),
+        ('api/pipelines/Pipeline/history/0', False),
+        ('api/pipelines/Pipeline/status', False),
+        ('pipelines/value_stream_map/Pipeline/7.json', True),
+    ])
+    def test_default_policies(self, cache, path, cached):
+        response = _json_response(dict(stages=[_stage()], **_stage()))
+        cache.set(self._key(path), response)
+
+        assert (cache.get(self._key(path)) is response) == cached
+
+    @pytest.mark.parametrize('data, finished', [
+        (_stage(), True),
+        (_stage(result='Cancelled'), True),
+        (_stage(result='Unknown', state='Building'), False),
+        (_stage(result='Failed', state='Building'), False),
+    ])
+    def test_stage_finished(self, data, finished):
+        assert stage_finished(_json_response(data)) == finished
+
+    @pytest.mark.parametrize('stages, finished', [
+        ([_stage(scheduled=True), _stage(scheduled=True)], True),
+        ([_stage(scheduled=True), _stage(result='Unknown', state='Scheduled')], False),
+        ([_stage(result='Failed', scheduled=True), _stage(result='Unknown', jobs=[], scheduled=False)], False),
+        ([], False),
+    ])
+    def test_pipeline_finished(self, stages, finished):
+        assert pipeline_finished(_json_response(dict(stages=stages))) == finished
+
+    def test_running_instance_is_not_cached(self, cache):
+        key = self._key('api/stages/Pipeline/defaultStage/instance/2/1')
+        cache.set(key, _json_response(_stage(result='Unknown', state='Building')))
+
+        assert cache.get(key) is None
+        assert cache.stats() == dict(size=0, hits=0, misses=1)
+
+    def test_error_is_not_cached(self, cache):
+        key = self._key('api/admin/config/412f48f7.xml')
+        cache.set(key, _response(status=404))
+        assert cache.get(key) is None
+
+    @mock.patch('yagocd.cache.time.time')
+    def test_ttl(self, time_mock):
+        cache = ResponseCache(policies=[CachePolicy(r'/status$', ttl=5)])
+        key = self._key('api/pipelines/Pipeline/status')
+        response = _response()
+
+        time_mock.return_value = 1000
+        cache.set(key, response)
+        time_mock.return_value = 1004.9
+        assert cache.get(key) is response
+        time_mock.return_value = 1005
+        assert cache.get(key) is None
+
+        assert cache.stats() == dict(size=0, hits=1, misses=1)
+
+    def test_first_matching_policy(self):
+        cache = ResponseCache(policies=[CachePolicy(r'/status$'), CachePolicy(r'/api/', immutable=True)])
+
+        assert cache.policy(self.SERVER + 'api/pipelines/Pipeline/status').immutable is False
+        assert cache.policy(self.SERVER + 'api/agents').immutable is True
+        assert cache.policy(self.SERVER + 'pipelines/value_stream_map/Pipeline/7.json') is None
+
+    def test_eviction(self, cache):
+        keys = [self._key('api/admin/config/{}.xml'.format(md5)) for md5 in ('a', 'b', 'c')]
+        for key in keys[:2]:
+            cache.set(key, _response())
+        cache.get(keys[0])
+        cache.set(keys[2], _response())
+
+        assert len(cache) == 2
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+
+    def test_stats_ignore_not_cached_urls(self, cache):
+        assert cache.get(self._key('api/agents')) is None
+        assert cache.stats() == dict(size=0, hits=0, misses=0)
+
+    def test_clear(self, cache):
+        key = self._key('api/admin/config/a.xml')
+        cache.set(key, _response())
+        cache.get(key)
+        cache.clear()
+        assert cache.stats() == dict(size=0, hits=0, misses=0)
+
+
+class TestVersionCache(object):
+    @pytest.fixture()
+    def cache(self, tmpdir):
+        return VersionCache(path=str(tmpdir.join('cache', 'versions.json')), ttl=60)
+
+    def test_missing(self, cache):
+        assert cache.get('http://example.com') is None
+
+    def test_set_get(self, cache):
+        cache.set('http://example.com', '17.5.0')
+        cache.set('http://example.org', '16.1.0')
+
+        assert cache.get('http://example.com') == '17.5.0'
+        assert VersionCache(path=cache.path).get('http://example.org') == '16.1.0'
+
+    @mock.patch('yagocd.cache.time.time')
+    def test_expired(self, time_mock, cache):
+        time_mock.return_value = 1000
+        cache.set('http://example.com', '17.5.0')
+
+        time_mock.return_value = 1059
+        assert cache.get('http://example.com') == '17.5.0'
+        time_mock.return_value = 1060
+        assert cache.get('http://example.com') is None
+
+    def test_corrupted(self, cache):
+        cache.set('http://example.com', '17.5.0')
+        with open(cache.path, 'w') as f:
+            f.write('{"http://example.com": ')
+
+        assert cache.get('http://example.com') is None
+        cache.set('http://example.com', '17.5.0')
+        assert cache.get('http://example.com') == '17.5.0'
+
+    def test_write_error_is_ignored(self, cache):
+        with mock.patch('yagocd.cache.tempfile.mkstemp', side_effect=OSError):
+            cache.set('http://example.com', '17.5.0')
+        assert cache.get('http://example.com') is None
+
+    def test_clear(self, cache):
+        cache.set('http://example.com', '17.5.0')
+        cache.clear()
+        cache.clear()
+        assert cache.get('http://example.com') is None
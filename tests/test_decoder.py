@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+import json
+
+import mock
+import pytest
+import requests
+
+from yagocd import decoder
+
+
+def _response(content, encoding=None):
+    response = requests.Response()
+    response._content = content
+    response.encoding = encoding
+    return response
+
+
+class TestFindDecoder(object):
+    @pytest.fixture(autouse=True)
+    def reset(self):
+        decoder._default = None
+        yield
+        decoder._default = None
+
+    def test_fallback(self):
+        with mock.patch('importlib.import_module', side_effect=ImportError):
+            assert decoder.find_decoder() is json.loads
+
+    def test_first_installed(self):
+        fast = mock.MagicMock()
+
+        def import_module(name):
+            if name == decoder.DECODERS[1]:
+                return fast
+            raise ImportError(name)
+
+        with mock.patch('importlib.import_module', side_effect=import_module) as import_mock:
+            assert decoder.find_decoder() is fast.loads
+            assert decoder.find_decoder() is fast.loads
+        assert import_mock.call_count == 2
+
+
+class TestDecode(object):
+    def test_utf8_is_passed_as_bytes(self):
+        loads = mock.MagicMock(return_value={})
+        decoder.decode(_response(b'{"a": "\xc3\xa9"}'), loads)
+        loads.assert_called_once_with(b'{"a": "\xc3\xa9"}')
+
+    def test_other_encoding_is_decoded(self):
+        loads = mock.MagicMock(return_value={})
+        decoder.decode(_response(u'{"a": "\xe9"}'.encode('utf-16')), loads)
+        loads.assert_called_once_with(u'{"a": "\xe9"}')
+
+    def test_kwargs_use_standard_decoder(self):
+        loads = mock.MagicMock()
+        assert decoder.decode(_response(b'{"a": 1.5}'), loads, parse_float=str) == {'a': '1.5'}
+        assert not loads.called
+
+
+class TestIterArray(object):
+    DATA = [
+        {'name': u'gr\xf8up', 'pipelines': [{'name': 'foo', 'counter': 12345, 'ratio': 1.5}, {'name': 'bar'}]},
+        [True, False, None],
+        12345,
+        u'☃',
+        {},
+    ]
+
+    @pytest.mark.parametrize('size', [1, 2, 3, 10, 1024])
+    def test_chunks(self, size):
+        document = json.dumps(self.DATA).encode('utf-8')
+        chunks = [document[i:i + size] for i in range(0, len(document), size)]
+        assert list(decoder.iter_array(chunks)) == self.DATA
+
+    def test_items_are_yielded_as_received(self):
+        def chunks():
+            yield b'[{"a": 1}, '
+            raise AssertionError('item is yielded only when the next chunk is received')
+
+        assert next(decoder.iter_array(chunks())) == {'a': 1}
+
+    @pytest.mark.parametrize('chunks, expected', [
+        ([b'[1.', b'5]'], [1.5]),
+        ([b'[12', b'3e', b'4]'], [123e4]),
+        ([b'[1e', b'-', b'2, 7', b'.25E+', b'1]'], [1e-2, 72.5]),
+        ([b'[-', b'3', b']'], [-3]),
+        ([b'[tr', b'ue, nu', b'll]'], [True, None]),
+    ])
+    def test_scalars_split_across_chunks(self, chunks, expected):
+        assert list(decoder.iter_array(chunks)) == expected
+
+    def test_empty(self):
+        assert list(decoder.iter_array([b' [', b' ] \n'])) == []
+
+    @pytest.mark.parametrize('document', [b'', b'{}', b'[1 2]', b'[1,]', b'[1] 2', b'[1', b'[{"a": ', b'[1.]', b'[1e]'])
+    def test_invalid(self, document):
+        with pytest.raises(ValueError):
+            list(decoder.iter_array([document[i:i + 1] for i in range(len(document))]))
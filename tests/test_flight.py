@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+import threading
+import time
+
+import pytest
+
+from yagocd.flight import SingleFlight
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.001)
+
+
+class TestSingleFlight(object):
+    THREADS = 5
+
+    def _run(self, flight, func, key='key'):
+        results = [None] * self.THREADS
+
+        def target(index):
+            try:
+                results[index] = flight.do(key, func)
+            except Exception as e:  # noqa
+                results[index] = e
+
+        threads = [threading.Thread(target=target, args=(i,)) for i in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        return threads, results
+
+    def test_concurrent_calls_are_shared(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = list()
+
+        def func():
+            calls.append(1)
+            release.wait(5)
+            return object()
+
+        threads, results = self._run(flight, func)
+        _wait_for(lambda: flight.shared == self.THREADS - 1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert flight.stats() == dict(calls=1, shared=self.THREADS - 1)
+
+    def test_exception_is_shared(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def func():
+            release.wait(5)
+            raise ValueError('boom')
+
+        threads, results = self._run(flight, func)
+        _wait_for(lambda: flight.shared == self.THREADS - 1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.stats() == dict(calls=1, shared=self.THREADS - 1)
+
+    def test_sequential_calls_are_executed(self):
+        flight = SingleFlight()
+        counter = iter(range(10))
+
+        assert flight.do('key', lambda: next(counter)) == 0
+        assert flight.do('key', lambda: next(counter)) == 1
+        with pytest.raises(ValueError):
+            flight.do('key', lambda: int('boom'))
+        assert flight.do('key', lambda: next(counter)) == 2
+        assert flight.stats() == dict(calls=4, shared=0)
+
+    def test_different_keys(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        started = list()
+
+        def func(key):
+            started.append(key)
+            release.wait(5)
+            return key
+
+        threads = [
+            threading.Thread(target=flight.do, args=(key, lambda key=key: func(key)))
+            for key in ('a', 'b')
+        ]
+        for thread in threads:
+            thread.start()
+        _wait_for(lambda: len(started) == 2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(started) == ['a', 'b']
+        assert flight.stats() == dict(calls=2, shared=0)
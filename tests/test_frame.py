@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+import math
+
+import mock
+import pytest
+
+from yagocd.frame import HistoryFrame
+from yagocd.resources import job, pipeline, stage
+
+
+def _job(result='Passed', scheduled=1000, transitions=None, **kwargs):
+    data = dict(name='build', result=result, scheduled_date=scheduled, job_state_transitions=transitions or [])
+    data.update(kwargs)
+    return data
+
+
+PIPELINES = [
+    {'counter': 3, 'stages': [
+        {'result': 'Passed', 'jobs': [_job(scheduled=3000)]},
+        {'result': 'Unknown', 'jobs': [_job(result='Unknown', scheduled=3500)]},
+    ]},
+    {'counter': 2, 'stages': [
+        {'result': 'Passed', 'jobs': [_job(scheduled=2500), _job(scheduled=2000)]},
+        {'result': 'Failed', 'jobs': [_job(result='Failed', scheduled=2700)]},
+        {'result': 'Cancelled', 'jobs': [_job(result='Cancelled', scheduled=2800)]},
+    ]},
+    {'counter': 1, 'stages': [
+        {'result': 'Passed', 'jobs': [_job(scheduled=1000)]},
+        {'name': 'manual', 'scheduled': False, 'jobs': []},
+    ]},
+]
+
+STAGES = [
+    {'pipeline_counter': 2, 'counter': '2', 'result': 'Cancelled', 'jobs': [_job(scheduled=2000)]},
+    {'pipeline_counter': 1, 'counter': '1', 'result': 'Passed', 'jobs': []},
+]
+
+JOBS = [
+    _job(pipeline_counter=2, stage_counter='1', scheduled=2000, transitions=[
+        {'state': 'Scheduled', 'state_change_time': 2001},
+        {'state': 'Building', 'state_change_time': 2100},
+        {'state': 'Completed', 'state_change_time': 2501},
+    ]),
+    _job(result='Failed', pipeline_counter=1, stage_counter='3', scheduled=1000),
+]
+
+
+class TestHistoryFrame(object):
+    def test_unknown_kind(self):
+        with pytest.raises(ValueError):
+            HistoryFrame('foo')
+
+    def test_pipelines(self):
+        frame = HistoryFrame(HistoryFrame.PIPELINE, PIPELINES)
+
+        assert len(frame) == 3
+        assert frame.columns == ('counter', 'result', 'scheduled', 'duration')
+        assert list(frame['counter']) == [3, 2, 1]
+        assert list(frame['result']) == [HistoryFrame.UNKNOWN, HistoryFrame.FAILED, HistoryFrame.PASSED]
+        assert list(frame['scheduled']) == [3000, 2000, 1000]
+        assert all(math.isnan(value) for value in frame['duration'])
+
+    def test_stages(self):
+        frame = HistoryFrame(HistoryFrame.STAGE, STAGES)
+
+        assert list(frame['counter']) == [2, 1]
+        assert list(frame['stage_counter']) == [2, 1]
+        assert list(frame['result']) == [HistoryFrame.CANCELLED, HistoryFrame.PASSED]
+        assert frame['scheduled'][0] == 2000
+        assert math.isnan(frame['scheduled'][1])
+
+    def test_jobs(self):
+        frame = HistoryFrame(HistoryFrame.JOB, JOBS)
+
+        assert list(frame['stage_counter']) == [1, 3]
+        assert list(frame['result']) == [HistoryFrame.PASSED, HistoryFrame.FAILED]
+        assert frame['duration'][0] == 500
+        assert math.isnan(frame['duration'][1])
+
+    def test_extend_with_entities(self, mock_session):
+        frame = HistoryFrame(HistoryFrame.JOB)
+        frame.extend(job.JobInstance(mock_session, data, None) for data in JOBS)
+        frame.extend(iter(JOBS))
+
+        assert list(frame['counter']) == [2, 1, 2, 1]
+
+    def test_to_numpy(self):
+        numpy = pytest.importorskip('numpy')
+        frame = HistoryFrame(HistoryFrame.PIPELINE, PIPELINES)
+
+        columns = frame.to_numpy()
+        assert list(columns) == list(frame.columns)
+        assert columns['counter'].tolist() == [3, 2, 1]
+        assert (columns['result'] == HistoryFrame.FAILED).sum() == 1
+        assert numpy.isnan(columns['duration']).all()
+
+        # arrays are copied, so frame could be still extended
+        frame.extend(PIPELINES)
+        assert len(frame) == 6
+
+    def test_to_numpy_empty(self):
+        pytest.importorskip('numpy')
+        assert all(len(column) == 0 for column in HistoryFrame(HistoryFrame.STAGE).to_numpy().values())
+
+    def test_to_pandas(self):
+        pytest.importorskip('pandas')
+        df = HistoryFrame(HistoryFrame.PIPELINE, PIPELINES).to_pandas()
+
+        assert list(df.columns) == ['counter', 'result', 'scheduled', 'duration']
+        assert list(df['result']) == ['Unknown', 'Failed', 'Passed']
+
+    def test_to_arrow(self):
+        pytest.importorskip('pyarrow')
+        table = HistoryFrame(HistoryFrame.JOB, JOBS).to_arrow()
+
+        assert table.column_names == ['counter', 'stage_counter', 'result', 'scheduled', 'duration']
+        assert table.column('result').to_pylist() == ['Passed', 'Failed']
+
+
+class TestManagers(object):
+    def test_pipeline(self, mock_session):
+        manager = pipeline.PipelineManager(mock_session)
+        with mock.patch.object(manager, 'full_history', return_value=iter(PIPELINES)) as full_history:
+            frame = manager.history_frame('foo', prefetch=2)
+
+        full_history.assert_called_once_with('foo', prefetch=2)
+        assert frame.kind == HistoryFrame.PIPELINE
+        assert len(frame) == 3
+
+    def test_pipeline_entity(self, mock_session):
+        entity = pipeline.PipelineEntity(mock_session, data={'name': 'foo'})
+        with mock.patch.object(pipeline.PipelineManager, 'history_frame') as history_frame:
+            entity.history_frame()
+
+        history_frame.assert_called_once_with(name='foo', prefetch=None)
+
+    def test_stage(self, mock_session):
+        manager = stage.StageManager(mock_session)
+        with mock.patch.object(manager, 'full_history', return_value=iter(STAGES)) as full_history:
+            frame = manager.history_frame('foo', 'bar')
+
+        full_history.assert_called_once_with('foo', 'bar', prefetch=None)
+        assert list(frame['counter']) == [2, 1]
+
+    def test_job(self, mock_session):
+        mock_session._options = {'history_prefetch': 0}
+        manager = job.JobManager(mock_session)
+        with mock.patch.object(manager, 'history', side_effect=[JOBS, []]) as history:
+            frame = manager.history_frame('foo', 'bar', 'baz')
+
+        assert history.call_args_list == [mock.call('foo', 'bar', 'baz', 0), mock.call('foo', 'bar', 'baz', 2)]
+        assert list(frame['counter']) == [2, 1]
@@ -36,7 +36,7 @@ from yagocd.resources.pipeline_config import PipelineConfigManager
 
 class TestPipelineEntity(object):
     def test_has_all_managers_methods(self):
-        excludes = ['list', 'find']
+        excludes = ['list', 'stream', 'find']
 
         def get_public_methods(klass):
             methods = set()
@@ -77,6 +77,17 @@ class TestPipelineEntity(object):
     def test_reading_group(self, pipeline_entity):
         assert pipeline_entity.group == 'baz'
 
+    def test_compact(self, pipeline_entity):
+        assert not hasattr(pipeline_entity, '__dict__')
+        with pytest.raises(AttributeError):
+            pipeline_entity.foo = 'bar'
+
+    def test_manager_is_created_lazily(self, pipeline_entity):
+        assert pipeline_entity._pipeline_manager is None
+        manager = pipeline_entity._pipeline
+        assert isinstance(manager, pipeline.PipelineManager)
+        assert pipeline_entity._pipeline is manager
+
     def test_predecessors_empty(self, pipeline_entity):
         assert pipeline_entity.predecessors == list()
 
@@ -93,6 +93,49 @@ class TestList(BaseTestPipelineManager, AbstractTestManager, ReturnValueMixin):
         mock_build_graph.assert_called()
 
 
+class TestStream(BaseTestPipelineManager, AbstractTestManager, ReturnValueMixin):
+    @pytest.fixture()
+    def _execute_test_action(self, manager, my_vcr):
+        with my_vcr.use_cassette("pipeline/pipeline_list") as cass:
+            return cass, list(manager.stream(chunk_size=512))
+
+    @pytest.fixture()
+    def expected_request_url(self):
+        return '/go/api/config/pipeline_groups'
+
+    @pytest.fixture()
+    def expected_request_method(self):
+        return 'GET'
+
+    @pytest.fixture()
+    def expected_accept_headers(self, server_version):
+        return 'application/json'
+
+    @pytest.fixture()
+    def expected_return_type(self):
+        return list
+
+    @pytest.fixture()
+    def expected_return_value(self):
+        def check_value(result):
+            assert len(result) > 0
+            assert all(isinstance(i, pipeline.PipelineEntity) for i in result)
+
+        return check_value
+
+    def test_same_as_list(self, manager, my_vcr):
+        with my_vcr.use_cassette("pipeline/pipeline_list"):
+            expected = [(p.data, p.group) for p in manager.list()]
+        with my_vcr.use_cassette("pipeline/pipeline_list"):
+            assert [(p.data, p.group) for p in manager.stream(chunk_size=100)] == expected
+
+    def test_stream_is_requested(self, mock_manager):
+        mock_manager._session.get.return_value.iter_content.return_value = [b'[]']
+        assert list(mock_manager.stream()) == []
+        assert mock_manager._session.get.call_args[1]['stream'] is True
+        mock_manager._session.get.return_value.close.assert_called_once_with()
+
+
 class TestFind(TestList):
     @pytest.fixture()
     def _execute_test_action(self, manager, my_vcr, name=''):
@@ -128,6 +171,52 @@ class TestFind(TestList):
         assert result.data.name == name
 
 
+@mock.patch('yagocd.resources.pipeline.PipelineManager.list')
+class TestFindIndex(BaseTestPipelineManager):
+    @pytest.fixture()
+    def pipelines(self, mock_session):
+        return [pipeline.PipelineEntity(session=mock_session, data=dict(name=name)) for name in ['foo', 'bar']]
+
+    def test_list_is_called_each_time_by_default(self, list_mock, mock_manager, pipelines):
+        list_mock.return_value = pipelines
+
+        assert mock_manager.find('foo') is pipelines[0]
+        assert mock_manager['bar'] is pipelines[1]
+        assert list_mock.call_count == 2
+
+    def test_index_is_reused(self, list_mock, mock_manager, pipelines):
+        list_mock.return_value = pipelines
+        mock_manager._session._options['pipelines_index_ttl'] = 60
+
+        for name in ['foo', 'bar', 'baz'] * 10:
+            mock_manager.find(name)
+        assert mock_manager['baz'] is None
+        assert list_mock.call_count == 1
+
+    def test_refresh(self, list_mock, mock_manager, pipelines):
+        list_mock.return_value = pipelines
+        mock_manager._session._options['pipelines_index_ttl'] = 60
+
+        mock_manager.find('foo')
+        mock_manager.find('foo', refresh=True)
+        assert list_mock.call_count == 2
+
+    @mock.patch('time.time')
+    def test_expired(self, time_mock, list_mock, mock_manager, pipelines):
+        list_mock.return_value = pipelines
+        mock_manager._session._options['pipelines_index_ttl'] = 60
+
+        time_mock.return_value = 1000
+        mock_manager.find('foo')
+        time_mock.return_value = 1059
+        mock_manager.find('foo')
+        assert list_mock.call_count == 1
+
+        time_mock.return_value = 1060
+        mock_manager.find('foo')
+        assert list_mock.call_count == 2
+
+
 class TestHistory(BaseTestPipelineManager, AbstractTestManager, ReturnValueMixin):
     NAME = 'Consumer_Website'
 
@@ -178,6 +267,15 @@ class TestFullHistory(BaseTestPipelineManager):
         calls = [mock.call(name, 0), mock.call(name, 3)]
         history_mock.assert_has_calls(calls)
 
+    @pytest.mark.parametrize('prefetch, option', [(2, 0), (None, 2)])
+    @mock.patch('yagocd.resources.pipeline.PipelineManager.history')
+    def test_prefetch(self, history_mock, mock_manager, prefetch, option):
+        history_mock.side_effect = lambda name, offset: [[5, 4], [3, 2], [1], [], []][offset // 2]
+        mock_manager._session._options['history_prefetch'] = option
+
+        assert list(mock_manager.full_history("Consumer_Website", prefetch=prefetch)) == [5, 4, 3, 2, 1]
+        history_mock.assert_any_call("Consumer_Website", 6)
+
 
 class TestLast(BaseTestPipelineManager):
     @mock.patch('yagocd.resources.pipeline.PipelineManager.history')
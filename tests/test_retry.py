@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+import email.utils
+import time
+
+import mock
+import pytest
+
+from yagocd.retry import RetryPolicy
+
+
+class TestIsRetryable(object):
+    @pytest.mark.parametrize('method, status, expected', [
+        ('GET', 503, True),
+        ('get', 502, True),
+        ('HEAD', 504, True),
+        ('GET', 500, False),
+        ('GET', 404, False),
+        ('POST', 503, False),
+        ('PUT', 503, False),
+        ('PATCH', 503, False),
+    ])
+    def test_response(self, method, status, expected):
+        response = mock.MagicMock(status_code=status)
+        assert RetryPolicy().is_retryable(method, response) is expected
+
+    def test_connection_error(self):
+        assert RetryPolicy().is_retryable('GET') is True
+        assert RetryPolicy().is_retryable('POST') is False
+
+    def test_custom_methods(self):
+        assert RetryPolicy(methods=['post']).is_retryable('POST') is True
+
+
+class TestBackoff(object):
+    def test_exponential(self):
+        policy = RetryPolicy(backoff=1, max_backoff=10, jitter=False)
+        assert [policy.get_backoff(attempt) for attempt in range(1, 6)] == [1, 2, 4, 8, 10]
+
+    def test_jitter(self):
+        policy = RetryPolicy(backoff=1, max_backoff=10)
+        for attempt in range(1, 6):
+            assert 0 <= policy.get_backoff(attempt) <= min(10, 2 ** (attempt - 1))
+
+
+class TestRetryAfter(object):
+    @pytest.mark.parametrize('value, expected', [
+        (None, None),
+        ('', None),
+        ('120', 120),
+        ('garbage', None),
+        ('Wed, 21 Oct 2015 07:28:00 GMT', 0),
+    ])
+    def test_parse(self, value, expected):
+        assert RetryPolicy.parse_retry_after(value) == expected
+
+    def test_parse_future_date(self):
+        value = email.utils.formatdate(time.time() + 30, usegmt=True)
+        assert 25 <= RetryPolicy.parse_retry_after(value) <= 30
+
+
+class TestNextDelay(object):
+    def test_total(self):
+        policy = RetryPolicy(total=2, jitter=False)
+        assert policy.next_delay('GET', 1, 0) is not None
+        assert policy.next_delay('GET', 2, 0) is not None
+        assert policy.next_delay('GET', 3, 0) is None
+
+    def test_retry_after(self):
+        response = mock.MagicMock(status_code=503, headers={'Retry-After': '7'})
+        assert RetryPolicy().next_delay('GET', 1, 0, response) == 7
+        assert RetryPolicy(respect_retry_after=False, jitter=False).next_delay('GET', 1, 0, response) == 0.5
+
+    def test_deadline(self):
+        policy = RetryPolicy(backoff=2, deadline=10, jitter=False)
+        assert policy.next_delay('GET', 1, 7) == 2
+        assert policy.next_delay('GET', 1, 9) is None
+
+    def test_not_retryable(self):
+        response = mock.MagicMock(status_code=404, headers={})
+        assert RetryPolicy().next_delay('GET', 1, 0, response) is None
@@ -0,0 +1,510 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+import copy
+import json
+import threading
+import time
+
+import mock
+import pytest
+import requests
+from six import BytesIO
+
+from yagocd import Yagocd
+from yagocd.adapter import PoolingAdapter
+from yagocd.cache import ETagCache, ResponseCache, VersionCache
+from yagocd.exception import RequestError
+from yagocd.resources.agent import AgentManager
+from yagocd.retry import RetryPolicy
+from yagocd.session import Session
+
+
+def _make_session(**options):
+    merged = copy.deepcopy(Yagocd.DEFAULT_OPTIONS)
+    merged.update(options)
+    return Session(auth=None, options=merged)
+
+
+class TestPooling(object):
+    def test_adapter_is_mounted(self):
+        session = _make_session()
+        assert isinstance(session._session.get_adapter('http://example.com'), PoolingAdapter)
+        assert isinstance(session._session.get_adapter('https://example.com'), PoolingAdapter)
+
+    def test_pool_options(self):
+        session = _make_session(pool_connections=3, pool_maxsize=50, pool_block=True)
+        assert session._adapter._pool_connections == 3
+        assert session._adapter._pool_maxsize == 50
+        assert session._adapter._pool_block is True
+
+    def test_stats_empty(self):
+        assert _make_session().pool_stats() == dict(pools=0, connections=0, requests=0, reused=0)
+
+    def test_connections_are_reused(self, stub_server, stub_session):
+        stub_server.routes[('GET', '/foo')] = lambda handler: (200, {}, b'bar')
+
+        for _ in range(5):
+            assert stub_session.get('foo').content == b'bar'
+
+        assert stub_session.pool_stats() == dict(pools=1, connections=1, requests=5, reused=4)
+
+    @pytest.mark.parametrize('keep_alive, connections', [
+        (None, 1),
+        (0, 3),
+    ])
+    def test_keep_alive(self, stub_server, keep_alive, connections):
+        stub_server.routes[('GET', '/foo')] = lambda handler: (200, {}, b'bar')
+        session = _make_session(server=stub_server.url, keep_alive=keep_alive)
+
+        for _ in range(3):
+            session.get('foo')
+
+        stats = session.pool_stats()
+        assert stats['requests'] == 3
+        assert stats['connections'] == connections
+
+    def test_keep_alive_is_tracked_per_connection(self, stub_server):
+        stub_server.routes[('GET', '/foo')] = lambda handler: (200, {}, b'bar')
+        session = _make_session(server=stub_server.url, keep_alive=0.5)
+        session.get('foo')
+
+        pool = session._adapter._pools()[0]
+        busy = pool._get_conn()
+        idle = pool._get_conn()
+        pool._put_conn(idle)
+        idle.yagocd_idle_since -= 1
+        pool._put_conn(busy)
+
+        # only the connection, which wasn't used, is dropped despite of the recent requests
+        with mock.patch.object(idle, 'close') as close_mock, mock.patch.object(busy, 'close') as busy_close_mock:
+            session.get('foo')
+
+        assert close_mock.called
+        assert not busy_close_mock.called
+        assert list(pool.pool.queue)[-2:] == [None, busy]
+        assert session.pool_stats()['connections'] == 2
+
+    def test_stats_of_evicted_pools(self, stub_server):
+        stub_server.routes[('GET', '/foo')] = lambda handler: (200, {}, b'bar')
+        session = _make_session(server=stub_server.url, pool_connections=1)
+
+        session.get('foo')
+        session.get(stub_server.url.replace('127.0.0.1', 'localhost') + '/foo')
+        session.get('foo')
+
+        assert session.pool_stats() == dict(pools=1, connections=3, requests=3, reused=0)
+
+
+def _flaky_route(statuses, headers=None):
+    statuses = list(statuses)
+
+    def route(handler):
+        status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+        return status, headers or {}, b'body'
+
+    return route
+
+
+@mock.patch('time.sleep')
+class TestRetry(object):
+    def test_no_retry_by_default(self, sleep_mock, stub_server, stub_session):
+        stub_server.routes[('GET', '/foo')] = _flaky_route([503, 200])
+
+        with pytest.raises(RequestError):
+            stub_session.get('foo')
+        assert len(stub_server.requests) == 1
+
+    def test_retry_status(self, sleep_mock, stub_server):
+        stub_server.routes[('GET', '/foo')] = _flaky_route([503, 502, 200])
+        session = _make_session(server=stub_server.url, retry=RetryPolicy(total=3))
+
+        assert session.get('foo').status_code == 200
+        assert len(stub_server.requests) == 3
+        assert sleep_mock.call_count == 2
+
+    def test_retries_exhausted(self, sleep_mock, stub_server):
+        stub_server.routes[('GET', '/foo')] = _flaky_route([504])
+        session = _make_session(server=stub_server.url, retry=RetryPolicy(total=2))
+
+        with pytest.raises(RequestError):
+            session.get('foo')
+        assert len(stub_server.requests) == 3
+
+    def test_retry_after(self, sleep_mock, stub_server):
+        stub_server.routes[('GET', '/foo')] = _flaky_route([503, 200], headers={'Retry-After': '3'})
+        session = _make_session(server=stub_server.url, retry=RetryPolicy())
+
+        session.get('foo')
+        sleep_mock.assert_called_once_with(3)
+
+    def test_post_is_not_retried(self, sleep_mock, stub_server):
+        stub_server.routes[('POST', '/foo')] = _flaky_route([503, 200])
+        session = _make_session(server=stub_server.url, retry=RetryPolicy())
+
+        with pytest.raises(RequestError):
+            session.post('foo')
+        assert len(stub_server.requests) == 1
+
+    def test_stream_is_not_retried(self, sleep_mock, stub_server):
+        stub_server.routes[('PUT', '/foo')] = _flaky_route([503, 200])
+        session = _make_session(server=stub_server.url, retry=RetryPolicy(methods={'PUT'}))
+
+        with pytest.raises(RequestError):
+            session.put('foo', data=BytesIO(b'content'))
+        assert len(stub_server.requests) == 1
+
+    def test_connection_error(self, sleep_mock):
+        session = _make_session(server='http://127.0.0.1:1', retry=RetryPolicy(total=2))
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            session.get('foo')
+        assert sleep_mock.call_count == 2
+
+    def test_manager_policy(self, sleep_mock, stub_server, stub_session):
+        stub_server.routes[('GET', '/go/api/agents')] = _flaky_route([503, 200])
+
+        manager = AgentManager(session=stub_session)
+        manager.retry = RetryPolicy()
+
+        assert manager.retry is not stub_session._options['retry']
+        assert stub_session._options['retry'] is None
+        assert manager._session.get('go/api/agents').status_code == 200
+        assert len(stub_server.requests) == 2
+
+
+class TestETagCache(object):
+    @pytest.fixture()
+    def etag_route(self):
+        state = dict(etag='"v1"', body=b'first')
+
+        def route(handler):
+            if handler.headers.get('If-None-Match') == state['etag']:
+                return 304, {'ETag': state['etag']}, b''
+            return 200, {'ETag': state['etag']}, state['body']
+
+        route.state = state
+        return route
+
+    def test_not_modified(self, stub_server, etag_route):
+        stub_server.routes[('GET', '/foo')] = etag_route
+        cache = ETagCache()
+        session = _make_session(server=stub_server.url, etag_cache=cache)
+
+        assert session.get('foo').content == b'first'
+        assert session.get('foo').content == b'first'
+
+        assert stub_server.requests[0].headers.get('If-None-Match') is None
+        assert stub_server.requests[1].headers.get('If-None-Match') == '"v1"'
+        assert cache.stats() == dict(size=1, hits=1, misses=1)
+
+    def test_modified(self, stub_server, etag_route):
+        stub_server.routes[('GET', '/foo')] = etag_route
+        session = _make_session(server=stub_server.url, etag_cache=ETagCache())
+
+        session.get('foo')
+        etag_route.state.update(etag='"v2"', body=b'second')
+
+        assert session.get('foo').content == b'second'
+        assert session.get('foo').content == b'second'
+
+    def test_accept_header_is_part_of_key(self, stub_server, etag_route):
+        stub_server.routes[('GET', '/foo')] = etag_route
+        session = _make_session(server=stub_server.url, etag_cache=ETagCache())
+
+        session.get('foo', headers={'Accept': 'application/vnd.go.cd.v1+json'})
+        session.get('foo', headers={'Accept': 'application/vnd.go.cd.v2+json'})
+
+        assert stub_server.requests[1].headers.get('If-None-Match') is None
+
+    def test_disabled_by_default(self, stub_server, stub_session, etag_route):
+        stub_server.routes[('GET', '/foo')] = etag_route
+
+        stub_session.get('foo')
+        stub_session.get('foo')
+
+        assert stub_server.requests[1].headers.get('If-None-Match') is None
+
+
+class TestJsonDecoder(object):
+    def test_custom_decoder(self, stub_server):
+        stub_server.routes[('GET', '/foo')] = lambda handler: (200, {}, b'{"foo": [1, 2]}')
+        loads = mock.MagicMock(return_value={'bar': 1})
+        session = _make_session(server=stub_server.url, json_decoder=loads)
+
+        assert session.get('foo').json() == {'bar': 1}
+        loads.assert_called_once_with(b'{"foo": [1, 2]}')
+
+    def test_standard_decoder(self, stub_server):
+        stub_server.routes[('GET', '/foo')] = lambda handler: (200, {}, b'{"foo": [1, 2]}')
+        session = _make_session(server=stub_server.url, json_decoder=json.loads)
+
+        response = session.get('foo')
+        assert 'json' not in vars(response)
+        assert response.json() == {'foo': [1, 2]}
+
+
+class TestServerVersion(object):
+    ABOUT_PAGE = b'<table><tr><td>Server Version</td><td>16.1.0(2855-cbe4cf0bb9e2e1e5)</td></tr></table>'
+
+    @pytest.fixture()
+    def about_route(self, stub_server):
+        stub_server.routes[('GET', '/go/about')] = lambda handler: (200, {'Content-Type': 'text/html'}, self.ABOUT_PAGE)
+
+    @pytest.fixture()
+    def version_route(self, stub_server):
+        stub_server.routes[('GET', '/go/api/version')] = lambda handler: (
+            200, {'Content-Type': 'application/json'}, b'{"version": "17.5.0", "build_number": "5095"}'
+        )
+
+    def test_version_api(self, stub_server, about_route, version_route):
+        session = _make_session(server=stub_server.url)
+
+        assert session.server_version == '17.5.0'
+        assert session.server_version == '17.5.0'
+        assert [request.path for request in stub_server.requests] == ['/go/api/version']
+
+    def test_about_page_fallback(self, stub_server, about_route):
+        session = _make_session(server=stub_server.url)
+
+        assert session.server_version == '16.1.0'
+        assert [request.path for request in stub_server.requests] == ['/go/api/version', '/go/about']
+
+    def test_cache(self, stub_server, about_route, version_route, tmpdir):
+        path = str(tmpdir.join('versions.json'))
+
+        assert _make_session(server=stub_server.url, version_cache=VersionCache(path)).server_version == '17.5.0'
+        assert _make_session(server=stub_server.url, version_cache=VersionCache(path)).server_version == '17.5.0'
+        assert len(stub_server.requests) == 1
+
+        assert _make_session(server=stub_server.url, version_cache=VersionCache(path, ttl=0)).server_version == '17.5.0'
+        assert len(stub_server.requests) == 2
+
+
+class TestPreparedRequests(object):
+    @pytest.fixture()
+    def prepare_mock(self):
+        with mock.patch.object(
+            requests.Session, 'prepare_request', autospec=True, side_effect=requests.Session.prepare_request
+        ) as prepare_mock:
+            yield prepare_mock
+
+    def test_prepared_once(self, stub_server, prepare_mock):
+        stub_server.routes[('GET', '/foo')] = lambda handler: (200, {}, b'foo')
+        session = _make_session(server=stub_server.url)
+
+        for _ in range(3):
+            assert session.get('foo').content == b'foo'
+        session.get('foo', headers={'Accept': 'text/plain'})
+
+        assert prepare_mock.call_count == 2
+        assert stub_server.requests[3].headers['Accept'] == 'text/plain'
+
+    def test_not_cached_with_params_and_body(self, stub_server, prepare_mock):
+        session = _make_session(server=stub_server.url)
+
+        for _ in range(2):
+            with pytest.raises(RequestError):
+                session.get('foo', params={'bar': 1})
+            with pytest.raises(RequestError):
+                session.post('foo', data='bar')
+
+        assert prepare_mock.call_count == 4
+        assert [request.path for request in stub_server.requests] == ['/foo?bar=1', '/foo'] * 2
+        assert stub_server.requests[3].body == b'bar'
+
+    def test_cookies_are_sent(self, stub_server):
+        stub_server.routes[('GET', '/foo')] = lambda handler: (200, {'Set-Cookie': 'JSESSIONID=abc; Path=/'}, b'')
+        session = _make_session(server=stub_server.url)
+
+        session.get('foo')
+        session.get('foo')
+
+        assert stub_server.requests[0].headers.get('Cookie') is None
+        assert stub_server.requests[1].headers.get('Cookie') == 'JSESSIONID=abc'
+
+    def test_default_headers_are_not_changed(self, stub_server):
+        stub_server.routes[('GET', '/foo')] = lambda handler: (200, {}, b'')
+        session = _make_session(server=stub_server.url)
+        default_headers = copy.deepcopy(session._options['headers'])
+
+        session.get('foo', headers={'X-Foo': 'bar'})
+        assert session._options['headers'] == default_headers
+
+    def test_environment_is_read_once(self, stub_server):
+        stub_server.routes[('GET', '/foo')] = lambda handler: (200, {}, b'')
+        session = _make_session(server=stub_server.url)
+
+        with mock.patch.object(
+            requests.Session, 'merge_environment_settings', autospec=True,
+            side_effect=requests.Session.merge_environment_settings
+        ) as merge_mock:
+            session.get('foo')
+            session.get('foo', headers={'X-Foo': 'bar'})
+            session.get('foo', stream=True).close()
+
+        assert merge_mock.call_count == 2
+
+    def test_environment_changes_are_picked_up(self, stub_server):
+        stub_server.routes[('GET', '/foo')] = lambda handler: (200, {}, b'')
+        session = _make_session(server=stub_server.url)
+
+        url = session._url('foo')
+        session.get('foo')
+        verify = session._environment(url, False)['verify']
+
+        with mock.patch.dict('os.environ', {'REQUESTS_CA_BUNDLE': '/tmp/ca.pem', 'CURL_CA_BUNDLE': '/tmp/ca.pem'}):
+            assert session._environment(url, False)['verify'] == '/tmp/ca.pem'
+        assert session._environment(url, False)['verify'] == verify
+
+    def test_session_headers_changes_are_picked_up(self, stub_server):
+        stub_server.routes[('GET', '/foo')] = lambda handler: (200, {}, b'')
+        session = _make_session(server=stub_server.url)
+
+        session.get('foo')
+        session._session.headers['X-Foo'] = 'bar'
+        session.get('foo')
+
+        assert 'X-Foo' not in stub_server.requests[0].headers
+        assert stub_server.requests[1].headers['X-Foo'] == 'bar'
+
+
+class TestSingleFlight(object):
+    THREADS = 5
+
+    def _get_concurrently(self, session, stub_server, **kwargs):
+        release = threading.Event()
+
+        def route(handler):
+            release.wait(5)
+            return 200, {}, b'{"name": "foo"}'
+
+        stub_server.routes[('GET', '/foo')] = route
+        results = [None] * self.THREADS
+
+        def target(index):
+            results[index] = session.get('foo', **kwargs)
+
+        threads = [threading.Thread(target=target, args=(i,)) for i in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        return threads, results, release
+
+    def test_identical_requests_are_sent_once(self, stub_server):
+        session = _make_session(server=stub_server.url, single_flight=True)
+
+        threads, results, release = self._get_concurrently(session, stub_server)
+        deadline = time.time() + 5
+        while session.flight_stats()['shared'] < self.THREADS - 1 and time.time() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(stub_server.requests) == 1
+        assert all(response.json() == {'name': 'foo'} for response in results)
+        assert session.flight_stats() == dict(calls=1, shared=self.THREADS - 1)
+
+    def test_disabled_by_default(self, stub_server):
+        session = _make_session(server=stub_server.url)
+
+        threads, results, release = self._get_concurrently(session, stub_server)
+        deadline = time.time() + 5
+        while len(stub_server.requests) < self.THREADS and time.time() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(stub_server.requests) == self.THREADS
+        assert session.flight_stats() == dict(calls=0, shared=0)
+
+    def test_streams_are_not_shared(self, stub_server):
+        session = _make_session(server=stub_server.url, single_flight=True)
+
+        threads, results, release = self._get_concurrently(session, stub_server, stream=True)
+        deadline = time.time() + 5
+        while len(stub_server.requests) < self.THREADS and time.time() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(stub_server.requests) == self.THREADS
+        for response in results:
+            response.close()
+
+    def test_key(self, stub_server):
+        session = _make_session(server=stub_server.url, single_flight=True)
+        stub_server.routes[('GET', '/foo')] = stub_server.routes[('POST', '/foo')] = lambda handler: (200, {}, b'')
+
+        with mock.patch.object(session._flight, 'do', wraps=session._flight.do) as do_mock:
+            session.get('foo', params={'b': 2, 'a': 1}, headers={'Accept': 'text/plain'})
+            session.post('foo')
+
+        assert do_mock.call_count == 1
+        assert do_mock.call_args[1]['key'] == (
+            stub_server.url + '/foo', (('a', 1), ('b', 2)), 'text/plain'
+        )
+
+
+class TestResponseCache(object):
+    PATH = 'go/api/admin/config/412f48f7.xml'
+
+    def test_cached_response_is_returned(self, stub_server):
+        stub_server.routes[('GET', '/' + self.PATH)] = lambda handler: (200, {}, b'<cruise/>')
+        cache = ResponseCache()
+        session = _make_session(server=stub_server.url, response_cache=cache)
+
+        responses = [session.get(self.PATH) for _ in range(3)]
+
+        assert len(stub_server.requests) == 1
+        assert all(response is responses[0] for response in responses)
+        assert responses[0].content == b'<cruise/>'
+        assert cache.stats() == dict(size=1, hits=2, misses=1)
+
+    def test_only_get_requests_are_cached(self, stub_server):
+        stub_server.routes[('GET', '/' + self.PATH)] = lambda handler: (200, {}, b'')
+        stub_server.routes[('POST', '/' + self.PATH)] = lambda handler: (200, {}, b'')
+        session = _make_session(server=stub_server.url, response_cache=ResponseCache())
+
+        for _ in range(2):
+            session.post(self.PATH)
+            session.get(self.PATH, stream=True).close()
+
+        assert len(stub_server.requests) == 4
+
+    def test_errors_are_not_cached(self, stub_server):
+        session = _make_session(server=stub_server.url, response_cache=ResponseCache())
+
+        for _ in range(2):
+            with pytest.raises(RequestError):
+                session.get(self.PATH)
+
+        assert len(stub_server.requests) == 2
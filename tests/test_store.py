@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+import copy
+import threading
+
+import mock
+import pytest
+
+from yagocd import Yagocd
+from yagocd.resources.job import JobInstance
+from yagocd.resources.pipeline import PipelineInstance
+from yagocd.resources.stage import StageInstance
+from yagocd.store import HistoryStore
+
+
+def _pipeline(counter, completed=True):
+    return dict(name='Foo', counter=counter, stages=[
+        dict(name='build', scheduled=True, result='Passed', jobs=[dict(name='compile', state='Completed')]),
+        dict(
+            name='test',
+            scheduled=True,
+            result='Passed' if completed else 'Unknown',
+            jobs=[dict(name='unit', state='Completed' if completed else 'Building')]
+        ),
+        dict(name='deploy', scheduled=False, result='Unknown', jobs=[]),
+    ])
+
+
+def _instances(items, consumed):
+    for data in items:
+        consumed.append(data)
+        yield mock.MagicMock(data=data)
+
+
+@pytest.fixture()
+def client():
+    client = mock.MagicMock()
+    client._session._options = copy.deepcopy(Yagocd.DEFAULT_OPTIONS)
+    return client
+
+
+@pytest.fixture()
+def store(client):
+    store = HistoryStore(client)
+    yield store
+    store.close()
+
+
+class TestPipeline(object):
+    def _sync(self, store, client, counters, incomplete=(), **kwargs):
+        consumed = list()
+        history = [_pipeline(c, completed=c not in incomplete) for c in counters]
+        client.pipelines.full_history.return_value = _instances(history, consumed)
+        return store.sync_pipeline('Foo', **kwargs), [data['counter'] for data in consumed]
+
+    def test_initial_sync(self, store, client):
+        assert self._sync(store, client, [3, 2, 1]) == (3, [3, 2, 1])
+        client.pipelines.full_history.assert_called_once_with('Foo')
+
+        history = store.pipeline_history('Foo')
+        assert [i.data.counter for i in history] == [3, 2, 1]
+        assert all(isinstance(i, PipelineInstance) for i in history)
+        assert history[0].data.stages[0].jobs[0].name == 'compile'
+
+    def test_only_new_instances_are_fetched(self, store, client):
+        self._sync(store, client, [3, 2, 1])
+
+        assert self._sync(store, client, [5, 4, 3, 2, 1]) == (2, [5, 4, 3])
+        assert [i.data.counter for i in store.pipeline_history('Foo')] == [5, 4, 3, 2, 1]
+
+    def test_nothing_new(self, store, client):
+        self._sync(store, client, [3, 2, 1])
+
+        assert self._sync(store, client, [3, 2, 1]) == (0, [3])
+
+    def test_incomplete_instances_are_fetched_again(self, store, client):
+        self._sync(store, client, [3, 2, 1], incomplete=[2, 3])
+
+        assert self._sync(store, client, [4, 3, 2, 1]) == (3, [4, 3, 2, 1])
+        assert self._sync(store, client, [4, 3, 2, 1]) == (0, [4])
+
+    def test_full(self, store, client):
+        self._sync(store, client, [3, 2, 1])
+
+        assert self._sync(store, client, [3, 2, 1], full=True) == (3, [3, 2, 1])
+        assert len(store.pipeline_history('Foo')) == 3
+
+    def test_interrupted_sync_is_rolled_back(self, store, client):
+        def history():
+            yield mock.MagicMock(data=_pipeline(3))
+            raise IOError('Connection reset')
+
+        client.pipelines.full_history.return_value = history()
+        with pytest.raises(IOError):
+            store.sync_pipeline('Foo')
+
+        assert store.pipeline_history('Foo') == []
+        assert self._sync(store, client, [3, 2, 1]) == (3, [3, 2, 1])
+
+    def test_history_is_readable_during_sync(self, store, client):
+        self._sync(store, client, [1])
+        read = list()
+
+        def history():
+            yield mock.MagicMock(data=_pipeline(2))
+            reader = threading.Thread(target=lambda: read.extend(store.pipeline_history('Foo')))
+            reader.start()
+            reader.join(5)
+            assert not reader.is_alive()
+
+        client.pipelines.full_history.return_value = history()
+        assert store.sync_pipeline('Foo') == 1
+
+        assert [i.data.counter for i in read] == [1]
+        assert [i.data.counter for i in store.pipeline_history('Foo')] == [2, 1]
+
+    def test_offset_and_limit(self, store, client):
+        self._sync(store, client, [5, 4, 3, 2, 1])
+
+        assert [i.data.counter for i in store.pipeline_history('Foo', offset=1, limit=2)] == [4, 3]
+        assert [i.data.counter for i in store.pipeline_history('Foo', offset=3)] == [2, 1]
+        assert store.pipeline_history('Bar') == []
+
+    def test_persisted(self, client, tmpdir):
+        path = tmpdir.join('history.db').strpath
+        store = HistoryStore(client, path=path)
+        self._sync(store, client, [2, 1])
+        store.close()
+
+        store = HistoryStore(client, path=path)
+        assert [i.data.counter for i in store.pipeline_history('Foo')] == [2, 1]
+        assert self._sync(store, client, [3, 2, 1]) == (1, [3, 2])
+
+
+class TestStage(object):
+    def test_sync(self, store, client):
+        stages = [
+            dict(id=12, name='build', counter='2', result='Unknown', jobs=[dict(state='Building')]),
+            dict(id=11, name='build', counter='1', result='Failed', jobs=[dict(state='Completed')]),
+        ]
+        client.stages.full_history.return_value = _instances(stages, [])
+
+        assert store.sync_stage('Foo', 'build') == 2
+        client.stages.full_history.assert_called_once_with(pipeline_name='Foo', stage_name='build')
+
+        history = store.stage_history('Foo', 'build')
+        assert [i.data.id for i in history] == [12, 11]
+        assert all(isinstance(i, StageInstance) for i in history)
+        assert store.stage_history('Foo', 'test') == []
+
+        consumed = list()
+        client.stages.full_history.return_value = _instances(stages, consumed)
+        assert store.sync_stage('Foo', 'build') == 1
+        assert [data['id'] for data in consumed] == [12, 11]
+
+
+class TestJob(object):
+    def test_sync(self, store, client):
+        pages = {
+            0: [dict(id=job_id, name='unit', state='Completed') for job_id in [30, 29]],
+            2: [dict(id=28, name='unit', state='Completed')],
+            3: [],
+        }
+        client.jobs.history.side_effect = lambda offset, **kwargs: [mock.MagicMock(data=d) for d in pages[offset]]
+
+        assert store.sync_job('Foo', 'test', 'unit') == 3
+        client.jobs.history.assert_any_call(pipeline_name='Foo', stage_name='test', job_name='unit', offset=0)
+
+        history = store.job_history('Foo', 'test', 'unit')
+        assert [i.data.id for i in history] == [30, 29, 28]
+        assert all(isinstance(i, JobInstance) for i in history)
+
+        pages[0] = [dict(id=31, name='unit', state='Completed'), dict(id=30, name='unit', state='Completed')]
+        client.jobs.history.reset_mock()
+
+        assert store.sync_job('Foo', 'test', 'unit') == 1
+        client.jobs.history.assert_called_once_with(pipeline_name='Foo', stage_name='test', job_name='unit', offset=0)
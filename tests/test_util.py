@@ -25,11 +25,16 @@
 # THE SOFTWARE.
 #
 ###############################################################################
+import copy
+import json
+import pickle
+from distutils.version import LooseVersion
+
 import pytest
 from mock import mock
 
 from yagocd.resources import pipeline
-from yagocd.util import since, YagocdUtil
+from yagocd.util import LazyDict, since, YagocdUtil
 
 
 class TestBuildGraph(object):
@@ -53,6 +58,52 @@ class TestBuildGraph(object):
         )
         assert child_a.descendants == [parent_a]
 
+    def test_tie_descendants_by_key(self, session_fixture):
+        child_a = pipeline.PipelineEntity(
+            session=session_fixture,
+            data={'name': 'child1', 'materials': {}}
+        )
+
+        parent_a = pipeline.PipelineEntity(
+            session=session_fixture,
+            data={'name': 'parent1', 'materials': [{'description': 'child1', 'type': 'Pipeline'}]}
+        )
+
+        YagocdUtil.build_graph(
+            nodes=[child_a, parent_a],
+            dependencies=lambda parent: parent.data.materials,
+            key=lambda node: node.data.name,
+            dependency_key=lambda material: material.description
+        )
+        assert child_a.descendants == [parent_a]
+        assert parent_a.predecessors == [child_a]
+        assert child_a.predecessors == []
+        assert parent_a.descendants == []
+
+    def test_key_and_compare_are_equivalent(self):
+        class Node(object):
+            def __init__(self, name, deps):
+                self.name = name
+                self.deps = deps
+                self.predecessors = list()
+                self.descendants = list()
+
+        def build(**kwargs):
+            # there are duplicated names and dependencies on purpose
+            nodes = [Node(name % 7, [(name * 3 + i) % 7 for i in range(name % 4)]) for name in range(30)]
+            YagocdUtil.build_graph(nodes=nodes, dependencies=lambda n: n.deps, **kwargs)
+
+            positions = dict((id(n), i) for i, n in enumerate(nodes))
+            return [
+                ([positions[id(p)] for p in n.predecessors], [positions[id(d)] for d in n.descendants])
+                for n in nodes
+            ]
+
+        by_compare = build(compare=lambda candidate, child: candidate == child.name)
+        by_key = build(key=lambda n: n.name)
+
+        assert by_compare == by_key
+
 
 class TestGraphDepthWalk(object):
     @pytest.mark.parametrize("root, expected", [
@@ -69,6 +120,131 @@ class TestGraphDepthWalk(object):
         assert sorted(YagocdUtil.graph_depth_walk(root, lambda x: graph.get(x))) == sorted(expected)
 
 
+class TestPaginate(object):
+    @pytest.fixture()
+    def fetch(self):
+        items = list(range(23))
+        page_size = 5
+
+        def fetch(offset):
+            fetch.offsets.append(offset)
+            return items[offset:offset + page_size]
+
+        fetch.offsets = list()
+        return fetch
+
+    @pytest.mark.parametrize('prefetch', [0, 1, 3, 10])
+    def test_items_in_order(self, fetch, prefetch):
+        assert list(YagocdUtil.paginate(fetch, prefetch=prefetch)) == list(range(23))
+
+    def test_sequential(self, fetch):
+        list(YagocdUtil.paginate(fetch))
+        assert fetch.offsets == [0, 5, 10, 15, 20, 23]
+
+    def test_prefetch_stops_at_empty_page(self, fetch):
+        list(YagocdUtil.paginate(fetch, prefetch=2))
+        assert {0, 5, 10, 15, 20, 25} <= set(fetch.offsets) <= {0, 5, 10, 15, 20, 25, 30}
+
+    def test_prefetch_window(self, fetch):
+        generator = YagocdUtil.paginate(fetch, prefetch=3)
+        next(generator)
+        generator.close()
+        # pages, which are already requested, could still be in flight
+        assert set(fetch.offsets) <= {0, 5, 10, 15}
+
+    @pytest.mark.parametrize('prefetch', [0, 2])
+    def test_empty(self, prefetch):
+        assert list(YagocdUtil.paginate(lambda offset: [], prefetch=prefetch)) == []
+
+    def test_error_is_propagated(self):
+        def fetch(offset):
+            if offset:
+                raise ValueError(offset)
+            return [1, 2]
+
+        with pytest.raises(ValueError):
+            list(YagocdUtil.paginate(fetch, prefetch=2))
+
+
+class TestLazyDict(object):
+    @pytest.fixture()
+    def raw(self):
+        return {
+            'counter': 7,
+            'stages': [
+                {'name': 'build', 'jobs': [{'name': 'compile', 'state': 'Completed'}]},
+                'not-a-dict',
+            ],
+            'build_cause': {'approver': 'admin', 'material_revisions': ({'changed': True},)},
+        }
+
+    def test_attribute_access(self, raw):
+        data = LazyDict(raw)
+
+        assert data.counter == 7
+        assert data.stages[0].jobs[0].state == 'Completed'
+        assert data.stages[1] == 'not-a-dict'
+        assert data.build_cause.material_revisions[0].changed is True
+        assert data.get('build_cause').approver == 'admin'
+        assert data.get('missing', 'default') == 'default'
+        assert [name for name, _ in data.items()] == [name for name in data]
+        assert all(isinstance(value, (int, list, LazyDict)) for value in data.values())
+
+        with pytest.raises(AttributeError):
+            _ = data.missing  # noqa
+        assert not hasattr(data, 'missing')
+
+    def test_nested_lists(self):
+        data = LazyDict({'a': [[{'x': 1}, [{'y': 2}]], ({'z': 3},)]})
+
+        assert data.a[0][0].x == 1
+        assert data.a[0][1][0].y == 2
+        assert data.a[1][0].z == 3
+        assert data.a[0] is data.a[0]
+
+        data.a[0][0].x = 5
+        assert data['a'][0][0]['x'] == 5
+
+    def test_nested_values_are_wrapped_lazily(self, raw):
+        data = LazyDict(raw)
+
+        assert type(dict.__getitem__(data, 'stages')) is list
+        assert data.stages is data.stages
+        assert type(dict.__getitem__(data, 'stages')) is not list
+        assert type(dict.__getitem__(data.stages[0], 'jobs')) is list
+        assert data.stages[0] is data.stages[0]
+
+    def test_changes_are_preserved(self, raw):
+        data = LazyDict(raw)
+
+        data.counter = 8
+        data.stages[0].name = 'compile'
+        data.stages[0].jobs.append({'name': 'lint'})
+        data['build_cause']['approver'] = 'changes'
+        data.label = '8'
+
+        assert data['counter'] == 8
+        assert data['stages'][0]['name'] == 'compile'
+        assert data.stages[0].jobs[1]['name'] == 'lint'
+        assert data.build_cause.approver == 'changes'
+        assert data['label'] == '8'
+
+        del data.label
+        assert 'label' not in data
+        with pytest.raises(AttributeError):
+            del data.label
+
+    def test_serialization(self, raw):
+        data = LazyDict(raw)
+        _ = data.stages[0].jobs  # noqa
+
+        expected = json.loads(json.dumps(raw))
+        assert json.loads(json.dumps(data)) == expected
+        assert json.loads(json.dumps(copy.deepcopy(data))) == expected
+        assert json.loads(json.dumps(pickle.loads(pickle.dumps(data)))) == expected
+        assert isinstance(data.copy(), LazyDict)
+
+
 @pytest.mark.parametrize('since_version, expected_exc', [
     ('0.0.0', None),
     ('1.2.3.4', None),
@@ -131,3 +307,16 @@ class TestSinceDecorator(object):
 
         assert decorated.foo.since_version == since_version
         assert decorated.bar.since_version == '1.1.1'
+
+    def test_version_is_compared_once(self, dummy_cls, since_version, expected_exc):
+        dummy_cls.foo = since(since_version)(dummy_cls.foo)
+
+        with mock.patch('yagocd.util.LooseVersion', wraps=LooseVersion) as version_mock:
+            for _ in range(3):
+                if expected_exc:
+                    with pytest.raises(expected_exc):
+                        dummy_cls().foo()
+                else:
+                    dummy_cls().foo()
+
+        assert version_mock.call_count == 1
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+import functools
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class _ExpiringPoolMixin(object):
+    """
+    Connection pool, which drops connections idle for more than `keep_alive` seconds.
+
+    Time of the last use is recorded when connection is returned to the
+    pool. Before taking a connection out, all expired ones are closed and
+    their slots are emptied, so new connections are opened in their place.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.keep_alive = kwargs.pop('keep_alive', None)
+        super(_ExpiringPoolMixin, self).__init__(*args, **kwargs)
+
+    def _get_conn(self, timeout=None):
+        if self.keep_alive is not None:
+            self._prune()
+        return super(_ExpiringPoolMixin, self)._get_conn(timeout=timeout)
+
+    def _put_conn(self, conn):
+        if conn is not None:
+            conn.yagocd_idle_since = time.time()
+        super(_ExpiringPoolMixin, self)._put_conn(conn)
+
+    def _prune(self):
+        pool = self.pool
+        if pool is None:
+            return
+
+        now = time.time()
+        with pool.mutex:
+            for i, conn in enumerate(pool.queue):
+                idle_since = getattr(conn, 'yagocd_idle_since', None)
+                if idle_since is not None and now - idle_since > self.keep_alive:
+                    conn.close()
+                    # empty slot means new connection should be opened
+                    pool.queue[i] = None
+
+
+class _ExpiringHTTPConnectionPool(_ExpiringPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _ExpiringHTTPSConnectionPool(_ExpiringPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class PoolingAdapter(HTTPAdapter):
+    """
+    Transport adapter, which is mounted by :class:`yagocd.session.Session`
+    for both `http://` and `https://` schemes.
+
+    In addition to the standard pool sizing parameters of
+    :class:`requests.adapters.HTTPAdapter` it supports idle keep-alive
+    timeout: pooled connections, which were not used for longer than
+    `keep_alive` seconds, are dropped before the next request instead of
+    being reused, so requests wouldn't hit sockets already closed by the
+    server or a proxy in between. Idle time is tracked for each connection,
+    so under constant load only the connections left unused are dropped.
+
+    The adapter also keeps statistics of opened and reused connections,
+    which could be used to find out appropriate pool size.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ['_keep_alive']
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False, keep_alive=None):
+        """
+        :param pool_connections: number of per-host connection pools to cache.
+        :param pool_maxsize: maximum number of connections to keep in one per-host pool.
+        :param pool_block: whether the pool should block for a free connection
+        instead of opening a new one, which would be discarded afterwards.
+        :param keep_alive: idle timeout in seconds, after which pooled connections
+        are not reused anymore. ``None`` means connections are kept forever.
+        """
+        self._keep_alive = keep_alive
+        self._closed = dict(connections=0, requests=0)
+        self._lock = threading.Lock()
+
+        super(PoolingAdapter, self).__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block
+        )
+
+    def __setstate__(self, state):
+        self._closed = dict(connections=0, requests=0)
+        self._lock = threading.Lock()
+        super(PoolingAdapter, self).__setstate__(state)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(PoolingAdapter, self).init_poolmanager(*args, **kwargs)
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': functools.partial(_ExpiringHTTPConnectionPool, keep_alive=self._keep_alive),
+            'https': functools.partial(_ExpiringHTTPSConnectionPool, keep_alive=self._keep_alive),
+        }
+        # pools, evicted by the pool manager or closed with the adapter, are counted in statistics
+        self.poolmanager.pools.dispose_func = self._dispose
+
+    def _dispose(self, pool):
+        with self._lock:
+            self._closed['connections'] += pool.num_connections
+            self._closed['requests'] += pool.num_requests
+        pool.close()
+
+    def _pools(self):
+        pools = self.poolmanager.pools
+
+        result = list()
+        for key in pools.keys():
+            try:
+                result.append(pools[key])
+            except KeyError:
+                continue  # pool was evicted in the meantime
+        return result
+
+    def stats(self):
+        """
+        Method for getting connection pool statistics.
+
+        Following values are returned:
+          * pools -- number of currently active per-host pools.
+          * connections -- number of newly opened connections.
+          * requests -- number of requests sent through the adapter.
+          * reused -- number of requests, which were sent over already opened connection.
+
+        :return: dictionary with statistics.
+        :rtype: dict
+        """
+        pools = self._pools()
+
+        connections = self._closed['connections'] + sum(pool.num_connections for pool in pools)
+        requests = self._closed['requests'] + sum(pool.num_requests for pool in pools)
+
+        return dict(
+            pools=len(pools),
+            connections=connections,
+            requests=requests,
+            reused=max(requests - connections, 0),
+        )
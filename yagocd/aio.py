@@ -0,0 +1,295 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+import asyncio
+import functools
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+from yagocd.client import Yagocd
+from yagocd.resources import BaseManager
+
+# `get_running_loop` appeared in Python 3.7
+_get_loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)
+
+
+class AsyncSession(object):
+    """
+    Asynchronous counterpart of :class:`yagocd.session.Session`.
+
+    It wraps synchronous session and executes it's requests in the pool
+    of worker threads, so at most `workers` requests are executed at the
+    same moment, others wait for a free worker. The session shares
+    connection pool, retry policy and caches with the wrapped one: set
+    `pool_maxsize` option to the number of workers, otherwise connections
+    above the pool size are opened and discarded for each request.
+    """
+
+    DEFAULT_WORKERS = 32
+
+    def __init__(self, session, executor=None, workers=None):
+        """
+        :param session: synchronous session to wrap.
+        :type session: yagocd.session.Session
+        :param executor: executor for running requests, by default
+        :class:`concurrent.futures.ThreadPoolExecutor` with `workers` threads is used.
+        :param workers: number of worker threads, ``DEFAULT_WORKERS`` by default.
+        """
+        self._session = session
+        self._executor = executor or ThreadPoolExecutor(max_workers=workers or self.DEFAULT_WORKERS)
+
+    @property
+    def session(self):
+        """
+        Wrapped synchronous session.
+
+        :rtype: yagocd.session.Session
+        """
+        return self._session
+
+    @staticmethod
+    def _call(func, args, kwargs):
+        result = func(*args, **kwargs)
+        # generators (e.g. `full_history`) would do requests while being iterated,
+        # so they are consumed in the worker, not in the event loop.
+        if isinstance(result, types.GeneratorType):
+            result = list(result)
+        return result
+
+    def _submit(self, func):
+        return _get_loop().run_in_executor(self._executor, func)
+
+    def run(self, func, *args, **kwargs):
+        """
+        Execute given blocking function in the pool of workers.
+
+        Use it for calling methods of entities, returned by managers::
+
+            pipeline = await client.pipelines.find('Shared_Services')
+            history = await client.run(pipeline.history, offset=10)
+
+        Result of the call could also be iterated with ``async for``: items
+        of the returned iterable are taken one by one in the workers, so
+        generators (e.g. `full_history`) are not consumed as a whole::
+
+            async for instance in client.pipelines.full_history('Shared_Services'):
+                ...
+
+        :param func: function to execute.
+        :return: awaitable with the result of the function.
+        :rtype: yagocd.aio.AsyncCall
+        """
+        return AsyncCall(self, functools.partial(func, *args, **kwargs))
+
+    def request(self, method, path, params=None, data=None, headers=None, files=None):
+        return self.run(
+            self._session.request,
+            method=method, path=path, params=params, data=data, headers=headers, files=files
+        )
+
+    def get(self, path, params=None, headers=None):
+        return self.request(method='get', path=path, params=params, headers=headers)
+
+    def post(self, path, params=None, data=None, headers=None, files=None):
+        return self.request(method='post', path=path, params=params, data=data, headers=headers, files=files)
+
+    def put(self, path, data=None, headers=None, files=None):
+        return self.request(method='put', path=path, data=data, headers=headers, files=files)
+
+    def patch(self, path, data=None, headers=None):
+        return self.request(method='patch', path=path, data=data, headers=headers)
+
+    def delete(self, path, data=None, headers=None):
+        return self.request(method='delete', path=path, data=data, headers=headers)
+
+    def close(self):
+        """
+        Stop the pool of workers.
+        """
+        self._executor.shutdown(wait=True)
+
+
+class AsyncCall(object):
+    """
+    Deferred call of blocking function in the pool of workers.
+
+    Awaiting it executes the function and returns it's result. Iterating
+    it with ``async for`` executes the function and then takes items of
+    the result one by one, each in the worker.
+    """
+
+    def __init__(self, session, func):
+        """
+        :param session: asynchronous session.
+        :type session: yagocd.aio.AsyncSession
+        :param func: function without arguments to execute.
+        """
+        self._session = session
+        self._func = func
+        self._iterator = None
+
+    def __await__(self):
+        return self._session._submit(functools.partial(self._session._call, self._func, (), {})).__await__()
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        return AsyncCall(self._session, self._next)
+
+    def _next(self):
+        if self._iterator is None:
+            self._iterator = iter(self._func())
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            raise StopAsyncIteration  # noqa: F821
+
+
+class AsyncManager(object):
+    """
+    Asynchronous proxy for a manager.
+
+    Public methods of the wrapped manager return awaitable
+    :class:`AsyncCall` instead of results, all other attributes are
+    returned as is. Awaited generators are consumed in the worker and
+    returned as lists, use ``async for`` to get their items one by one.
+    """
+
+    def __init__(self, manager, session):
+        """
+        :param manager: manager to wrap.
+        :type manager: yagocd.resources.BaseManager
+        :param session: asynchronous session.
+        :type session: yagocd.aio.AsyncSession
+        """
+        self._manager = manager
+        self._session = session
+
+    def __repr__(self):
+        return '<{cls}: {manager!r}>'.format(cls=self.__class__.__name__, manager=self._manager)
+
+    def __getattr__(self, name):
+        attr = getattr(self._manager, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def method(*args, **kwargs):
+            return self._session.run(attr, *args, **kwargs)
+
+        return method
+
+    def __getitem__(self, key):
+        return self._session.run(self._manager.__getitem__, key)
+
+    @property
+    def manager(self):
+        """
+        Wrapped synchronous manager.
+
+        :rtype: yagocd.resources.BaseManager
+        """
+        return self._manager
+
+
+class AsyncYagocd(object):
+    """
+    Asynchronous version of :class:`yagocd.client.Yagocd`.
+
+    It has the same managers as synchronous client, but their methods
+    return awaitable futures::
+
+        client = AsyncYagocd(server='http://localhost:8153', auth=('admin', 'secret'))
+        pipelines, agents = await asyncio.gather(client.pipelines.list(), client.agents.list())
+
+    Returned entities are the same as in synchronous client, use
+    :meth:`run` to call their methods without blocking the event loop.
+
+    Requests are executed by the pool of worker threads, which limits
+    the number of concurrent requests to `workers` (see
+    :class:`AsyncSession`).
+    """
+
+    def __init__(self, server=None, auth=None, options=None, executor=None, workers=None):
+        """
+        Construct asynchronous GoCD client instance.
+
+        :param server: url of the Go server
+        :param auth: authorization, that will be passed to requests.
+        :param options: dictionary of additional options, see :class:`yagocd.client.Yagocd`.
+        :param executor: executor for running requests, see :class:`yagocd.aio.AsyncSession`.
+        :param workers: number of worker threads, see :class:`yagocd.aio.AsyncSession`.
+        """
+        self._client = Yagocd(server=server, auth=auth, options=options)
+        self._session = AsyncSession(self._client._session, executor=executor, workers=workers)
+        self._managers = dict()
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        if name not in self._managers:
+            attr = getattr(self._client, name)
+            if not isinstance(attr, BaseManager):
+                return attr
+            self._managers[name] = AsyncManager(attr, self._session)
+
+        return self._managers[name]
+
+    @property
+    def client(self):
+        """
+        Wrapped synchronous client.
+
+        :rtype: yagocd.client.Yagocd
+        """
+        return self._client
+
+    @property
+    def session(self):
+        """
+        :rtype: yagocd.aio.AsyncSession
+        """
+        return self._session
+
+    def run(self, func, *args, **kwargs):
+        """
+        Execute given blocking function (e.g. method of an entity) in the pool of workers.
+
+        :return: awaitable with the result of the function.
+        :rtype: yagocd.aio.AsyncCall
+        """
+        return self._session.run(func, *args, **kwargs)
+
+    def close(self):
+        """
+        Stop the pool of workers.
+        """
+        self._session.close()
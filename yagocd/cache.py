@@ -0,0 +1,472 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+# noinspection PyUnresolvedReferences
+from six.moves.urllib.parse import urlsplit
+
+_replace = getattr(os, 'replace', os.rename)
+
+
+class ETagCache(object):
+    """
+    Cache of responses for conditional GET requests.
+
+    Many GoCD endpoints return `ETag` header with the response. When such
+    response is cached, repeated GET request to the same url is sent with
+    `If-None-Match` header and in case server replies with
+    `304 Not Modified`, the cached response is returned instead. The body
+    of the resource is not transferred again, while the data is still
+    guaranteed to be fresh.
+
+    Responses are keyed by url, query parameters and `Accept` header,
+    because different API versions return different representations of
+    the same resource. Number of cached responses is limited by `maxsize`,
+    least recently used ones are evicted first.
+
+    To enable the cache, pass it's instance in `etag_cache` option::
+
+        client = Yagocd(options={'etag_cache': ETagCache()})
+    """
+
+    def __init__(self, maxsize=1024):
+        """
+        :param maxsize: maximum number of responses to keep.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(url, params=None, headers=None):
+        """
+        Builds cache key for the request.
+
+        :param url: full url of the request.
+        :param params: query parameters.
+        :param headers: request headers.
+        :return: hashable key.
+        """
+        if isinstance(params, dict):
+            params = sorted(params.items())
+        params = tuple(params or ())
+
+        accept = (headers or {}).get('Accept')
+        return url, params, accept
+
+    def get(self, key):
+        """
+        Get cached response.
+
+        :param key: cache key, built by :meth:`key`.
+        :return: cached response or ``None``.
+        :rtype: requests.models.Response
+        """
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                # mark entry as recently used
+                del self._entries[key]
+                self._entries[key] = response
+            return response
+
+    def set(self, key, response):
+        """
+        Put response to the cache, if it has `ETag` header.
+
+        :param key: cache key, built by :meth:`key`.
+        :param response: response to cache.
+        """
+        if not response.headers.get('ETag'):
+            return
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = response
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def update(self, key, cached, response):
+        """
+        Process response of the conditional request.
+
+        :param key: cache key, built by :meth:`key`.
+        :param cached: cached response, which `ETag` was sent in `If-None-Match` header.
+        :param response: response from the server.
+        :return: cached response, if server replied with `304 Not Modified`, otherwise
+        the received response.
+        :rtype: requests.models.Response
+        """
+        if cached is not None and response.status_code == 304:
+            with self._lock:
+                self.hits += 1
+            response.close()
+            return cached
+
+        with self._lock:
+            self.misses += 1
+        if response.status_code == 200:
+            self.set(key, response)
+        return response
+
+    def clear(self):
+        """
+        Remove all cached responses and reset statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Method for getting cache statistics.
+
+        :return: dictionary with number of cached responses, hits (`304 Not Modified`
+        responses) and misses (requests with full response body).
+        :rtype: dict
+        """
+        return dict(size=len(self), hits=self.hits, misses=self.misses)
+
+
+class VersionCache(object):
+    """
+    Persistent cache of server versions.
+
+    Server version is needed to choose API version of many endpoints, so
+    each new client requests it from the server before the first call.
+    For short-lived processes, e.g. command line tools, this extra round
+    trip could take a significant part of the run time. This cache keeps
+    versions in JSON file, keyed by the server url, and reuses them for
+    `ttl` seconds across the processes.
+
+    To enable the cache, pass it's instance in `version_cache` option::
+
+        client = Yagocd(options={'version_cache': VersionCache()})
+    """
+
+    DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'yagocd', 'versions.json')
+
+    def __init__(self, path=None, ttl=24 * 60 * 60):
+        """
+        :param path: path to the cache file, by default `~/.cache/yagocd/versions.json` is used.
+        :param ttl: time in seconds, during which cached version is used.
+        """
+        self.path = path or self.DEFAULT_PATH
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (IOError, OSError, ValueError):
+            return dict()
+
+        return entries if isinstance(entries, dict) else dict()
+
+    def get(self, server_url):
+        """
+        Get cached version of the server.
+
+        :param server_url: url of the server.
+        :return: version or ``None``, if it's not cached or expired.
+        """
+        with self._lock:
+            entry = self._read().get(server_url)
+
+        try:
+            if time.time() - entry['time'] < self.ttl:
+                return entry['version']
+        except (KeyError, TypeError):
+            pass
+
+    def set(self, server_url, version):
+        """
+        Put version of the server to the cache.
+
+        Cache is written to the temporary file, which is renamed then, so
+        concurrent processes never read partially written file. Errors of
+        writing are ignored: in the worst case version would be requested
+        again.
+
+        :param server_url: url of the server.
+        :param version: version of the server.
+        """
+        with self._lock:
+            entries = self._read()
+            entries[server_url] = dict(version=version, time=time.time())
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+            try:
+                if not os.path.isdir(directory):
+                    os.makedirs(directory)
+                fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.versions')
+            except (IOError, OSError):
+                return
+
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(entries, f)
+                _replace(temp_path, self.path)
+            except (IOError, OSError):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    def clear(self):
+        """
+        Remove all cached versions.
+        """
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+def _stage_finished(stage):
+    if stage.get('result') not in ('Passed', 'Failed', 'Cancelled'):
+        return False
+    return all(job.get('state') == 'Completed' for job in stage.get('jobs', ()))
+
+
+def stage_finished(response):
+    """
+    Check whether the response contains stage instance, which is finished:
+    it has final result and all of it's jobs are completed.
+
+    :param response: response of the stage instance endpoint.
+    :rtype: bool
+    """
+    return _stage_finished(response.json())
+
+
+def pipeline_finished(response):
+    """
+    Check whether the response contains pipeline instance, all stages of
+    which are scheduled and finished.
+
+    :param response: response of the pipeline instance endpoint.
+    :rtype: bool
+    """
+    stages = response.json().get('stages') or ()
+    return bool(stages) and all(stage.get('scheduled', True) and _stage_finished(stage) for stage in stages)
+
+
+class CachePolicy(object):
+    """
+    Policy of caching responses of the endpoint.
+
+    Endpoint is defined by regular expression, which is searched in the
+    path of the url. Responses are kept for `ttl` seconds, unless
+    `immutable` says they'd never change: such responses are kept until
+    they are evicted from the cache.
+
+    `immutable` could be either boolean or function, which receives
+    response and returns boolean, e.g. to check that pipeline has finished.
+    """
+
+    def __init__(self, pattern, ttl=0, immutable=False):
+        """
+        :param pattern: regular expression for the path of the url.
+        :param ttl: time in seconds to keep mutable responses, ``0`` means they are not cached.
+        :param immutable: whether response never changes, or function to check it.
+        """
+        self.pattern = re.compile(pattern)
+        self.ttl = ttl
+        self.immutable = immutable
+
+    def __repr__(self):
+        return 'CachePolicy({!r}, ttl={!r}, immutable={!r})'.format(self.pattern.pattern, self.ttl, self.immutable)
+
+    def matches(self, url):
+        """
+        Check whether the policy is applicable to the url.
+
+        :param url: full url of the request.
+        :rtype: bool
+        """
+        return self.pattern.search(urlsplit(url).path) is not None
+
+    def expires(self, response, now):
+        """
+        Calculate time, when the response should be removed from the cache.
+
+        :param response: response to cache.
+        :param now: current time.
+        :return: expiration time, ``None`` if response should be kept forever
+        or ``0`` if it shouldn't be cached at all.
+        """
+        immutable = self.immutable(response) if callable(self.immutable) else self.immutable
+        if immutable:
+            return None
+        return now + self.ttl if self.ttl > 0 else 0
+
+
+class ResponseCache(object):
+    """
+    Cache of responses with per-endpoint policies.
+
+    Unlike :class:`ETagCache`, which still asks the server whether the
+    resource has changed, this cache doesn't make any request at all for
+    the cached responses. So it's used only for the endpoints, listed in
+    `policies`: by default those are resources, which never change after
+    they're finished -- stage instances, pipeline instances and revisions
+    of the configuration, and value stream maps, which are kept for a minute.
+    Notice, that rerun of a stage of finished pipeline changes the pipeline
+    instance, pass your own policies if you rely on it.
+
+    Responses are keyed by url, query parameters and `Accept` header.
+    Number of cached responses is limited by `maxsize`, least recently
+    used ones are evicted first.
+
+    To enable the cache, pass it's instance in `response_cache` option::
+
+        client = Yagocd(options={'response_cache': ResponseCache(maxsize=4096)})
+    """
+
+    DEFAULT_POLICIES = (
+        CachePolicy(r'/api/admin/config/[0-9a-fA-F]+\.xml$', immutable=True),
+        CachePolicy(r'/api/stages/[^/]+/[^/]+/instance/\d+/\d+$', immutable=stage_finished),
+        CachePolicy(r'/api/pipelines/[^/]+/instance/\d+$', immutable=pipeline_finished),
+        CachePolicy(r'/pipelines/value_stream_map/[^/]+/\d+\.json$', ttl=60),
+    )
+
+    def __init__(self, maxsize=1024, policies=DEFAULT_POLICIES):
+        """
+        :param maxsize: maximum number of responses to keep.
+        :param policies: list of :class:`CachePolicy`, the first matching one is used.
+        """
+        self.maxsize = maxsize
+        self.policies = list(policies)
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    key = staticmethod(ETagCache.key)
+
+    def policy(self, url):
+        """
+        Find policy for the url.
+
+        :param url: full url of the request.
+        :return: first matching policy or ``None``, if responses of the url are not cached.
+        :rtype: yagocd.cache.CachePolicy
+        """
+        for policy in self.policies:
+            if policy.matches(url):
+                return policy
+
+    def get(self, key):
+        """
+        Get cached response.
+
+        :param key: cache key, built by :meth:`key`.
+        :return: cached response or ``None``.
+        :rtype: requests.models.Response
+        """
+        if self.policy(key[0]) is None:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                response, expires = entry
+                del self._entries[key]
+                if expires is None or expires > time.time():
+                    # mark entry as recently used
+                    self._entries[key] = entry
+                    self.hits += 1
+                    return response
+
+            self.misses += 1
+
+    def set(self, key, response):
+        """
+        Put response to the cache, if it's successful and policy of the url allows it.
+
+        :param key: cache key, built by :meth:`key`.
+        :param response: response to cache.
+        """
+        policy = self.policy(key[0])
+        if policy is None or response.status_code != 200:
+            return
+
+        expires = policy.expires(response, time.time())
+        if expires == 0:
+            return
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (response, expires)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all cached responses and reset statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Method for getting cache statistics.
+
+        :return: dictionary with number of cached responses, hits (responses
+        returned from the cache) and misses (requests of cacheable endpoints,
+        sent to the server).
+        :rtype: dict
+        """
+        return dict(size=len(self), hits=self.hits, misses=self.misses)
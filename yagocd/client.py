@@ -67,7 +67,19 @@ class Yagocd(object):
         'verify': True,
         'headers': {
             'Accept': BaseManager.ACCEPT_HEADER,
-        }
+        },
+        'pool_connections': 10,
+        'pool_maxsize': 10,
+        'pool_block': False,
+        'keep_alive': None,
+        'retry': None,
+        'etag_cache': None,
+        'history_prefetch': 0,
+        'pipelines_index_ttl': 0,
+        'json_decoder': None,
+        'version_cache': None,
+        'single_flight': False,
+        'response_cache': None,
     }
 
     def __init__(self, server=None, auth=None, options=None):
@@ -83,6 +95,31 @@ class Yagocd(object):
             overwritten by some managers, because of API.
             * verify -- verify SSL certs. Defaults to ``True``.
             * headers -- default headers for requests (default is ``'Accept': 'application/vnd.go.cd.v1+json'``)
+            * pool_connections -- number of per-host connection pools to cache (default is ``10``).
+            * pool_maxsize -- maximum number of connections kept open to one host (default is ``10``).
+            If you are making calls from many threads, set it to the number of threads.
+            * pool_block -- block when there is no free connection in the pool instead of opening
+            extra one, which would be discarded afterwards. Defaults to ``False``.
+            * keep_alive -- idle timeout in seconds, after which pooled connections are not reused.
+            Defaults to ``None``, which means connections are reused forever.
+            * retry -- :class:`yagocd.retry.RetryPolicy` instance, which controls retrying of failed
+            requests. Defaults to ``None``, which means each request is attempted only once.
+            * etag_cache -- :class:`yagocd.cache.ETagCache` instance, which is used for sending
+            conditional GET requests. Defaults to ``None``, which means conditional requests are not used.
+            * history_prefetch -- number of history pages, which are requested ahead in parallel while
+            iterating over full history of pipelines and stages. Defaults to ``0``.
+            * pipelines_index_ttl -- time in seconds to reuse the list of pipelines for looking them up by name.
+            Defaults to ``0``, which means pipelines are listed on each lookup.
+            * json_decoder -- function for decoding JSON responses, e.g. ``orjson.loads``. Defaults to ``None``,
+            which means the fastest of installed libraries is used (see :mod:`yagocd.decoder`).
+            * version_cache -- :class:`yagocd.cache.VersionCache` instance, which keeps versions of servers
+            on disk to share them between processes. Defaults to ``None``, which means version is requested
+            by each client.
+            * single_flight -- send only one of identical GET requests, which are made concurrently from
+            different threads, and return it's response to all of them. Defaults to ``False``.
+            * response_cache -- :class:`yagocd.cache.ResponseCache` instance, which keeps responses of the
+            resources, that don't change (e.g. finished stages). Defaults to ``None``, which means responses
+            are not cached.
         """
         options = {} if options is None else options
 
@@ -127,6 +164,27 @@ class Yagocd(object):
         """
         return self._session.server_url
 
+    def pool_stats(self):
+        """
+        Method for getting statistics of the connection pool.
+
+        :return: dictionary with number of opened connections, sent requests
+        and requests, which reused already opened connection.
+        :rtype: dict
+        """
+        return self._session.pool_stats()
+
+    def flight_stats(self):
+        """
+        Method for getting statistics of concurrent identical GET requests,
+        see `single_flight` option.
+
+        :return: dictionary with number of sent requests and requests, which
+        got response of another one.
+        :rtype: dict
+        """
+        return self._session.flight_stats()
+
     @property
     def agents(self):
         """
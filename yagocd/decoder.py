@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+import codecs
+import importlib
+import json
+import re
+
+import requests
+from requests.utils import guess_json_utf
+
+# JSON libraries to try, fastest first
+DECODERS = ('orjson', 'simdjson', 'ujson')
+
+_default = None
+
+_whitespace = re.compile(r'[ \t\n\r]*')
+
+
+def find_decoder():
+    """
+    Finds `loads` function of the fastest installed JSON library.
+
+    Libraries from `DECODERS` are tried in order and if none of them is
+    installed, `json.loads` from the standard library is returned.
+    Result is cached, so libraries are imported only once.
+
+    :return: function, which accepts JSON document as bytes or string
+    and returns decoded object.
+    """
+    global _default
+
+    if _default is None:
+        for name in DECODERS:
+            try:
+                _default = importlib.import_module(name).loads
+                break
+            except ImportError:
+                continue
+        else:
+            _default = json.loads
+
+    return _default
+
+
+def decode(response, loads, **kwargs):
+    """
+    Decodes JSON body of the response with given function - replacement
+    of :meth:`requests.Response.json`.
+
+    Accelerated decoders work with bytes, so the body is passed as is,
+    when it's encoded in UTF-8. Otherwise it's decoded to text first.
+    If keyword arguments for `json.loads` are given, the original
+    method of the response is used.
+
+    :param response: response to decode.
+    :type response: requests.models.Response
+    :param loads: function for decoding JSON document.
+    :return: decoded object.
+    """
+    if kwargs:
+        return requests.Response.json(response, **kwargs)
+
+    content = response.content
+    if response.encoding is None:
+        encoding = content and guess_json_utf(content)
+        if encoding and encoding != 'utf-8':
+            content = content.decode(encoding)
+    elif response.encoding.lower().replace('-', '') not in ('utf8', 'ascii'):
+        content = response.text
+
+    return loads(content)
+
+
+def iter_array(chunks):
+    """
+    Incrementally decodes JSON array from the stream of chunks and
+    yields it's items one by one as soon as they are received.
+
+    Only the item, which is being decoded, and the current chunk are kept
+    in memory, so it's possible to process arrays larger than available
+    memory, as long as each of their items fits.
+
+    :param chunks: iterable of bytes with UTF-8 encoded JSON document,
+    e.g. result of :meth:`requests.Response.iter_content`.
+    :return: generator of decoded items.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+
+    buf = u''
+    pos = 0
+    # number of characters to wait for before trying to decode incomplete item again
+    required = 1
+    exhausted = False
+    state = 'start'
+
+    while True:
+        if len(buf) - pos < required and not exhausted:
+            chunk = next(chunks, None)
+            exhausted = chunk is None
+            buf = buf[pos:] + utf8.decode(b'' if exhausted else chunk, exhausted)
+            pos = 0
+            continue
+
+        pos = _whitespace.match(buf, pos).end()
+        if pos == len(buf):
+            if exhausted:
+                break
+            required = 1
+            continue
+
+        if state == 'item' or (state == 'first' and buf[pos] != ']'):
+            item, end = _decode_item(decoder, buf, pos, exhausted)
+            if end is None:
+                # wait until the buffer doubles, so large items are not decoded again on each chunk
+                required = 2 * (len(buf) - pos)
+                continue
+
+            required = 1
+            state = 'separator'
+            pos = end
+            yield item
+        else:
+            state, pos = _step(state, buf, pos)
+
+    if state != 'end':
+        raise ValueError('Unexpected end of JSON array')
+
+
+def _step(state, buf, pos):
+    """
+    Handles the bracket or separator of the array at the given position.
+
+    :param state: current state of the decoder: 'start', 'first', 'separator' or 'end'.
+    :param buf: buffer with the part of JSON document.
+    :param pos: position of the non-whitespace character in the buffer.
+    :return: tuple of the next state and position.
+    """
+    char = buf[pos]
+    if state == 'start':
+        if char != '[':
+            raise ValueError('Expecting JSON array, got {!r}'.format(buf[pos:pos + 20]))
+        return 'first', pos + 1
+
+    if state == 'end':
+        raise ValueError('Extra data after the end of array: {!r}'.format(buf[pos:pos + 20]))
+
+    if char not in ',]':
+        raise ValueError('Expecting "," or "]", got {!r}'.format(buf[pos:pos + 20]))
+    return 'item' if char == ',' else 'end', pos + 1
+
+
+def _decode_item(decoder, buf, pos, exhausted):
+    """
+    Decodes the item of the array at the given position.
+
+    :param decoder: JSON decoder.
+    :type decoder: json.JSONDecoder
+    :param buf: buffer with the part of JSON document.
+    :param pos: position of the first character of the item in the buffer.
+    :param exhausted: whether the whole document is in the buffer.
+    :return: tuple of the item and position after it. Position is ``None``
+    in case the item is incomplete and the next chunk is required.
+    """
+    try:
+        item, end = decoder.raw_decode(buf, pos)
+    except ValueError:
+        if exhausted:
+            raise
+        return None, None
+
+    if _incomplete(buf, pos, end, exhausted):
+        return None, None
+    return item, end
+
+
+def _incomplete(buf, pos, end, exhausted):
+    """
+    Checks whether the decoded scalar could continue in the next chunk.
+
+    Scalar at the end of the buffer could continue in the next chunk,
+    as well as fraction or exponent of the number, which is decoded
+    only up to the dot or `e`.
+
+    :param buf: buffer with the part of JSON document.
+    :param pos: position of the first character of the item in the buffer.
+    :param end: position after the decoded item.
+    :param exhausted: whether the whole document is in the buffer.
+    :rtype: bool
+    """
+    if exhausted or buf[pos] in '{["':
+        return False
+    return end == len(buf) or buf[end] in '.eE'
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+import sys
+import threading
+
+import six
+
+
+class SingleFlight(object):
+    """
+    Deduplication of concurrent identical calls.
+
+    When several threads make the same call at the same moment, only the
+    first of them executes it, others wait for it to finish and get the
+    same result (or the same exception). Calls, which are made after the
+    first one finished, are executed again, so nothing is cached.
+
+    It's used by the session for GET requests when `single_flight` option
+    is set, so refreshing of a dashboard from many threads sends one
+    request for each resource instead of one per thread::
+
+        client = Yagocd(options={'single_flight': True})
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+
+        self._calls = dict()
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """
+        Execute the function, unless call with the same key is already in flight.
+
+        :param key: hashable key of the call.
+        :param func: function without arguments to execute.
+        :return: result of the function.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+                leader = True
+            else:
+                self.shared += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.exc_info is not None:
+                six.reraise(*call.exc_info)
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException:
+            call.exc_info = sys.exc_info()
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        """
+        Method for getting statistics of the calls.
+
+        :return: dictionary with number of executed calls and calls, which
+        got result of another one.
+        :rtype: dict
+        """
+        return dict(calls=self.calls, shared=self.shared)
+
+
+class _Call(object):
+    __slots__ = ('done', 'result', 'exc_info')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exc_info = None
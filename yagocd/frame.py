@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+import collections
+from array import array
+
+NAN = float('nan')
+
+
+class HistoryFrame(object):
+    """
+    Columnar representation of pipeline, stage or job history.
+
+    Each column is stored in compact :class:`array.array`, so history of
+    hundreds of thousands of runs takes a few megabytes and could be
+    converted to NumPy arrays, pandas ``DataFrame`` or Arrow ``Table``
+    without going through Python objects::
+
+        frame = client.pipelines.history_frame('Consumer_Website')
+        columns = frame.to_numpy()
+        failure_rate = (columns['result'] == HistoryFrame.FAILED).mean()
+
+    Columns are:
+        * counter -- counter of the pipeline.
+        * stage_counter -- counter of the stage, only for stages and jobs.
+        * result -- index of the result in :attr:`RESULTS`.
+        * scheduled -- time, when the first job was scheduled, in milliseconds since epoch.
+        * duration -- time from scheduling of the job till it's completion in milliseconds. It's
+        calculated from job state transitions, which are returned only by job history, so for
+        pipelines and stages it's ``nan``.
+
+    Conversion methods require appropriate library to be installed.
+    """
+
+    PIPELINE = 'pipeline'
+    STAGE = 'stage'
+    JOB = 'job'
+
+    RESULTS = ('Unknown', 'Passed', 'Failed', 'Cancelled')
+    UNKNOWN, PASSED, FAILED, CANCELLED = range(len(RESULTS))
+    _CODES = dict((result, code) for code, result in enumerate(RESULTS))
+
+    COLUMNS = {
+        PIPELINE: (('counter', 'l'), ('result', 'b'), ('scheduled', 'd'), ('duration', 'd')),
+        STAGE: (('counter', 'l'), ('stage_counter', 'l'), ('result', 'b'), ('scheduled', 'd'), ('duration', 'd')),
+        JOB: (('counter', 'l'), ('stage_counter', 'l'), ('result', 'b'), ('scheduled', 'd'), ('duration', 'd')),
+    }
+
+    def __init__(self, kind, instances=()):
+        """
+        :param kind: kind of the history: one of `PIPELINE`, `STAGE` or `JOB`.
+        :param instances: instances to add to the frame, could be entities
+        or dictionaries with their data.
+        """
+        if kind not in self.COLUMNS:
+            raise ValueError("Unknown kind of history '{}'".format(kind))
+
+        self._kind = kind
+        self._columns = collections.OrderedDict(
+            (name, array(typecode)) for name, typecode in self.COLUMNS[kind]
+        )
+        self._row = getattr(self, '_{}_row'.format(kind))
+
+        self.extend(instances)
+
+    def __len__(self):
+        return len(self._columns['counter'])
+
+    def __getitem__(self, name):
+        """
+        Get column by the name.
+
+        :param name: name of the column.
+        :rtype: array.array
+        """
+        return self._columns[name]
+
+    def __repr__(self):
+        return '<{cls}: {kind}, {rows} rows>'.format(cls=self.__class__.__name__, kind=self._kind, rows=len(self))
+
+    @property
+    def kind(self):
+        return self._kind
+
+    @property
+    def columns(self):
+        """
+        Names of the columns.
+
+        :rtype: tuple of str
+        """
+        return tuple(self._columns)
+
+    def extend(self, instances):
+        """
+        Adds instances to the frame.
+
+        Instances are consumed one by one, so it's possible to pass
+        generator, e.g. result of `full_history`, without keeping the whole
+        history in memory.
+
+        :param instances: iterable of entities or dictionaries with their data.
+        """
+        columns = list(self._columns.values())
+        for instance in instances:
+            for column, value in zip(columns, self._row(getattr(instance, 'data', instance))):
+                column.append(value)
+
+    def to_numpy(self):
+        """
+        Converts columns to NumPy arrays.
+
+        :return: dictionary of column names and arrays.
+        :rtype: collections.OrderedDict
+        """
+        import numpy
+
+        return collections.OrderedDict(
+            # copy, so the frame could be extended later: array couldn't be resized while it's exported
+            (name, numpy.frombuffer(column, dtype=column.typecode).copy() if column else
+             numpy.empty(0, dtype=column.typecode))
+            for name, column in self._columns.items()
+        )
+
+    def to_pandas(self):
+        """
+        Converts frame to pandas ``DataFrame``, results are converted to
+        categorical column.
+
+        :rtype: pandas.DataFrame
+        """
+        import pandas
+
+        columns = self.to_numpy()
+        columns['result'] = pandas.Categorical.from_codes(columns['result'], categories=self.RESULTS)
+        return pandas.DataFrame(columns)
+
+    def to_arrow(self):
+        """
+        Converts frame to Arrow ``Table``, results are converted to
+        dictionary encoded column.
+
+        :rtype: pyarrow.Table
+        """
+        import pyarrow
+
+        columns = self.to_numpy()
+        columns['result'] = pyarrow.DictionaryArray.from_arrays(
+            pyarrow.array(columns['result']), pyarrow.array(self.RESULTS)
+        )
+        return pyarrow.table(columns)
+
+    # Rows are read with `dict.get`, so data of entities, which is `LazyDict`,
+    # is read as is: nested values are not wrapped, as they are read only once.
+
+    @classmethod
+    def _result(cls, result):
+        return cls._CODES.get(result, cls.UNKNOWN)
+
+    @staticmethod
+    def _scheduled(jobs):
+        dates = [dict.get(job, 'scheduled_date') for job in jobs]
+        dates = [date for date in dates if date is not None]
+        return float(min(dates)) if dates else NAN
+
+    @staticmethod
+    def _duration(job):
+        times = dict(
+            (dict.get(transition, 'state'), dict.get(transition, 'state_change_time'))
+            for transition in dict.get(job, 'job_state_transitions') or ()
+        )
+        start = times.get('Scheduled', dict.get(job, 'scheduled_date'))
+        if times.get('Completed') is None or start is None:
+            return NAN
+        return float(times['Completed'] - start)
+
+    @classmethod
+    def _pipeline_row(cls, data):
+        stages = [stage for stage in dict.get(data, 'stages') or () if dict.get(stage, 'scheduled', True)]
+        results = set(cls._result(dict.get(stage, 'result')) for stage in stages)
+        if cls.FAILED in results:
+            result = cls.FAILED
+        elif cls.CANCELLED in results:
+            result = cls.CANCELLED
+        elif results == set([cls.PASSED]):
+            result = cls.PASSED
+        else:
+            result = cls.UNKNOWN
+
+        scheduled = cls._scheduled([job for stage in stages for job in dict.get(stage, 'jobs') or ()])
+        return int(dict.get(data, 'counter')), result, scheduled, NAN
+
+    @classmethod
+    def _stage_row(cls, data):
+        return (
+            int(dict.get(data, 'pipeline_counter')),
+            int(dict.get(data, 'counter')),
+            cls._result(dict.get(data, 'result')),
+            cls._scheduled(dict.get(data, 'jobs') or ()),
+            NAN,
+        )
+
+    @classmethod
+    def _job_row(cls, data):
+        return (
+            int(dict.get(data, 'pipeline_counter')),
+            int(dict.get(data, 'stage_counter')),
+            cls._result(dict.get(data, 'result')),
+            cls._scheduled([data]),
+            cls._duration(data),
+        )
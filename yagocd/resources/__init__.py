@@ -27,9 +27,7 @@
 #
 ###############################################################################
 
-from easydict import EasyDict
-
-from yagocd.util import YagocdUtil
+from yagocd.util import LazyDict, YagocdUtil
 
 
 class BaseManager(object):
@@ -47,6 +45,10 @@ class BaseManager(object):
     # to define it.
     VERSION_TO_ACCEPT_HEADER = None
 
+    # Accept headers, already chosen from `VERSION_TO_ACCEPT_HEADER`,
+    # keyed by manager class and server version.
+    _accept_headers = dict()
+
     def __init__(self, session):
         """
         :type session: yagocd.session.Session
@@ -54,6 +56,23 @@ class BaseManager(object):
         self._session = session
         self.base_api = self._session.base_api()
 
+    @property
+    def retry(self):
+        """
+        Retry policy, which is used for requests of this manager.
+
+        By default it's the policy set by `retry` option of the client.
+        Setting it affects only current manager and entities, returned
+        by it.
+
+        :rtype: yagocd.retry.RetryPolicy
+        """
+        return self._session._options['retry']
+
+    @retry.setter
+    def retry(self, policy):
+        self._session = self._session.clone(retry=policy)
+
     def _accept_header(self):
         """
         Method for determining correct `Accept` header.
@@ -68,26 +87,40 @@ class BaseManager(object):
         Choosing is pessimistic: if version of a server is less or
         equal to one of the dictionary, the value of that key would be
         used.
+        The choice is made once for each server version, after that the
+        header is looked up in the dictionary.
 
         :return: accept header to use in request.
         """
         if not self.VERSION_TO_ACCEPT_HEADER:
             return self.ACCEPT_HEADER
 
-        return YagocdUtil.choose_option(
-            version_to_options=self.VERSION_TO_ACCEPT_HEADER,
-            default=self.ACCEPT_HEADER,
-            server_version=self._session.server_version
-        )
+        key = (self.__class__, self._session.server_version)
+        try:
+            return self._accept_headers[key]
+        except KeyError:
+            header = self._accept_headers[key] = YagocdUtil.choose_option(
+                version_to_options=self.VERSION_TO_ACCEPT_HEADER,
+                default=self.ACCEPT_HEADER,
+                server_version=key[1]
+            )
+            return header
 
 
 class Base(object):
+    # Entities are created for each item of history pages, so there could be
+    # millions of them: slots make them compact. Subclasses, which don't
+    # define their own slots, get usual `__dict__`.
+    __slots__ = ('_session', '_data', '_etag', '__weakref__')
+
     def __init__(self, session, data, etag=None):
         self._session = session
-        self._data = EasyDict(data)
+        self._data = LazyDict(data or {})
         self._etag = etag
 
-        self.base_api = self._session.base_api()
+    @property
+    def base_api(self):
+        return self._session.base_api()
 
     @property
     def data(self):
@@ -105,11 +138,14 @@ class Base(object):
 
 
 class BaseNode(Base):
+    __slots__ = ('_predecessors', '_descendants')
+
     def __init__(self, session, data):
         super(BaseNode, self).__init__(session, data)
 
-        self._predecessors = list()
-        self._descendants = list()
+        # lists are created on first access, most of the nodes are never linked
+        self._predecessors = None
+        self._descendants = None
 
     def get_predecessors(self, transitive=False):
         """
@@ -119,6 +155,9 @@ class BaseNode(Base):
         :return: list of :class:`yagocd.resources.pipeline.PipelineEntity`.
         :rtype: list of yagocd.resources.pipeline.PipelineEntity
         """
+        if self._predecessors is None:
+            self._predecessors = list()
+
         result = self._predecessors
         if transitive:
             return YagocdUtil.graph_depth_walk(result, lambda v: v.predecessors)
@@ -138,6 +177,9 @@ class BaseNode(Base):
         :return: list of :class:`yagocd.resources.pipeline.PipelineEntity`.
         :rtype: list of yagocd.resources.pipeline.PipelineEntity
         """
+        if self._descendants is None:
+            self._descendants = list()
+
         result = self._descendants
         if transitive:
             return YagocdUtil.graph_depth_walk(result, lambda v: v.descendants)
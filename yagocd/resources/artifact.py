@@ -26,10 +26,24 @@
 #
 ###############################################################################
 
+import hashlib
+import heapq
+import os
+import shutil
+import threading
 import time
+import uuid
+from multiprocessing.pool import ThreadPool
 
-from yagocd.exception import YagocdException
+import requests
+from six import BytesIO, string_types
+from six.moves import queue
+# noinspection PyUnresolvedReferences
+from six.moves.urllib.parse import quote
+
+from yagocd.exception import RequestError, YagocdException
 from yagocd.resources import Base, BaseManager
+from yagocd.session import Session
 from yagocd.util import RequireParamMixin, since
 
 
@@ -53,6 +67,18 @@ class ArtifactManager(BaseManager, RequireParamMixin):
     NAME_FIELD = 'name'
     FILES_FIELD = 'files'
 
+    # size of the chunks in bytes, which are read from the network when downloading artifacts
+    CHUNK_SIZE = 64 * 1024
+
+    # suffix of the file, which is being downloaded
+    PARTIAL_SUFFIX = '.part'
+
+    # how many times download is resumed after the connection is dropped
+    RESUME_ATTEMPTS = 5
+
+    # file with MD5 checksums of all artifacts of the job, published by the server
+    CHECKSUM_PATH = '/cruise-output/md5.checksum'
+
     def __init__(
         self,
         session,
@@ -144,6 +170,36 @@ class ArtifactManager(BaseManager, RequireParamMixin):
 
         return artifacts
 
+    def tree(
+        self,
+        pipeline_name=None,
+        pipeline_counter=None,
+        stage_name=None,
+        stage_counter=None,
+        job_name=None
+    ):
+        """
+        Gets all artifacts of a job as a tree, indexed by path.
+
+        The tree is built from the single response of :meth:`list`, so
+        looking up artifacts by path and walking over the tree doesn't
+        make any requests to the server.
+
+        :param pipeline_name: name of the pipeline.
+        :param pipeline_counter: pipeline counter.
+        :param stage_name: name of the stage.
+        :param stage_counter: stage counter.
+        :param job_name: name of the job.
+        :rtype: yagocd.resources.artifact.ArtifactTree
+        """
+        return ArtifactTree(self.list(
+            pipeline_name=pipeline_name,
+            pipeline_counter=pipeline_counter,
+            stage_name=stage_name,
+            stage_counter=stage_counter,
+            job_name=job_name
+        ))
+
     def walk(
         self,
         top='/',
@@ -182,7 +238,7 @@ class ArtifactManager(BaseManager, RequireParamMixin):
     def _json_walk(self, top, topdown, artifacts):
         """
         JSON walker - analogue of `os.walk`.
-        Recursively walks through internal representation of the Artifact object.
+        Walks through the tree, built from the given list of artifacts.
 
         :param top: top or root path from which to start traversing.
         :param topdown: if is True or not specified, directories are scanned
@@ -193,31 +249,7 @@ class ArtifactManager(BaseManager, RequireParamMixin):
             (str, list[yagocd.resources.artifact.Artifact], list[yagocd.resources.artifact.Artifact])
         ]
         """
-        folders = list()
-        files = list()
-        children = self._get_children(artifacts, top)
-        if children is None:
-            return
-
-        for artifact in children:
-            artifact_type = artifact.data.get(self.TYPE_FIELD)
-            if artifact_type == self.FOLDER_TYPE:
-                folders.append(artifact)
-            elif artifact_type == self.FILE_TYPE:
-                files.append(artifact)
-            else:
-                raise ValueError("Unknown artifact type '{}'!".format(artifact_type))
-
-        if topdown:
-            yield top, folders, files
-        for folder in folders:
-            new_path = self._session.urljoin(top, folder.data.get(self.NAME_FIELD))
-
-            for x in self._json_walk(new_path, topdown, children):
-                yield x
-
-        if not topdown:
-            yield top, folders, files
+        return ArtifactTree(artifacts).walk(top=top, topdown=topdown)
 
     def _get_children(self, artifacts, path):
         """
@@ -228,20 +260,7 @@ class ArtifactManager(BaseManager, RequireParamMixin):
         :return: nested artifacts, located at the given path.
         :rtype: list[yagocd.resources.artifact.Artifact]
         """
-        if not path or path in ['/']:
-            return artifacts
-
-        for candidate in artifacts:
-            if candidate.path.rstrip('/') == path.rstrip('/'):
-                children = candidate.data.get(self.FILES_FIELD)
-                if children is None:
-                    return  # case for a file type
-                else:
-                    return [Artifact(session=self._session, data=data) for data in children]
-        else:
-            raise ValueError("Can't find requested path '{path}' in the given artifacts '{artifacts}'!".format(
-                path=path, artifacts=artifacts)
-            )
+        return ArtifactTree(artifacts).children(path)
 
     def file(
         self,
@@ -322,6 +341,323 @@ class ArtifactManager(BaseManager, RequireParamMixin):
 
         return response.content
 
+    def download(
+        self,
+        path,
+        destination,
+        chunk_size=CHUNK_SIZE,
+        progress=None,
+        resume=False,
+        segments=1,
+        pipeline_name=None,
+        pipeline_counter=None,
+        stage_name=None,
+        stage_counter=None,
+        job_name=None,
+    ):
+        """
+        Downloads an artifact file or directory zip by its path to the
+        given destination. Content is written by chunks, so it's never
+        loaded into memory as a whole.
+
+        When destination is a path, content is written to the temporary
+        file with `.part` suffix, which is renamed to destination after
+        download is completed. With `resume` the content of existing
+        temporary file is kept and only the rest of the artifact is
+        requested from the server, using `Range` header. Dropped
+        connections are resumed the same way.
+
+        :param path: path to the file or directory zip.
+        :param destination: path to the local file or file object opened for writing in binary mode.
+        :param chunk_size: size of the chunks in bytes to read from network.
+        :param progress: callable, which is called after each chunk with
+        two arguments: number of downloaded bytes and total size (``None`` if unknown).
+        :param resume: continue download of the temporary file, left by the previous attempt.
+        :param segments: number of byte ranges to split the file into and download in parallel.
+        Used only for files, which are big enough, and if server supports range requests.
+        :param pipeline_name: name of the pipeline.
+        :param pipeline_counter: pipeline counter.
+        :param stage_name: name of the stage.
+        :param stage_counter: stage counter.
+        :param job_name: name of the job.
+        :return: number of written bytes or ``None`` in case server is still
+        compressing requested directory (see :meth:`directory`).
+        """
+        func_args = locals()
+        parameters = {p: self._require_param(p, func_args) for p in self.PATH_PARAMETERS}
+
+        return self._download(
+            url=self._session.urljoin(self.RESOURCE_PATH, path).format(base_api=self.base_api, **parameters),
+            destination=destination,
+            chunk_size=chunk_size,
+            progress=progress,
+            resume=resume,
+            segments=segments
+        )
+
+    def stream(
+        self,
+        path,
+        chunk_size=CHUNK_SIZE,
+        progress=None,
+        pipeline_name=None,
+        pipeline_counter=None,
+        stage_name=None,
+        stage_counter=None,
+        job_name=None,
+    ):
+        """
+        Gets an artifact file or directory zip by its path as an iterator
+        over chunks of its content.
+
+        Connection is released when iterator is exhausted or closed.
+
+        :param path: path to the file or directory zip.
+        :param chunk_size: size of the chunks in bytes to read from network.
+        :param progress: callable, which is called after each chunk with
+        two arguments: number of downloaded bytes and total size (``None`` if unknown).
+        :param pipeline_name: name of the pipeline.
+        :param pipeline_counter: pipeline counter.
+        :param stage_name: name of the stage.
+        :param stage_counter: stage counter.
+        :param job_name: name of the job.
+        :return: iterator over chunks of bytes or ``None`` in case server is still
+        compressing requested directory (see :meth:`directory`).
+        :rtype: collections.Iterator[bytes]
+        """
+        func_args = locals()
+        parameters = {p: self._require_param(p, func_args) for p in self.PATH_PARAMETERS}
+
+        return self._stream(
+            url=self._session.urljoin(self.RESOURCE_PATH, path).format(base_api=self.base_api, **parameters),
+            chunk_size=chunk_size,
+            progress=progress
+        )
+
+    def _stream(self, url, chunk_size, progress=None):
+        response = self._session.get(path=url, stream=True)
+        if response.status_code == 202:
+            response.close()
+            return None
+
+        return self._iter_chunks(response, chunk_size, progress)
+
+    @staticmethod
+    def _iter_chunks(response, chunk_size, progress=None, offset=0):
+        total = response.headers.get('Content-Length')
+        total = offset + int(total) if total and total.isdigit() else None
+
+        downloaded = offset
+        try:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                downloaded += len(chunk)
+                if progress is not None:
+                    progress(downloaded, total)
+                yield chunk
+        finally:
+            response.close()
+
+    def _download(self, url, destination, chunk_size, progress=None, resume=False, segments=1):
+        if hasattr(destination, 'write'):
+            chunks = self._stream(url=url, chunk_size=chunk_size, progress=progress)
+            if chunks is None:
+                return None
+            return self._write_chunks(chunks, destination)
+
+        partial = destination + self.PARTIAL_SUFFIX
+
+        written = None
+        if segments > 1:
+            written = self._download_segments(url, partial, chunk_size, progress, resume, segments)
+        if written is None:
+            written = self._download_part(url, partial, chunk_size, progress, resume)
+        if written is None:
+            if not os.path.getsize(partial):
+                os.remove(partial)
+            return None
+
+        _replace(partial, destination)
+        return written
+
+    def _download_part(self, url, partial, chunk_size, progress=None, resume=False, first=0, last=None):
+        """
+        Downloads content of the url to the partial file.
+
+        With `resume` the download is continued from the current size of
+        the partial file, using `Range` header. Dropped connections are
+        resumed the same way, up to `RESUME_ATTEMPTS` times. Notice, that
+        incomplete chunk is discarded when connection drops, so up to
+        `chunk_size - 1` already received bytes are downloaded again.
+
+        :param first: offset of the first byte of the range to download.
+        :param last: offset of the last byte of the range to download, ``None`` for the end of the content.
+        :return: number of bytes written in this call or ``None`` in case
+        server is still compressing requested directory.
+        """
+        written = 0
+        attempt = 0
+        while True:
+            with self._open_part(partial, resume) as f:
+                offset = first + f.tell()
+                if last is not None and offset > last:
+                    return written
+
+                response, complete = self._request_part(url, offset, first, last)
+                if complete:
+                    return written
+                if response is None:
+                    # content has to be downloaded from the beginning
+                    resume = False
+                    continue
+
+                if response.status_code == 202:
+                    response.close()
+                    return None
+
+                count, error = self._write_part(url, response, f, chunk_size, progress, offset)
+                written += count
+                if error is None:
+                    return written
+
+            attempt += 1
+            if attempt > self.RESUME_ATTEMPTS:
+                raise error
+            resume = True
+
+    @staticmethod
+    def _open_part(partial, resume):
+        """
+        Opens the partial file for writing, positioned at its end.
+
+        :param resume: keep the current content of the partial file.
+        :return: file object opened for writing in binary mode.
+        """
+        f = open(partial, 'ab' if resume else 'wb')
+        f.seek(0, os.SEEK_END)
+        return f
+
+    def _request_part(self, url, offset, first, last):
+        """
+        Requests content of the url, starting from the given offset.
+
+        :param offset: offset of the first byte to request.
+        :param first: offset of the first byte of the whole range.
+        :param last: offset of the last byte of the range, ``None`` for the end of the content.
+        :return: tuple of the response and flag, whether the partial
+        file is already complete. Response is ``None`` in case the
+        content has to be downloaded from the beginning.
+        """
+        headers = dict()
+        if offset or last is not None:
+            headers['Range'] = 'bytes={}-{}'.format(offset, '' if last is None else last)
+
+        try:
+            response = self._session.get(path=url, headers=headers, stream=True)
+        except RequestError as e:
+            # 416 is returned when the partial file is already complete
+            if e.response.status_code != 416 or last is not None:
+                raise
+            return None, e.response.headers.get('Content-Range') == 'bytes */{}'.format(offset)
+
+        if headers and response.status_code not in (202, 206):
+            response.close()
+            if first or last is not None:
+                raise YagocdException("Server doesn't support range requests for '{}'!".format(url))
+            # server has ignored the range, so the content is downloaded from the beginning
+            return None, False
+
+        return response, False
+
+    def _write_part(self, url, response, f, chunk_size, progress, offset):
+        """
+        Writes content of the response to the partial file.
+
+        :param offset: offset of the first byte of the response in the content.
+        :return: tuple of the number of written bytes and the error,
+        which interrupted the download, ``None`` if the whole content was received.
+        """
+        expected = response.headers.get('Content-Length')
+        expected = int(expected) if expected and expected.isdigit() else None
+
+        before = f.tell()
+        try:
+            self._write_chunks(self._iter_chunks(response, chunk_size, progress, offset), f)
+        except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+            return f.tell() - before, e
+
+        count = f.tell() - before
+        if expected is not None and count != expected:
+            return count, YagocdException(
+                "Connection was closed before the whole content of '{}' was received!".format(url)
+            )
+        return count, None
+
+    def _download_segments(self, url, partial, chunk_size, progress, resume, segments):
+        """
+        Downloads content of the url to the partial file, splitting it
+        into several byte ranges, which are downloaded in parallel.
+
+        :return: number of bytes written in this call or ``None`` in case
+        server doesn't support range requests or size of the content is unknown.
+        """
+        response = self._session.request('HEAD', url)
+        size = response.headers.get('Content-Length')
+        if response.status_code != 200 or response.headers.get('Accept-Ranges') != 'bytes':
+            return None
+        if not size or not size.isdigit() or int(size) < segments * chunk_size:
+            return None
+        size = int(size)
+
+        step = size // segments
+        ranges = list()
+        for index in range(segments):
+            last = size - 1 if index == segments - 1 else (index + 1) * step - 1
+            ranges.append(('{}.{}'.format(partial, index), index * step, last))
+
+        lock = threading.Lock()
+        done = [0] * segments
+
+        def download(index):
+            name, first, last = ranges[index]
+
+            def report(downloaded, total):
+                with lock:
+                    done[index] = downloaded - first
+                    progress(sum(done), size)
+
+            return self._download_part(
+                url, name, chunk_size, report if progress is not None else None, resume, first, last
+            )
+
+        pool = ThreadPool(segments)
+        try:
+            written = sum(pool.map(download, range(segments)))
+        finally:
+            pool.close()
+
+        with open(partial, 'wb') as f:
+            for name, _, _ in ranges:
+                with open(name, 'rb') as part:
+                    shutil.copyfileobj(part, f, chunk_size)
+            if f.tell() != size:
+                raise YagocdException("Size of downloaded content of '{}' doesn't match {}!".format(url, size))
+
+        for name, _, _ in ranges:
+            os.remove(name)
+
+        return written
+
+    @staticmethod
+    def _write_chunks(chunks, f):
+        written = 0
+        try:
+            for chunk in chunks:
+                f.write(chunk)
+                written += len(chunk)
+        finally:
+            chunks.close()
+        return written
+
     def directory_wait(
         self,
         path,
@@ -368,6 +704,262 @@ class ArtifactManager(BaseManager, RequireParamMixin):
 
         return directory_zip
 
+    def directories_wait(
+        self,
+        paths,
+        timeout=60,
+        backoff=0.4,
+        max_wait=4,
+        workers=4,
+        pipeline_name=None,
+        pipeline_counter=None,
+        stage_name=None,
+        stage_counter=None,
+        job_name=None,
+    ):
+        """
+        Gets many artifact directories by their paths, waiting for them
+        to be available.
+
+        Unlike calling :meth:`directory_wait` for each directory, requests
+        for all directories are sent up front, so the server compresses them
+        at the same time. After that directories, which are not ready yet,
+        are polled concurrently, each one with its own exponential backoff,
+        and zip files are returned as soon as they are available.
+
+        :param paths: list of paths to directories.
+        :param timeout: timeout in seconds to wait for each directory.
+        :param backoff: backoff value.
+        :param max_wait: maximum wait amount.
+        :param workers: number of requests to send in parallel.
+        :param pipeline_name: name of the pipeline.
+        :param pipeline_counter: pipeline counter.
+        :param stage_name: name of the stage.
+        :param stage_counter: stage counter.
+        :param job_name: name of the job.
+        :return: iterator over tuples of the path and the directory contents
+        in the form of a zip file, in order of readiness. Contents is ``None``
+        if the directory wasn't available within timeout.
+        :rtype: collections.Iterator[(str, bytes)]
+        """
+        func_args = locals()
+        parameters = {p: self._require_param(p, func_args) for p in self.PATH_PARAMETERS}
+
+        return self._directories_wait(list(paths), timeout, backoff, max_wait, workers, parameters)
+
+    def _directories_wait(self, paths, timeout, backoff, max_wait, workers, parameters):
+        if not paths:
+            return
+
+        start_time = time.time()
+        completed = queue.Queue()
+
+        def poll(index, attempt):
+            self._poll_directory(completed, paths[index], index, attempt, parameters)
+
+        # heap of (time, index, attempt) for directories, which are not ready yet
+        scheduled = list()
+        pending = len(paths)
+
+        pool = ThreadPool(max(min(workers, len(paths)), 1))
+        try:
+            for index in range(len(paths)):
+                pool.apply_async(poll, (index, 0))
+
+            while pending:
+                now = time.time()
+                self._dispatch_due(pool, poll, scheduled, now)
+
+                if len(scheduled) == pending:
+                    # nothing is in flight, just wait for the next poll
+                    time.sleep(scheduled[0][0] - now)
+                    continue
+
+                try:
+                    result = completed.get(timeout=scheduled[0][0] - now if scheduled else None)
+                except queue.Empty:
+                    continue
+
+                index, _, directory_zip, _ = result
+                if self._poll_completed(result, scheduled, time.time() - start_time, timeout, backoff, max_wait):
+                    pending -= 1
+                    yield paths[index], directory_zip
+        finally:
+            pool.close()
+
+    def _poll_directory(self, completed, path, index, attempt, parameters):
+        """
+        Requests the directory and puts the result of the poll to the queue.
+
+        :param completed: queue of tuples of the index, attempt, directory contents and error of the poll.
+        :param path: path to the directory.
+        """
+        try:
+            completed.put((index, attempt, self.directory(path, **parameters), None))
+        except Exception as e:  # noqa
+            completed.put((index, attempt, None, e))
+
+    @staticmethod
+    def _dispatch_due(pool, poll, scheduled, now):
+        """
+        Sends polls for the directories, which are due at the given time.
+
+        :param scheduled: heap of (time, index, attempt) for directories, which are not ready yet.
+        :param now: current time.
+        """
+        while scheduled and scheduled[0][0] <= now:
+            _, index, attempt = heapq.heappop(scheduled)
+            pool.apply_async(poll, (index, attempt))
+
+    @staticmethod
+    def _poll_completed(result, scheduled, time_elapsed, timeout, backoff, max_wait):
+        """
+        Handles the completed poll of a directory, scheduling the next
+        poll with exponential backoff if the directory is not ready yet.
+
+        :param result: tuple of the index, attempt, directory contents and error of the poll.
+        :param scheduled: heap of (time, index, attempt) for directories, which are not ready yet.
+        :param time_elapsed: time in seconds since the first poll.
+        :return: whether the directory is done, either ready or timed out.
+        :rtype: bool
+        """
+        index, attempt, directory_zip, error = result
+        if error is not None:
+            raise error
+
+        delay = min(backoff * (2 ** attempt), max_wait)
+        if directory_zip is not None or time_elapsed + delay >= timeout:
+            return True
+
+        heapq.heappush(scheduled, (time.time() + delay, index, attempt + 1))
+        return False
+
+    def download_tree(
+        self,
+        top,
+        destination,
+        workers=4,
+        chunk_size=CHUNK_SIZE,
+        pipeline_name=None,
+        pipeline_counter=None,
+        stage_name=None,
+        stage_counter=None,
+        job_name=None,
+    ):
+        """
+        Downloads all files under given artifact folder to the local
+        directory, preserving layout of the sub-folders.
+
+        Files are downloaded in parallel by a pool of `workers` threads,
+        so it makes sense to have `pool_maxsize` option of the client not
+        less than number of workers.
+
+        Files, which already exist locally, are not downloaded again, if
+        their MD5 checksum matches the one published by the server in
+        `cruise-output/md5.checksum`. If there is no checksum for a file,
+        size of the local file is compared with the remote one.
+
+        :param top: path to the artifact folder, '/' to download all artifacts of the job.
+        :param destination: path to the local directory.
+        :param workers: number of files to download in parallel.
+        :param chunk_size: size of the chunks in bytes to read from network.
+        :param pipeline_name: name of the pipeline.
+        :param pipeline_counter: pipeline counter.
+        :param stage_name: name of the stage.
+        :param stage_counter: stage counter.
+        :param job_name: name of the job.
+        :return: dictionary with number of downloaded and skipped files,
+        number of downloaded bytes, elapsed time in seconds and throughput in bytes per second.
+        :rtype: dict
+        """
+        start_time = time.time()
+
+        tree = self.tree(
+            pipeline_name=pipeline_name,
+            pipeline_counter=pipeline_counter,
+            stage_name=stage_name,
+            stage_counter=stage_counter,
+            job_name=job_name
+        )
+        checksums = self._checksums(tree)
+
+        top = top.rstrip(Artifact.SEP)
+        files = list()
+        for root, folders, children in tree.walk(top=top or Artifact.SEP, topdown=True):
+            _makedirs(self._local_path(destination, top, root))
+            files.extend(children)
+
+        def download(artifact):
+            local_path = self._local_path(destination, top, artifact.path)
+            if self._is_up_to_date(artifact, local_path, checksums):
+                return None
+            return self._download(url=artifact.data.url, destination=local_path, chunk_size=chunk_size)
+
+        pool = ThreadPool(max(min(workers, len(files)), 1))
+        try:
+            results = pool.map(download, files)
+        finally:
+            pool.close()
+
+        downloaded = [size for size in results if size is not None]
+        elapsed = time.time() - start_time
+
+        return dict(
+            downloaded=len(downloaded),
+            skipped=len(results) - len(downloaded),
+            bytes=sum(downloaded),
+            seconds=elapsed,
+            throughput=sum(downloaded) / elapsed if elapsed else 0.0,
+        )
+
+    def _checksums(self, tree):
+        """
+        Method for getting MD5 checksums of the artifacts, published by the server.
+
+        :param tree: tree of the artifacts, obtained from `tree` method.
+        :return: dictionary of artifact path to MD5 hex digest.
+        :rtype: dict
+        """
+        checksum = tree.get(self.CHECKSUM_PATH)
+        if checksum is None or checksum.data.type != self.FILE_TYPE:
+            return dict()
+        content = self._session.get(checksum.data.url).text
+
+        checksums = dict()
+        for line in content.splitlines():
+            line = line.strip()
+            if not line or line[0] in '#!' or '=' not in line:
+                continue
+            path, checksum = line.split('=', 1)
+            # keys are written in java properties format, where some characters are escaped
+            path = path.replace('\\:', ':').replace('\\=', '=').replace('\\ ', ' ')
+            checksums[Artifact.SEP + path.strip().lstrip(Artifact.SEP)] = checksum.strip().lower()
+
+        return checksums
+
+    def _is_up_to_date(self, artifact, local_path, checksums):
+        if not os.path.isfile(local_path):
+            return False
+
+        checksum = checksums.get(artifact.path)
+        if checksum is not None:
+            return _md5(local_path) == checksum
+
+        response = self._session.request('HEAD', artifact.data.url)
+        size = response.headers.get('Content-Length')
+        return size is not None and size.isdigit() and int(size) == os.path.getsize(local_path)
+
+    @staticmethod
+    def _local_path(destination, top, path):
+        relative = path[len(top):].strip(Artifact.SEP)
+        local_path = os.path.join(destination, *relative.split(Artifact.SEP)) if relative else destination
+
+        root = os.path.abspath(destination)
+        if os.path.commonprefix([os.path.abspath(local_path) + os.sep, root + os.sep]) != root + os.sep:
+            raise YagocdException("Artifact path '{}' points outside of '{}'!".format(path, destination))
+
+        return local_path
+
     def create(
         self,
         path,
@@ -396,16 +988,15 @@ class ArtifactManager(BaseManager, RequireParamMixin):
         func_args = locals()
         parameters = {p: self._require_param(p, func_args) for p in self.PATH_PARAMETERS}
 
-        response = self._session.post(
-            path=self._session.urljoin(self.RESOURCE_PATH, path).format(base_api=self.base_api, **parameters),
-            files={'file': open(filename, 'rb')},
+        return self._upload(
+            method='post',
+            url=self._session.urljoin(self.RESOURCE_PATH, path).format(base_api=self.base_api, **parameters),
+            filename=filename,
             headers={
                 'Confirm': 'true'
             },
         )
 
-        return response.text
-
     def append(
         self,
         path,
@@ -434,11 +1025,100 @@ class ArtifactManager(BaseManager, RequireParamMixin):
         func_args = locals()
         parameters = {p: self._require_param(p, func_args) for p in self.PATH_PARAMETERS}
 
-        response = self._session.put(
-            path=self._session.urljoin(self.RESOURCE_PATH, path).format(base_api=self.base_api, **parameters),
-            files={'file': open(filename, 'rb')}
+        return self._upload(
+            method='put',
+            url=self._session.urljoin(self.RESOURCE_PATH, path).format(base_api=self.base_api, **parameters),
+            filename=filename
         )
 
+    def upload(
+        self,
+        source,
+        path='',
+        workers=4,
+        pipeline_name=None,
+        pipeline_counter=None,
+        stage_name=None,
+        stage_counter=None,
+        job_name=None,
+    ):
+        """
+        Uploads many local files as artifacts.
+
+        If `source` is a directory, all files in it are uploaded, preserving
+        layout of the sub-directories. Otherwise `source` should be a list of
+        files, which are uploaded directly under `path`.
+
+        Files are uploaded in parallel by a pool of `workers` threads. Content
+        of each file is read from disk while it's being sent, so files are
+        never loaded into memory as a whole.
+
+        :param source: path to the local directory or list of paths to the local files.
+        :param path: path to the directory within job directory.
+        :param workers: number of files to upload in parallel.
+        :param pipeline_name: name of the pipeline.
+        :param pipeline_counter: pipeline counter.
+        :param stage_name: name of the stage.
+        :param stage_counter: stage counter.
+        :param job_name: name of the job.
+        :return: list of dictionaries for each file, with keys `filename` and
+        `path` for local and remote paths, `result` for acknowledgement of the
+        server and `error` for exception, if upload of the file has failed.
+        :rtype: list of dict
+        """
+        func_args = locals()
+        parameters = {p: self._require_param(p, func_args) for p in self.PATH_PARAMETERS}
+
+        if isinstance(source, string_types):
+            uploads = list()
+            for root, _, filenames in os.walk(source):
+                relative = os.path.relpath(root, source).replace(os.sep, Artifact.SEP)
+                for name in sorted(filenames):
+                    remote = name if relative == os.curdir else Artifact.SEP.join([relative, name])
+                    uploads.append((os.path.join(root, name), remote))
+        else:
+            uploads = [(filename, os.path.basename(filename)) for filename in source]
+
+        # names of the files could contain braces, so they are joined after formatting
+        base_url = self.RESOURCE_PATH.format(base_api=self.base_api, **parameters)
+
+        def upload(item):
+            filename, remote = item
+            remote = self._session.urljoin(path, remote).lstrip(Artifact.SEP) if path else remote
+
+            result = dict(filename=filename, path=remote, result=None, error=None)
+            try:
+                result['result'] = self._upload(
+                    method='post',
+                    url=self._session.urljoin(base_url, quote(remote, safe=Artifact.SEP)),
+                    filename=filename,
+                    headers={
+                        'Confirm': 'true'
+                    },
+                )
+            except Exception as e:  # noqa
+                # failure of one file shouldn't stop uploading of the others
+                result['error'] = e
+            return result
+
+        if not uploads:
+            return list()
+
+        pool = ThreadPool(max(min(workers, len(uploads)), 1))
+        try:
+            return pool.map(upload, uploads)
+        finally:
+            pool.close()
+
+    def _upload(self, method, url, filename, headers=None):
+        with open(filename, 'rb') as f:
+            body = _MultipartFile(field='file', filename=filename, f=f)
+
+            headers = dict(headers or {})
+            headers['Content-Type'] = body.content_type
+
+            response = self._session.request(method=method, path=url, data=body, headers=headers)
+
         return response.text
 
 
@@ -453,30 +1133,69 @@ class Artifact(Base):
 
     PART_COUNT = 5
 
-    def __init__(self, session, data):
-        super(Artifact, self).__init__(session, data)
+    __slots__ = (
+        '_tree', '_children', '_pipeline_name', '_pipeline_counter', '_stage_name', '_stage_counter', '_job_name',
+        '_path', '_artifact_manager',
+    )
 
-        base = self._session.urljoin(self._session.server_url, self._session._options['context_path'], 'files')
-        parts = self.data.url.replace(base, '').strip(self.SEP).split(self.SEP, self.PART_COUNT)
+    def __init__(self, session, data, parent=None):
+        """
+        :param session: session object from client.
+        :type session: yagocd.session.Session.
+        :param data: data of the artifact.
+        :param parent: folder artifact, containing this one. Children share
+        data, job parameters and manager of the parent, so they are not
+        copied or parsed from url again.
+        :type parent: yagocd.resources.artifact.Artifact
+        """
+        if parent is None:
+            super(Artifact, self).__init__(session, data)
+        else:
+            # data is an item of the parent's files, which is already wrapped
+            super(Artifact, self).__init__(session, None)
+            self._data = data
+
+        self._tree = None
+        self._children = None
+
+        if parent is not None and self.data.url.startswith(parent.data.url.rstrip(self.SEP) + self.SEP):
+            self._pipeline_name = parent.pipeline_name
+            self._pipeline_counter = parent.pipeline_counter
+            self._stage_name = parent.stage_name
+            self._stage_counter = parent.stage_counter
+            self._job_name = parent.job_name
+
+            self._path = parent.path.rstrip(self.SEP) + self.data.url[len(parent.data.url.rstrip(self.SEP)):]
+            self._artifact_manager = parent._manager
+        else:
+            base = self._session.urljoin(self._session.server_url, self._session._options['context_path'], 'files')
+            parts = self.data.url.replace(base, '').strip(self.SEP).split(self.SEP, self.PART_COUNT)
 
-        self._pipeline_name = parts[0]
-        self._pipeline_counter = parts[1]
-        self._stage_name = parts[2]
-        self._stage_counter = parts[3]
-        self._job_name = parts[4]
+            self._pipeline_name = parts[0]
+            self._pipeline_counter = parts[1]
+            self._stage_name = parts[2]
+            self._stage_counter = parts[3]
+            self._job_name = parts[4]
+
+            self._path = self.SEP + parts[5]
+
+            self._artifact_manager = None
 
-        self._path = self.SEP + parts[5]
         if self.data.type == ArtifactManager.FOLDER_TYPE and not self._path.endswith(self.SEP):
             self._path += self.SEP
 
-        self._manager = ArtifactManager(
-            session=session,
-            pipeline_name=self._pipeline_name,
-            pipeline_counter=self._pipeline_counter,
-            stage_name=self._stage_name,
-            stage_counter=self._stage_counter,
-            job_name=self._job_name
-        )
+    @property
+    def _manager(self):
+        if self._artifact_manager is None:
+            self._artifact_manager = ArtifactManager(
+                session=self._session,
+                pipeline_name=self._pipeline_name,
+                pipeline_counter=self._pipeline_counter,
+                stage_name=self._stage_name,
+                stage_counter=self._stage_counter,
+                job_name=self._job_name
+            )
+        return self._artifact_manager
 
     def __str__(self):
         return self.__repr__()
@@ -512,10 +1231,31 @@ class Artifact(Base):
     def path(self):
         return self._path
 
+    @property
+    def children(self):
+        """
+        Property for getting nested artifacts of the folder.
+
+        :return: list of nested artifacts or ``None`` for file type.
+        :rtype: list[yagocd.resources.artifact.Artifact]
+        """
+        if self.data.type != ArtifactManager.FOLDER_TYPE:
+            return None
+
+        if self._children is None:
+            self._children = [
+                Artifact(session=self._session, data=data, parent=self)
+                for data in self.data.get(ArtifactManager.FILES_FIELD, [])
+            ]
+        return self._children
+
     def walk(self, topdown=True):
         """
         Artifact tree generator - analogue of `os.walk`.
 
+        If the artifact is part of :class:`ArtifactTree`, the tree is
+        walked without requesting artifacts from the server again.
+
         :param topdown: if is True or not specified, directories are scanned
         from top-down. If topdown is set to False, directories are scanned
         from bottom-up.
@@ -523,6 +1263,8 @@ class Artifact(Base):
             (str, list[yagocd.resources.artifact.Artifact], list[yagocd.resources.artifact.Artifact])
         ]
         """
+        if self._tree is not None:
+            return self._tree.walk(top=self._path, topdown=topdown)
         return self._manager.walk(top=self._path, topdown=topdown)
 
     def fetch(self):
@@ -532,8 +1274,224 @@ class Artifact(Base):
 
         :return: content of the artifact.
         """
-        if self.data.type == self._manager.FOLDER_TYPE:
-            raise YagocdException("Can't fetch folder <{}>, only file!".format(self._path))
+        self._require_file()
 
         response = self._session.get(self.data.url)
         return response.content
+
+    def download(self, destination, chunk_size=ArtifactManager.CHUNK_SIZE, progress=None, resume=False, segments=1):
+        """
+        Method for downloading artifact's content to the given destination
+        without loading it into memory.
+        Could only be applicable for file type.
+
+        :param destination: path to the local file or file object opened for writing in binary mode.
+        :param chunk_size: size of the chunks in bytes to read from network.
+        :param progress: callable, which is called after each chunk with
+        two arguments: number of downloaded bytes and total size (``None`` if unknown).
+        :param resume: continue download of the temporary file, left by the previous attempt.
+        :param segments: number of byte ranges to split the file into and download in parallel.
+        :return: number of written bytes.
+        """
+        self._require_file()
+        return self._manager._download(
+            url=self.data.url,
+            destination=destination,
+            chunk_size=chunk_size,
+            progress=progress,
+            resume=resume,
+            segments=segments
+        )
+
+    def stream(self, chunk_size=ArtifactManager.CHUNK_SIZE, progress=None):
+        """
+        Method for getting artifact's content as an iterator over chunks.
+        Could only be applicable for file type.
+
+        :param chunk_size: size of the chunks in bytes to read from network.
+        :param progress: callable, which is called after each chunk with
+        two arguments: number of downloaded bytes and total size (``None`` if unknown).
+        :rtype: collections.Iterator[bytes]
+        """
+        self._require_file()
+        return self._manager._stream(url=self.data.url, chunk_size=chunk_size, progress=progress)
+
+    def _require_file(self):
+        if self.data.type == self._manager.FOLDER_TYPE:
+            raise YagocdException("Can't fetch folder <{}>, only file!".format(self._path))
+
+
+class ArtifactTree(object):
+    """
+    Tree of artifacts of a job, indexed by path.
+
+    The tree is built once from the list of top level artifacts, after
+    that looking up artifact by path and getting children of a folder
+    take constant time.
+    """
+
+    def __init__(self, artifacts):
+        """
+        :param artifacts: list of top level artifacts, obtained from
+        :meth:`ArtifactManager.list` method.
+        :type artifacts: list[yagocd.resources.artifact.Artifact]
+        """
+        self._artifacts = artifacts
+        self._index = dict()
+
+        stack = list(artifacts)
+        while stack:
+            artifact = stack.pop()
+            artifact._tree = self
+            self._index[artifact.path.rstrip(Artifact.SEP)] = artifact
+            stack.extend(artifact.children or [])
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, path):
+        return self.get(path) is not None
+
+    def __getitem__(self, path):
+        artifact = self.get(path)
+        if artifact is None:
+            raise KeyError(path)
+        return artifact
+
+    @property
+    def artifacts(self):
+        """
+        Top level artifacts of the job.
+
+        :rtype: list[yagocd.resources.artifact.Artifact]
+        """
+        return self._artifacts
+
+    def get(self, path, default=None):
+        """
+        Gets artifact by its path.
+
+        :param path: path to the artifact, e.g. `/cruise-output/console.log`.
+        Trailing slash for folders is optional.
+        :param default: value to return, if there is no such artifact.
+        :rtype: yagocd.resources.artifact.Artifact
+        """
+        if not path:
+            return default
+        return self._index.get(path.rstrip(Artifact.SEP) or Artifact.SEP, default)
+
+    def children(self, path):
+        """
+        Gets nested artifacts of the folder by its path.
+
+        :param path: path to the folder, '/' for the top level artifacts.
+        :return: nested artifacts or ``None`` if the path points to a file.
+        :rtype: list[yagocd.resources.artifact.Artifact]
+        """
+        if not path or path == Artifact.SEP:
+            return self._artifacts
+
+        artifact = self.get(path)
+        if artifact is None:
+            raise ValueError("Can't find requested path '{path}' in the given artifacts '{artifacts}'!".format(
+                path=path, artifacts=self._artifacts)
+            )
+        return artifact.children
+
+    def walk(self, top='/', topdown=True):
+        """
+        Artifact tree generator - analogue of `os.walk`.
+
+        :param top: root path, from which traversal would be started.
+        :param topdown: if is True or not specified, directories are scanned
+        from top-down. If topdown is set to False, directories are scanned
+        from bottom-up.
+        :rtype: collections.Iterator[
+            (str, list[yagocd.resources.artifact.Artifact], list[yagocd.resources.artifact.Artifact])
+        ]
+        """
+        children = self.children(top)
+        if children is None:
+            return
+
+        folders = list()
+        files = list()
+        for artifact in children:
+            artifact_type = artifact.data.get(ArtifactManager.TYPE_FIELD)
+            if artifact_type == ArtifactManager.FOLDER_TYPE:
+                folders.append(artifact)
+            elif artifact_type == ArtifactManager.FILE_TYPE:
+                files.append(artifact)
+            else:
+                raise ValueError("Unknown artifact type '{}'!".format(artifact_type))
+
+        if topdown:
+            yield top, folders, files
+        for folder in folders:
+            new_path = Session.urljoin(top, folder.data.get(ArtifactManager.NAME_FIELD))
+
+            for x in self.walk(new_path, topdown):
+                yield x
+
+        if not topdown:
+            yield top, folders, files
+
+
+class _MultipartFile(object):
+    """
+    File-like object, which produces `multipart/form-data` body with a
+    single file field. Content of the file is read only when the body is
+    being sent, and the length of the body is known in advance, so it's
+    sent with `Content-Length` header rather than in chunks.
+    """
+
+    def __init__(self, field, filename, f):
+        self.boundary = uuid.uuid4().hex
+
+        head = (
+            '--{boundary}\r\n'
+            'Content-Disposition: form-data; name="{field}"; filename="{name}"\r\n'
+            'Content-Type: application/octet-stream\r\n'
+            '\r\n'
+        ).format(boundary=self.boundary, field=field, name=os.path.basename(filename).replace('"', '%22'))
+        tail = '\r\n--{boundary}--\r\n'.format(boundary=self.boundary)
+
+        self._parts = [BytesIO(head.encode('utf-8')), f, BytesIO(tail.encode('utf-8'))]
+        self._length = len(head.encode('utf-8')) + os.fstat(f.fileno()).st_size + len(tail)
+
+    @property
+    def content_type(self):
+        return 'multipart/form-data; boundary={}'.format(self.boundary)
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        result = b''
+        while self._parts and (size is None or size < 0 or len(result) < size):
+            chunk = self._parts[0].read(-1 if size is None or size < 0 else size - len(result))
+            if not chunk:
+                self._parts.pop(0)
+                continue
+            result += chunk
+        return result
+
+
+# `os.rename` doesn't overwrite existing files on Windows
+_replace = getattr(os, 'replace', os.rename)
+
+
+def _makedirs(path):
+    try:
+        os.makedirs(path)
+    except OSError:
+        if not os.path.isdir(path):
+            raise
+
+
+def _md5(path, chunk_size=ArtifactManager.CHUNK_SIZE):
+    md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            md5.update(chunk)
+    return md5.hexdigest()
@@ -26,10 +26,11 @@
 #
 ###############################################################################
 
+from yagocd.frame import HistoryFrame
 from yagocd.resources import Base, BaseManager
 from yagocd.resources.artifact import ArtifactManager
 from yagocd.resources.property import PropertyManager
-from yagocd.util import RequireParamMixin, since
+from yagocd.util import RequireParamMixin, since, YagocdUtil
 
 
 @since('14.3.0')
@@ -108,6 +109,28 @@ class JobManager(BaseManager, RequireParamMixin):
 
         return instances
 
+    def history_frame(self, pipeline_name=None, stage_name=None, job_name=None, prefetch=None):
+        """
+        Get full history of specific job in columnar form for analysis.
+
+        :versionadded: 14.3.0.
+
+        :param pipeline_name: pipeline name.
+        :param stage_name: stage name.
+        :param job_name: job name.
+        :param prefetch: number of pages to request ahead in parallel,
+        by default the value of `history_prefetch` option is used.
+        :rtype: yagocd.frame.HistoryFrame
+        """
+        if prefetch is None:
+            prefetch = self._session._options['history_prefetch']
+
+        instances = YagocdUtil.paginate(
+            fetch=lambda offset: self.history(pipeline_name, stage_name, job_name, offset),
+            prefetch=prefetch
+        )
+        return HistoryFrame(HistoryFrame.JOB, instances)
+
 
 class JobInstance(Base):
     """
@@ -126,6 +149,8 @@ class JobInstance(Base):
     could implement those magic methods as needed.
     """
 
+    __slots__ = ('_stage',)
+
     def __init__(self, session, data, stage):
         super(JobInstance, self).__init__(session, data)
         self._stage = stage
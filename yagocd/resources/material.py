@@ -173,4 +173,4 @@ class MaterialEntity(Base):
 
 
 class ModificationEntity(BaseNode):
-    pass
+    __slots__ = ()
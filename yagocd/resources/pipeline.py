@@ -31,11 +31,13 @@ from distutils.version import LooseVersion
 
 from easydict import EasyDict
 
+from yagocd.decoder import iter_array
+from yagocd.frame import HistoryFrame
 from yagocd.resources import BaseManager, BaseNode
 from yagocd.resources.material import ModificationEntity
 from yagocd.resources.pipeline_config import PipelineConfigManager
 from yagocd.resources.stage import StageInstance
-from yagocd.util import since, YagocdUtil
+from yagocd.util import LazyDict, since, YagocdUtil
 
 
 @since('14.3.0')
@@ -54,6 +56,14 @@ class PipelineManager(BaseManager):
     RESOURCE_PATH = '{base_api}/pipelines/{name}'
     VSM_RESOURCE_PATH = '{base_api}/pipelines/value_stream_map/{name}'
 
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, session):
+        super(PipelineManager, self).__init__(session)
+
+        self._index = None
+        self._index_time = None
+
     def __iter__(self):
         """
         Method add iterator protocol for the manager.
@@ -103,23 +113,77 @@ class PipelineManager(BaseManager):
         # build pipeline graph to link related nodes
         return YagocdUtil.build_graph(
             nodes=pipelines,
-            dependencies=lambda parent: [material for material in parent.data.materials],
-            compare=lambda candidate, child: candidate.description == child.data.name
+            dependencies=lambda parent: parent.data.materials,
+            key=lambda node: node.data.name,
+            dependency_key=lambda material: material.description
+        )
+
+    @since('14.3.0')  # noqa
+    def stream(self, chunk_size=CHUNK_SIZE):
+        """
+        Iterate over all available pipelines, decoding them while the list is received.
+
+        :versionadded: 14.3.0.
+
+        Unlike :meth:`list`, the whole response is never kept in memory:
+        it's decoded group by group, so on servers with a lot of pipelines
+        memory usage is bounded by the size of the largest group.
+        As pipelines are returned before all of them are known, they are
+        not linked together, so their `predecessors` and `descendants`
+        are empty.
+
+        :param chunk_size: number of bytes to read from the response at once.
+        :return: generator of pipelines.
+        :rtype: collections.Iterator[yagocd.resources.pipeline.PipelineEntity]
+        """
+        response = self._session.get(
+            path=self.GROUPS_RESOURCE_PATH.format(base_api=self.base_api),
+            headers={'Accept': 'application/json'},
+            stream=True,
         )
 
-    def find(self, name):
+        try:
+            for group in iter_array(response.iter_content(chunk_size=chunk_size)):
+                for data in group['pipelines']:
+                    yield PipelineEntity(
+                        session=self._session,
+                        data=data,
+                        group=group['name']
+                    )
+        finally:
+            response.close()
+
+    def find(self, name, refresh=False):
         """
         Finds pipeline by it's name.
 
         :versionadded: 14.3.0.
 
+        Pipelines are looked up in the index by name, which is built from
+        the result of :meth:`list`. The index is rebuilt when it's older
+        than `pipelines_index_ttl` option (by default it's rebuilt on each
+        call) or when `refresh` is requested.
+
         :param name: name of required pipeline.
+        :param refresh: rebuild the index regardless of it's age.
         :return: if found - pipeline :class:`yagocd.resources.pipeline.PipelineEntity`, otherwise ``None``.
         :rtype: yagocd.resources.pipeline.PipelineEntity
         """
-        for pipeline in self.list():
-            if pipeline.data.name == name:
-                return pipeline
+        return self._name_index(refresh=refresh).get(name)
+
+    def _name_index(self, refresh=False):
+        """
+        Method for getting index of pipelines by their names.
+
+        :param refresh: rebuild the index regardless of it's age.
+        :rtype: dict[str, yagocd.resources.pipeline.PipelineEntity]
+        """
+        ttl = self._session._options['pipelines_index_ttl']
+        if refresh or self._index is None or time.time() - self._index_time >= ttl:
+            self._index = dict((pipeline.data.name, pipeline) for pipeline in self.list())
+            self._index_time = time.time()
+
+        return self._index
 
     def history(self, name, offset=0):
         """
@@ -145,7 +209,7 @@ class PipelineManager(BaseManager):
 
         return instances
 
-    def full_history(self, name):
+    def full_history(self, name, prefetch=None):
         """
         Method for accessing full history of specific pipeline.
 
@@ -153,17 +217,28 @@ class PipelineManager(BaseManager):
 
         It yields each instance and after one chunk is over moves to the next one.
         :param name: name of the pipeline.
+        :param prefetch: number of pages to request ahead in parallel,
+        by default the value of `history_prefetch` option is used.
         :return: an array of pipeline instances :class:`yagocd.resources.pipeline.PipelineInstance`.
         :rtype: list of yagocd.resources.pipeline.PipelineInstance
         """
-        offset = 0
-        instances = self.history(name, offset)
-        while instances:
-            for instance in instances:
-                yield instance
+        if prefetch is None:
+            prefetch = self._session._options['history_prefetch']
+
+        return YagocdUtil.paginate(fetch=lambda offset: self.history(name, offset), prefetch=prefetch)
+
+    def history_frame(self, name, prefetch=None):
+        """
+        Get full history of specific pipeline in columnar form for analysis.
 
-            offset += len(instances)
-            instances = self.history(name, offset)
+        :versionadded: 14.3.0.
+
+        :param name: name of the pipeline.
+        :param prefetch: number of pages to request ahead in parallel,
+        by default the value of `history_prefetch` option is used.
+        :rtype: yagocd.frame.HistoryFrame
+        """
+        return HistoryFrame(HistoryFrame.PIPELINE, self.full_history(name, prefetch=prefetch))
 
     def last(self, name):
         """
@@ -356,7 +431,7 @@ class PipelineManager(BaseManager):
             headers={'Accept': 'application/json'},
         )
 
-        data = EasyDict(response.json())
+        data = LazyDict(response.json())
 
         nodes = list()
         dependencies = dict()
@@ -403,7 +478,7 @@ class PipelineManager(BaseManager):
         return YagocdUtil.build_graph(
             nodes=nodes,
             dependencies=lambda parent: dependencies[parent.data.id],
-            compare=lambda candidate, child: candidate == child.data.id
+            key=lambda node: node.data.id
         )
 
 
@@ -413,10 +488,18 @@ class PipelineEntity(BaseNode):
     Executing ``history`` will return pipeline instances.
     """
 
+    __slots__ = ('_group', '_pipeline_manager')
+
     def __init__(self, session, data, group=None):
         super(PipelineEntity, self).__init__(session, data)
         self._group = group
-        self._pipeline = PipelineManager(session=session)
+        self._pipeline_manager = None
+
+    @property
+    def _pipeline(self):
+        if self._pipeline_manager is None:
+            self._pipeline_manager = PipelineManager(session=self._session)
+        return self._pipeline_manager
 
     def __iter__(self):
         """
@@ -491,6 +574,15 @@ class PipelineEntity(BaseNode):
         """
         return self._pipeline.full_history(name=self.data.name)
 
+    def history_frame(self, prefetch=None):
+        """
+        Get full history of the pipeline in columnar form for analysis.
+
+        :param prefetch: number of pages to request ahead in parallel.
+        :rtype: yagocd.frame.HistoryFrame
+        """
+        return self._pipeline.history_frame(name=self.data.name, prefetch=prefetch)
+
     def last(self):
         """
         Get last pipeline instance.
@@ -598,9 +690,17 @@ class PipelineInstance(BaseNode):
     Pipeline instance represents concrete execution of specific pipeline.
     """
 
+    __slots__ = ('_pipeline_manager',)
+
     def __init__(self, session, data):
         super(PipelineInstance, self).__init__(session, data)
-        self._manager = PipelineManager(session=session)
+        self._pipeline_manager = None
+
+    @property
+    def _manager(self):
+        if self._pipeline_manager is None:
+            self._pipeline_manager = PipelineManager(session=self._session)
+        return self._pipeline_manager
 
     def __iter__(self):
         """
@@ -25,9 +25,10 @@
 # THE SOFTWARE.
 #
 ###############################################################################
+from yagocd.frame import HistoryFrame
 from yagocd.resources import Base, BaseManager
 from yagocd.resources.job import JobInstance
-from yagocd.util import RequireParamMixin, since
+from yagocd.util import RequireParamMixin, since, YagocdUtil
 
 
 @since('14.3.0')
@@ -181,24 +182,39 @@ class StageManager(BaseManager, RequireParamMixin):
 
         return instances
 
-    def full_history(self, pipeline_name=None, stage_name=None):
+    def full_history(self, pipeline_name=None, stage_name=None, prefetch=None):
         """
         The stage history allows users to list stage instances of specified stage.
 
         This method uses generator to get full stage history.
         :param pipeline_name: pipeline name.
         :param stage_name: stage name.
+        :param prefetch: number of pages to request ahead in parallel,
+        by default the value of `history_prefetch` option is used.
         :return: an array of stage instances :class:`yagocd.resources.stage.StageInstance`.
         :rtype: list of yagocd.resources.stage.StageInstance
         """
-        offset = 0
-        instances = self.history(pipeline_name, stage_name, offset)
-        while instances:
-            for instance in instances:
-                yield instance
+        if prefetch is None:
+            prefetch = self._session._options['history_prefetch']
 
-            offset += len(instances)
-            instances = self.history(pipeline_name, stage_name, offset)
+        return YagocdUtil.paginate(
+            fetch=lambda offset: self.history(pipeline_name, stage_name, offset),
+            prefetch=prefetch
+        )
+
+    def history_frame(self, pipeline_name=None, stage_name=None, prefetch=None):
+        """
+        Get full history of specific stage in columnar form for analysis.
+
+        :versionadded: 14.3.0.
+
+        :param pipeline_name: pipeline name.
+        :param stage_name: stage name.
+        :param prefetch: number of pages to request ahead in parallel,
+        by default the value of `history_prefetch` option is used.
+        :rtype: yagocd.frame.HistoryFrame
+        """
+        return HistoryFrame(HistoryFrame.STAGE, self.full_history(pipeline_name, stage_name, prefetch=prefetch))
 
     def last(self, pipeline_name=None, stage_name=None):
         """
@@ -218,11 +234,19 @@ class StageInstance(Base):
     Class representing instance of specific stage.
     """
 
+    __slots__ = ('_pipeline', '_stage_manager')
+
     def __init__(self, session, data, pipeline):
         super(StageInstance, self).__init__(session, data)
         self._pipeline = pipeline
 
-        self._manager = StageManager(session=self._session)
+        self._stage_manager = None
+
+    @property
+    def _manager(self):
+        if self._stage_manager is None:
+            self._stage_manager = StageManager(session=self._session)
+        return self._stage_manager
 
     def __iter__(self):
         """
@@ -42,6 +42,10 @@ class VersionManager(BaseManager):
     """
 
     def get(self):
+        return self._get()
+
+    def _get(self):
+        # not guarded by `since`, because it's used to determine the version of the server
         response = self._session.get(
             path='{base_api}/version'.format(base_api=self.base_api)
         )
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+import email.utils
+import random
+import time
+
+
+class RetryPolicy(object):
+    """
+    Policy for retrying failed requests.
+
+    Request is retried in case of connection error (e.g. connection reset by
+    the server) or when response status is one of `statuses` -- by default
+    those are `502 Bad Gateway`, `503 Service Unavailable` and
+    `504 Gateway Timeout`, which GoCD and proxies in front of it return
+    under load.
+
+    Delay between attempts grows exponentially and is randomized with
+    "full jitter", so multiple clients don't hammer the server at the same
+    moments. If server responded with `Retry-After` header, it's value
+    is used instead.
+
+    Only idempotent methods, that don't change anything on the server, are
+    retried by default. Notice, that `PUT` is not in the default list: GoCD
+    uses it for appending to artifacts, which is not idempotent.
+
+    Policy could be set for the whole client using `retry` option or for
+    specific manager using it's `retry` property::
+
+        client = Yagocd(options={'retry': RetryPolicy(total=5, deadline=60)})
+        client.agents.retry = RetryPolicy(total=10)
+    """
+
+    DEFAULT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+    DEFAULT_STATUSES = frozenset([502, 503, 504])
+
+    def __init__(
+        self,
+        total=3,
+        backoff=0.5,
+        max_backoff=30,
+        deadline=None,
+        methods=DEFAULT_METHODS,
+        statuses=DEFAULT_STATUSES,
+        respect_retry_after=True,
+        jitter=True
+    ):
+        """
+        :param total: maximum number of retries (not counting the first attempt).
+        :param backoff: base delay in seconds, it's doubled on each retry.
+        :param max_backoff: maximum delay in seconds between two attempts.
+        :param deadline: maximum total time in seconds for all attempts.
+        If next attempt would start after deadline, no retry is made.
+        :param methods: HTTP methods, which are allowed to be retried.
+        :param statuses: HTTP status codes of the response to retry on.
+        :param respect_retry_after: use delay from `Retry-After` response header if present.
+        :param jitter: randomize delays between attempts.
+        """
+        self.total = total
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.methods = frozenset(m.upper() for m in methods)
+        self.statuses = frozenset(statuses)
+        self.respect_retry_after = respect_retry_after
+        self.jitter = jitter
+
+    def __repr__(self):
+        return '<{cls}: total={total}, backoff={backoff}, deadline={deadline}>'.format(
+            cls=self.__class__.__name__, total=self.total, backoff=self.backoff, deadline=self.deadline
+        )
+
+    def is_retryable(self, method, response=None):
+        """
+        Check whether request could be retried.
+
+        :param method: HTTP method of the request.
+        :param response: response of the request or ``None`` if connection has failed.
+        :rtype: bool
+        """
+        if method.upper() not in self.methods:
+            return False
+
+        return response is None or response.status_code in self.statuses
+
+    def get_backoff(self, attempt):
+        """
+        Calculates delay before the next attempt.
+
+        :param attempt: number of the retry, starting with 1.
+        :return: delay in seconds.
+        """
+        delay = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value):
+        """
+        Parse value of `Retry-After` header, which could be either
+        number of seconds or HTTP date.
+
+        :param value: header value.
+        :return: delay in seconds or ``None`` if value can't be parsed.
+        """
+        if not value:
+            return None
+
+        value = value.strip()
+        if value.isdigit():
+            return int(value)
+
+        parsed = email.utils.parsedate_tz(value)
+        if parsed is None:
+            return None
+
+        return max(email.utils.mktime_tz(parsed) - time.time(), 0)
+
+    def next_delay(self, method, attempt, elapsed, response=None):
+        """
+        Decide whether request should be retried and how long to wait for it.
+
+        :param method: HTTP method of the request.
+        :param attempt: number of the upcoming retry, starting with 1.
+        :param elapsed: time in seconds, passed since the first attempt.
+        :param response: response of the failed attempt or ``None`` if connection has failed.
+        :return: delay in seconds or ``None`` if request should not be retried.
+        """
+        if attempt > self.total or not self.is_retryable(method, response):
+            return None
+
+        delay = None
+        if self.respect_retry_after and response is not None:
+            delay = self.parse_retry_after(response.headers.get('Retry-After'))
+        if delay is None:
+            delay = self.get_backoff(attempt)
+
+        if self.deadline is not None and elapsed + delay > self.deadline:
+            return None
+
+        return delay
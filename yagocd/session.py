@@ -27,12 +27,20 @@
 ###############################################################################
 
 import copy
+import functools
+import json
+import os
+import time
 
 import requests
 # noinspection PyUnresolvedReferences
-from six.moves.urllib.parse import urljoin
+from six.moves.urllib.parse import urljoin, urlsplit
 
+from yagocd.adapter import PoolingAdapter
+from yagocd.cache import ETagCache
+from yagocd.decoder import decode, find_decoder
 from yagocd.exception import RequestError
+from yagocd.flight import SingleFlight
 
 
 class Session(object):
@@ -42,12 +50,36 @@ class Session(object):
     as a parameter for all managers.
     """
 
+    # maximum number of joined urls, prepared requests and environment settings to remember
+    URLS_CACHE_SIZE = 1024
+
+    # environment variables, which are used by requests for settings of the request
+    ENVIRONMENT_VARIABLES = tuple(
+        name
+        for scheme in ('http', 'https', 'all', 'no')
+        for name in ('{}_proxy'.format(scheme), '{}_PROXY'.format(scheme.upper()))
+    ) + ('REQUESTS_CA_BUNDLE', 'CURL_CA_BUNDLE')
+
     def __init__(self, auth, options):
         self._auth = auth
         self._options = options
         self._session = requests.Session()
         self.__server_version = None
 
+        self._urls = dict()
+        self._environments = dict()
+        self._prepared = dict()
+        self._flight = SingleFlight()
+
+        self._adapter = PoolingAdapter(
+            pool_connections=self._options['pool_connections'],
+            pool_maxsize=self._options['pool_maxsize'],
+            pool_block=self._options['pool_block'],
+            keep_alive=self._options['keep_alive'],
+        )
+        self._session.mount('http://', self._adapter)
+        self._session.mount('https://', self._adapter)
+
     @staticmethod
     def urljoin(*args):
         """
@@ -74,37 +106,280 @@ class Session(object):
         server, we have to pass different headers to the endpoints.
         This method requests the version from server and caches it
         in internal variable, so other resources could use it.
+        If `version_cache` option is set, the version is also looked
+        up and stored there, so it's shared between processes.
 
-        :return: server version parsed from `about` page.
+        :return: server version.
         """
         if self.__server_version is None:
-            from yagocd.resources.info import InfoManager
-            self.__server_version = InfoManager(self).version
+            cache = self._options['version_cache']
+            version = cache.get(self.server_url) if cache is not None else None
+            if version is None:
+                version = self._fetch_server_version()
+                if cache is not None and version is not None:
+                    cache.set(self.server_url, version)
+
+            self.__server_version = version
 
         return self.__server_version
 
-    def request(self, method, path, params=None, data=None, headers=None, files=None):
-        # this should work even if path is absolute (e.g. for files)
-        url = urljoin(self._options['server'], path)
+    def _fetch_server_version(self):
+        """
+        Requests version of the server from the version API and falls
+        back to parsing of the `about` page for servers, which don't
+        have it (before 16.6.0).
 
-        merged_headers = copy.deepcopy(self._options['headers'])
-        merged_headers.update(headers or {})
+        :return: server version.
+        """
+        from yagocd.resources.info import InfoManager
+        from yagocd.resources.version import VersionManager
+
+        try:
+            return VersionManager(self)._get().version
+        except Exception:  # noqa
+            # any failure of the version API means the about page should be tried
+            return InfoManager(self).version
+
+    def pool_stats(self):
+        """
+        Method for getting statistics of the connection pool.
+
+        :return: dictionary with number of opened connections, sent requests
+        and requests, which reused already opened connection.
+        :rtype: dict
+        """
+        return self._adapter.stats()
+
+    def flight_stats(self):
+        """
+        Method for getting statistics of concurrent identical GET requests,
+        see `single_flight` option.
+
+        :return: dictionary with number of sent requests and requests, which
+        got response of another one.
+        :rtype: dict
+        """
+        return self._flight.stats()
+
+    def clone(self, **options):
+        """
+        Create a copy of the session with some of the options overwritten.
+
+        The copy shares connection pool and cached server version with
+        the original session, so it's cheap to create.
+
+        :param options: options to overwrite.
+        :rtype: yagocd.session.Session
+        """
+        other = copy.copy(self)
+        other._options = dict(self._options, **options)
+        return other
+
+    def _url(self, path):
+        """
+        Joins path with the server url, remembering the result.
+
+        :param path: path of the resource, it could be absolute url (e.g. for files).
+        :return: full url.
+        """
+        key = (self._options['server'], path)
+        try:
+            return self._urls[key]
+        except KeyError:
+            if len(self._urls) >= self.URLS_CACHE_SIZE:
+                self._urls.clear()
+            url = self._urls[key] = urljoin(*key)
+            return url
+
+    def _environment(self, url, stream):
+        """
+        Get settings for sending the request, taken from environment
+        variables (proxies, CA bundle and so on).
+
+        Reading them is the slowest part of preparing the request, so they
+        are remembered for each host. Values of the environment variables,
+        which requests take into account (`ENVIRONMENT_VARIABLES`), and
+        settings of the underlying session are part of the key, so changes
+        of them are picked up, while number of remembered settings is
+        limited by `URLS_CACHE_SIZE`. Proxy settings of the operating
+        system (e.g. Windows registry) are not tracked.
+
+        :param url: url of the request.
+        :param stream: whether the response content should be streamed.
+        :rtype: dict
+        """
+        session = self._session
+        key = urlsplit(url)[:2] + (
+            stream,
+            self._options['verify'],
+            session.trust_env,
+            session.verify,
+            session.cert,
+            tuple(sorted(session.proxies.items())),
+            tuple(map(os.environ.get, self.ENVIRONMENT_VARIABLES)),
+        )
+        try:
+            return self._environments[key]
+        except KeyError:
+            if len(self._environments) >= self.URLS_CACHE_SIZE:
+                self._environments.clear()
+            settings = self._environments[key] = session.merge_environment_settings(
+                url=url, proxies={}, stream=stream, verify=self._options['verify'], cert=None
+            )
+            return settings
+
+    def _prepare(self, method, url, params, data, headers, files):
+        """
+        Prepare the request for sending.
 
-        response = self._session.request(
+        Requests without parameters and body (most of GET requests) are
+        prepared once and copied after that: merging with the settings of
+        the session is done only for the first of them. Default headers of
+        the underlying session are part of the key, so changes of them are
+        picked up, and cookies are always taken from the session. Custom
+        authentication objects could depend on the state, so requests with
+        them, as well as with authentication or parameters set on the
+        underlying session, are always prepared anew.
+
+        :rtype: requests.PreparedRequest
+        """
+        session = self._session
+        key = None
+        cacheable = self._auth is None or isinstance(self._auth, tuple)
+        cacheable = cacheable and not (params or data or files or session.params or session.auth)
+        if cacheable:
+            key = (method, url, tuple(sorted(headers.items())), tuple(sorted(session.headers.items())), self._auth)
+            template = self._prepared.get(key)
+            if template is not None:
+                prepared = template.copy()
+                prepared.prepare_cookies(self._session.cookies)
+                return prepared
+
+        prepared = self._session.prepare_request(requests.Request(
             method=method,
             url=url,
-            params=params,
-            data=data,
-            headers=merged_headers,
+            params=params or {},
+            data=data or {},
+            headers=headers,
             files=files,
             auth=self._auth,
-            verify=self._options['verify']
-        )
+        ))
+
+        if key is not None:
+            template = prepared.copy()
+            template.headers.pop('Cookie', None)
+            template._cookies = None
+            if len(self._prepared) >= self.URLS_CACHE_SIZE:
+                self._prepared.clear()
+            self._prepared[key] = template
+
+        return prepared
+
+    def request(self, method, path, params=None, data=None, headers=None, files=None, stream=False):
+        url = self._url(path)
+
+        merged_headers = dict(self._options['headers'])
+        merged_headers.update(headers or {})
+
+        # body of streamed response could be read only once, so it couldn't be shared
+        shared = method.upper() == 'GET' and not stream
+        key = ETagCache.key(url, params, merged_headers) if shared else None
+
+        cache = self._options['response_cache'] if shared else None
+        if cache is not None:
+            response = cache.get(key)
+            if response is not None:
+                return response
+
+        if shared and self._options['single_flight']:
+            response = self._flight.do(
+                key=key,
+                func=lambda: self._request(method, url, params, data, merged_headers, files, stream)
+            )
+        else:
+            response = self._request(method, url, params, data, merged_headers, files, stream)
+
+        if cache is not None:
+            cache.set(key, response)
+
+        return response
+
+    def _request(self, method, url, params, data, merged_headers, files, stream):
+        # streams of uploaded files are consumed by the first attempt, so they couldn't be retried
+        policy = self._options['retry'] if files is None and not hasattr(data, 'read') else None
+
+        # body of streamed response is not loaded, so it couldn't be cached
+        cache = self._options['etag_cache'] if method.upper() == 'GET' and not stream else None
+        cache_key, cached = self._add_etag(cache, url, params, merged_headers)
+
+        prepared = self._prepare(method.upper(), url, params, data, merged_headers, files)
+        settings = self._environment(url, stream)
+        response = self._send(method, prepared, settings, policy)
+
+        if cache is not None:
+            response = cache.update(cache_key, cached, response)
+
+        self._attach_decoder(response)
+
         # raise exception if we got 4xx/5xx response
         self._raise_for_status(response)
 
         return response
 
+    @staticmethod
+    def _add_etag(cache, url, params, headers):
+        """
+        Adds `If-None-Match` header with ETag of the cached response,
+        unless the header is already given.
+
+        :param cache: cache of responses with ETag, ``None`` if it's not used.
+        :return: tuple of the cache key and the cached response (``None`` if there is no such).
+        """
+        if cache is None:
+            return None, None
+
+        key = cache.key(url, params, headers)
+        cached = None
+        if 'If-None-Match' not in headers:
+            cached = cache.get(key)
+        if cached is not None:
+            headers['If-None-Match'] = cached.headers['ETag']
+        return key, cached
+
+    def _send(self, method, prepared, settings, policy):
+        """
+        Sends the prepared request, retrying it according to the policy.
+
+        :param policy: retry policy, ``None`` if request shouldn't be retried.
+        :rtype: requests.Response
+        """
+        start_time = time.time()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self._session.send(prepared, allow_redirects=True, **settings)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                delay = policy and policy.next_delay(method, attempt, time.time() - start_time)
+                if delay is None:
+                    raise
+            else:
+                delay = policy and policy.next_delay(method, attempt, time.time() - start_time, response)
+                if delay is None:
+                    return response
+                response.close()
+
+            time.sleep(delay)
+
+    def _attach_decoder(self, response):
+        """
+        Replaces :meth:`requests.Response.json` of the response with the
+        one, using configured or the fastest available JSON decoder.
+        """
+        loads = self._options['json_decoder'] or find_decoder()
+        if loads is not json.loads:
+            response.json = functools.partial(decode, response, loads)
+
     @staticmethod
     def _raise_for_status(response):
         summary = ''
@@ -118,8 +393,8 @@ class Session(object):
         if summary:
             raise RequestError(summary=summary, response=response)
 
-    def get(self, path, params=None, headers=None):
-        return self.request(method='get', path=path, params=params, headers=headers)
+    def get(self, path, params=None, headers=None, stream=False):
+        return self.request(method='get', path=path, params=params, headers=headers, stream=stream)
 
     def post(self, path, params=None, data=None, headers=None, files=None):
         return self.request(method='post', path=path, params=params, data=data, headers=headers, files=files)
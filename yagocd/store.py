@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# The MIT License
+#
+# Copyright (c) 2016 Grigory Chernyshev
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+###############################################################################
+
+
+import json
+import sqlite3
+import threading
+
+from yagocd.resources.job import JobInstance
+from yagocd.resources.pipeline import PipelineInstance
+from yagocd.resources.stage import StageInstance
+from yagocd.util import YagocdUtil
+
+
+class HistoryStore(object):
+    """
+    Local store of pipeline, stage and job history, backed by SQLite.
+
+    Instances are fetched from the server newest first and only until
+    already stored ones are reached, so history of each pipeline, stage
+    or job is downloaded completely only once. After that each sync
+    requests just the pages with new runs, and history queries are
+    served from the local database without touching the server.
+
+    Instances, which were still running at the moment of sync, are
+    fetched again on the next sync, until they are completed. Runs of the
+    completed instances are considered to be immutable: if a stage of an
+    old pipeline instance is re-run, pass ``full=True`` to refresh it::
+
+        store = HistoryStore(client, path='history.db')
+        store.sync_pipeline('Consumer_Website')
+        for instance in store.pipeline_history('Consumer_Website'):
+            print(instance.data.counter)
+    """
+
+    PIPELINE = 'pipeline'
+    STAGE = 'stage'
+    JOB = 'job'
+
+    # results of the stage, which wouldn't change anymore
+    FINAL_RESULTS = frozenset(['Passed', 'Failed', 'Cancelled'])
+
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS history ('
+        ' kind TEXT NOT NULL,'
+        ' name TEXT NOT NULL,'
+        ' key INTEGER NOT NULL,'
+        ' completed INTEGER NOT NULL,'
+        ' data TEXT NOT NULL,'
+        ' PRIMARY KEY (kind, name, key)'
+        ')'
+    )
+
+    def __init__(self, client, path=':memory:'):
+        """
+        :param client: client to fetch history with.
+        :type client: yagocd.client.Yagocd
+        :param path: path to the database file, by default database is kept in memory.
+        """
+        self._client = client
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()
+
+        with self._lock, self._connection:
+            self._connection.execute(self.SCHEMA)
+
+    def close(self):
+        """
+        Closes connection to the database.
+        """
+        self._connection.close()
+
+    def sync_pipeline(self, name, full=False):
+        """
+        Fetches new instances of the pipeline from the server.
+
+        :param name: name of the pipeline.
+        :param full: fetch whole history, updating already stored instances.
+        :return: number of fetched instances.
+        :rtype: int
+        """
+        return self._sync(
+            kind=self.PIPELINE,
+            name=name,
+            instances=self._client.pipelines.full_history(name),
+            key=lambda data: int(data['counter']),
+            completed=self._is_pipeline_completed,
+            full=full
+        )
+
+    def sync_stage(self, pipeline_name, stage_name, full=False):
+        """
+        Fetches new instances of the stage from the server.
+
+        :param pipeline_name: name of the pipeline.
+        :param stage_name: name of the stage.
+        :param full: fetch whole history, updating already stored instances.
+        :return: number of fetched instances.
+        :rtype: int
+        """
+        return self._sync(
+            kind=self.STAGE,
+            name=self._name(pipeline_name, stage_name),
+            instances=self._client.stages.full_history(pipeline_name=pipeline_name, stage_name=stage_name),
+            key=lambda data: int(data['id']),
+            completed=self._is_stage_completed,
+            full=full
+        )
+
+    def sync_job(self, pipeline_name, stage_name, job_name, full=False):
+        """
+        Fetches new instances of the job from the server.
+
+        :param pipeline_name: name of the pipeline.
+        :param stage_name: name of the stage.
+        :param job_name: name of the job.
+        :param full: fetch whole history, updating already stored instances.
+        :return: number of fetched instances.
+        :rtype: int
+        """
+        instances = YagocdUtil.paginate(
+            fetch=lambda offset: self._client.jobs.history(
+                pipeline_name=pipeline_name, stage_name=stage_name, job_name=job_name, offset=offset
+            ),
+            prefetch=self._client._session._options['history_prefetch']
+        )
+
+        return self._sync(
+            kind=self.JOB,
+            name=self._name(pipeline_name, stage_name, job_name),
+            instances=instances,
+            key=lambda data: int(data['id']),
+            completed=self._is_job_completed,
+            full=full
+        )
+
+    def pipeline_history(self, name, offset=0, limit=None):
+        """
+        Gets stored instances of the pipeline, newest first.
+
+        :param name: name of the pipeline.
+        :param offset: how many instances to skip.
+        :param limit: maximum number of instances to return.
+        :rtype: list of yagocd.resources.pipeline.PipelineInstance
+        """
+        return [
+            PipelineInstance(session=self._client._session, data=data)
+            for data in self._load(self.PIPELINE, name, offset, limit)
+        ]
+
+    def stage_history(self, pipeline_name, stage_name, offset=0, limit=None):
+        """
+        Gets stored instances of the stage, newest first.
+
+        :param pipeline_name: name of the pipeline.
+        :param stage_name: name of the stage.
+        :param offset: how many instances to skip.
+        :param limit: maximum number of instances to return.
+        :rtype: list of yagocd.resources.stage.StageInstance
+        """
+        return [
+            StageInstance(session=self._client._session, data=data, pipeline=None)
+            for data in self._load(self.STAGE, self._name(pipeline_name, stage_name), offset, limit)
+        ]
+
+    def job_history(self, pipeline_name, stage_name, job_name, offset=0, limit=None):
+        """
+        Gets stored instances of the job, newest first.
+
+        :param pipeline_name: name of the pipeline.
+        :param stage_name: name of the stage.
+        :param job_name: name of the job.
+        :param offset: how many instances to skip.
+        :param limit: maximum number of instances to return.
+        :rtype: list of yagocd.resources.job.JobInstance
+        """
+        return [
+            JobInstance(session=self._client._session, data=data, stage=None)
+            for data in self._load(self.JOB, self._name(pipeline_name, stage_name, job_name), offset, limit)
+        ]
+
+    def _sync(self, kind, name, instances, key, completed, full):
+        watermark = None if full else self._watermark(kind, name)
+
+        # instances are fetched without holding the lock, so history could be read in the meantime
+        rows = list()
+        for instance in instances:
+            data = instance.data
+            if watermark is not None and key(data) <= watermark:
+                break
+            rows.append((kind, name, key(data), int(completed(data)), json.dumps(data)))
+
+        # everything is stored in a single transaction, so interrupted sync doesn't leave gaps in history
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO history (kind, name, key, completed, data) VALUES (?, ?, ?, ?, ?)',
+                rows
+            )
+
+        return len(rows)
+
+    def _watermark(self, kind, name):
+        """
+        Returns the highest key, up to which all stored instances are
+        completed, or ``None`` if nothing is stored yet.
+        """
+        with self._lock:
+            incomplete, highest = self._connection.execute(
+                'SELECT MIN(CASE WHEN completed = 0 THEN key END), MAX(key) FROM history WHERE kind = ? AND name = ?',
+                (kind, name)
+            ).fetchone()
+
+        if incomplete is not None:
+            return incomplete - 1
+        return highest
+
+    def _load(self, kind, name, offset, limit):
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT data FROM history WHERE kind = ? AND name = ? ORDER BY key DESC LIMIT ? OFFSET ?',
+                (kind, name, -1 if limit is None else limit, offset)
+            ).fetchall()
+
+        return [json.loads(row[0]) for row in rows]
+
+    @staticmethod
+    def _name(*names):
+        return '/'.join(names)
+
+    @classmethod
+    def _is_job_completed(cls, data):
+        return data.get('state') == 'Completed'
+
+    @classmethod
+    def _is_stage_completed(cls, data):
+        return data.get('result') in cls.FINAL_RESULTS and all(
+            cls._is_job_completed(job) for job in data.get('jobs', [])
+        )
+
+    @classmethod
+    def _is_pipeline_completed(cls, data):
+        return all(cls._is_stage_completed(stage) for stage in data.get('stages', []) if stage.get('scheduled', True))
@@ -27,13 +27,140 @@
 ###############################################################################
 import functools
 import inspect
-from collections import deque
+from collections import defaultdict, deque
 from distutils.version import LooseVersion
+from multiprocessing.pool import ThreadPool
+from operator import itemgetter
+
+
+class LazyDict(dict):
+    """
+    Dictionary with attribute style access to its items - analogue of
+    `EasyDict`, which is used for wrapping data of the resources.
+
+    `EasyDict` recursively converts and copies all nested dictionaries
+    and lists when it's created. This class wraps nested values only
+    when they are accessed for the first time, so wrapping big JSON
+    response is cheap, if only part of it is used. Wrapped values are
+    stored back, so changes made to them are preserved::
+
+        data = LazyDict({'stages': [{'name': 'build', 'jobs': []}]})
+        data.stages[0].name
+        >> 'build'
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError("'{}' object has no attribute '{}'".format(self.__class__.__name__, name))
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+    def __delattr__(self, name):
+        try:
+            del self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+
+        wrapped = self._wrap(value)
+        if wrapped is not value:
+            dict.__setitem__(self, key, wrapped)
+        return wrapped
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def copy(self):
+        return self.__class__(self)
+
+    @classmethod
+    def _wrap(cls, value):
+        value_type = type(value)
+        if value_type is dict:
+            return cls(value)
+        elif value_type is list or value_type is tuple:
+            return _LazyList(cls._wrap(x) for x in value)
+        return value
+
+
+class _LazyList(list):
+    """
+    List, which elements were already wrapped by :class:`LazyDict`.
+    """
+    __slots__ = ()
 
 
 class YagocdUtil(object):
     @staticmethod
-    def build_graph(nodes, dependencies, compare):
+    def build_graph(nodes, dependencies, compare=None, key=None, dependency_key=None):
+        """
+        Method for linking nodes together: each node gets `predecessors`
+        (nodes it depends on) and `descendants` (nodes depending on it).
+
+        Preferred way is to provide `key` function: nodes are indexed by
+        their keys and dependencies are resolved with dictionary lookup,
+        which takes linear time of nodes and dependencies count.
+        Providing just `compare` function makes the method compare each
+        dependency of each node with every other node, which is quadratic.
+
+        :param nodes: list of nodes to link.
+        :param dependencies: function, returning dependencies of the node.
+        :param compare: function, accepting dependency and node and returning
+        whether dependency refers to the node.
+        :param key: function, returning key of the node.
+        :param dependency_key: function, returning key of the node, which
+        dependency refers to. By default dependency itself is used as a key.
+        :return: linked nodes.
+        """
+        if key is None:
+            return YagocdUtil._build_graph_by_compare(nodes, dependencies, compare)
+
+        if dependency_key is None:
+            dependency_key = YagocdUtil._identity
+
+        index = defaultdict(list)
+        for position, node in enumerate(nodes):
+            index[key(node)].append((position, node))
+
+        descendants = [list() for _ in nodes]
+        for parent in nodes:
+            children = list()
+            for candidate in dependencies(parent):
+                for position, child in index.get(dependency_key(candidate), ()):
+                    descendants[position].append(parent)
+                    children.append((position, child))
+
+            # keep children in the order of nodes
+            children.sort(key=itemgetter(0))
+            parent.predecessors.extend(child for _, child in children)
+
+        for position, node in enumerate(nodes):
+            node.descendants = descendants[position]
+
+        return nodes
+
+    @staticmethod
+    def _identity(value):
+        return value
+
+    @staticmethod
+    def _build_graph_by_compare(nodes, dependencies, compare):
         for child in nodes:
             parents = list()
 
@@ -62,6 +189,56 @@ class YagocdUtil(object):
             to_crawl.extend(node_children - visited)
         return list(visited)
 
+    @staticmethod
+    def paginate(fetch, prefetch=0):
+        """
+        Generator for iterating over items of offset based paginated resource.
+
+        Pages are requested until the first empty one. By default next
+        page is requested only after the current one is exhausted. If
+        `prefetch` is set, size of the first page is used to calculate
+        offsets of the next pages and up to `prefetch` of them are requested
+        in parallel, while items are still yielded in order.
+
+        :param fetch: function, which accepts offset and returns list of items.
+        :param prefetch: number of pages to request ahead.
+        :return: items of all pages.
+        """
+        offset = 0
+        items = fetch(offset)
+
+        if not prefetch:
+            while items:
+                for item in items:
+                    yield item
+
+                offset += len(items)
+                items = fetch(offset)
+            return
+
+        page_size = len(items)
+        if not page_size:
+            return
+
+        pool = ThreadPool(prefetch)
+        try:
+            pending = deque()
+            for _ in range(prefetch):
+                offset += page_size
+                pending.append(pool.apply_async(fetch, (offset,)))
+
+            while items:
+                for item in items:
+                    yield item
+
+                items = pending.popleft().get()
+                if items:
+                    offset += page_size
+                    pending.append(pool.apply_async(fetch, (offset,)))
+        finally:
+            # pages, which are still in flight, are not needed anymore
+            pool.close()
+
     @classmethod
     def choose_option(cls, version_to_options, default, server_version):
         for version in sorted([LooseVersion(v) for v in version_to_options.keys()]):
@@ -79,6 +256,22 @@ class Since(object):
 
     def __init__(self, since_version):
         self._since_version = LooseVersion(since_version)
+        # results of the checks by server version, so versions are parsed
+        # and compared only once and not on each call
+        self._supported = dict()
+
+    def is_supported(self, server_version):
+        """
+        Check if the server of given version supports decorated entity.
+
+        :param server_version: version of the server.
+        :rtype: bool
+        """
+        try:
+            return self._supported[server_version]
+        except KeyError:
+            supported = self._supported[server_version] = LooseVersion(server_version) >= self._since_version
+            return supported
 
     def __call__(self, entity):
         @functools.wraps(entity)
@@ -86,7 +279,7 @@ class Since(object):
             if self.ENABLED:
                 this = args[0]
                 server_version = this._session.server_version
-                if LooseVersion(server_version) < self._since_version:
+                if not self.is_supported(server_version):
                     name = "{}.{}".format(this.__class__.__name__, entity.__name__)
                     raise RuntimeError(
                         "Method `{name}` is not supported on '{server_version}' "